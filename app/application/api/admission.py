@@ -0,0 +1,129 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Literal
+
+from settings.config import Settings
+
+
+RouteGroup = Literal["read", "export", "write", "borrow"]
+
+# routes outside these prefixes (docs, schema) do no database work
+_DATABASE_PREFIXES = ("/authors", "/books", "/borrows")
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def route_group(method: str, path: str) -> RouteGroup | None:
+    if not path.startswith(_DATABASE_PREFIXES):
+        return None
+    if method in _READ_METHODS:
+        # an export holds its slot, and a connection, for the whole stream, so
+        # it gets a group of its own rather than starving the short reads
+        if path.rstrip("/").endswith("/export"):
+            return "export"
+        return "read"
+    # borrow writes lock book rows and should not starve the other writes
+    if path.startswith("/borrows"):
+        return "borrow"
+    return "write"
+
+
+@dataclass
+class AdmissionStats:
+    admitted: int = 0
+    queued: int = 0
+    shed_queue_full: int = 0
+    shed_wait_timeout: int = 0
+
+    @property
+    def shed(self) -> int:
+        return self.shed_queue_full + self.shed_wait_timeout
+
+
+@dataclass
+class AdmissionLimiter:
+    """Runs at most `concurrency` requests at a time; up to `max_queue` more wait
+    for a slot for at most `max_wait` seconds, and the rest are turned away"""
+
+    concurrency: int
+    max_queue: int
+    max_wait: float
+    stats: AdmissionStats = field(default_factory=AdmissionStats)
+    in_flight: int = field(default=0, init=False)
+    waiting: int = field(default=0, init=False)
+    _slots: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if there is none free; False when
+        the request is shed and must not run"""
+        if self._slots.locked():
+            if self.waiting >= self.max_queue:
+                self.stats.shed_queue_full += 1
+                return False
+
+            self.waiting += 1
+            self.stats.queued += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.max_wait)
+            except TimeoutError:
+                self.stats.shed_wait_timeout += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+
+        self.in_flight += 1
+        self.stats.admitted += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+
+@dataclass
+class AdmissionController:
+    """Per worker admission limits of each route group; a group without one is
+    not limited"""
+
+    limiters: dict[RouteGroup, AdmissionLimiter]
+    retry_after: int
+
+    def limiter_for(self, method: str, path: str) -> AdmissionLimiter | None:
+        group = route_group(method, path)
+        if group is None:
+            return None
+        return self.limiters.get(group)
+
+
+def build_admission_controller(settings: Settings) -> AdmissionController:
+    limits: dict[RouteGroup, tuple[int, int]] = {
+        "read": (settings.ADMISSION_READ_CONCURRENCY, settings.ADMISSION_READ_QUEUE),
+        "export": (
+            settings.ADMISSION_EXPORT_CONCURRENCY,
+            settings.ADMISSION_EXPORT_QUEUE,
+        ),
+        "write": (
+            settings.ADMISSION_WRITE_CONCURRENCY,
+            settings.ADMISSION_WRITE_QUEUE,
+        ),
+        "borrow": (
+            settings.ADMISSION_BORROW_CONCURRENCY,
+            settings.ADMISSION_BORROW_QUEUE,
+        ),
+    }
+    return AdmissionController(
+        limiters={
+            group: AdmissionLimiter(
+                concurrency=concurrency,
+                max_queue=max_queue,
+                max_wait=settings.ADMISSION_MAX_WAIT_SECONDS,
+            )
+            for group, (concurrency, max_queue) in limits.items()
+            if concurrency > 0
+        },
+        retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
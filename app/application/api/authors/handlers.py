@@ -1,20 +1,58 @@
 from fastapi.routing import APIRouter
-from fastapi import status, Depends
+from fastapi import Query, Request, status, Depends
+from fastapi.responses import StreamingResponse
 from fastapi.exceptions import HTTPException
 
-from application.api.authors.schemas import OutAuthorSchema, InAuthorSchema
-from application.api.filters import PaginationIn, PaginationOut
-from application.api.schemas import ApiResponse, ErrorSchema, ListPaginatedResponse
+from application.api.authors.schemas import (
+    InAuthorSchema,
+    OutAuthorSchema,
+    PopularAuthorSchema,
+    PopularAuthorsResponse,
+)
+from application.api.bulk import parse_bulk_rows, read_bulk_rows
+from application.api.conditional import (
+    entity_etag,
+    has_validators,
+    if_match_versions,
+    is_not_modified,
+    last_modified_of,
+    list_etag,
+    not_modified_response,
+    set_validators,
+    version_etag,
+)
+from application.api.export import ExportFormat, export_response
+from application.api.filters import PaginationIn, PaginationOut, parse_include
+from application.api.schemas import (
+    list_payload,
+    ApiResponse,
+    BulkCreateResponse,
+    ErrorSchema,
+    ListPaginatedResponse,
+)
+from application.api.serialization import api_response
 from domain.exceptions.base import ApplicationException
 
 from punq import Container
 
 from logic.init import init_container
+from logic.exceptions.authors import AuthorVersionConflictException
+from logic.services.popularity import PopularityPeriod
+from logic.use_cases.authors.bulk_create import BulkCreateAuthorsUseCase
 from logic.use_cases.authors.create import CreateAuthorUseCase
 from logic.use_cases.authors.delete import DeleteAuthorUseCase
-from logic.use_cases.authors.get import GetAuthorUseCase, GetAuthorsUseCase
+from logic.use_cases.authors.export import ExportAuthorsUseCase
+from logic.use_cases.authors.get import (
+    GetAuthorUseCase,
+    GetAuthorsUseCase,
+    GetAuthorVersionUseCase,
+)
+from logic.use_cases.authors.popular import GetPopularAuthorsUseCase
 from logic.use_cases.authors.update import UpdateAuthorUseCase
+from settings.config import Settings
+
 
+AUTHOR_INCLUDES = frozenset({"books"})
 
 router = APIRouter(
     tags=["Author"],
@@ -45,7 +83,45 @@ async def create_author_handler(
             detail={"error": err.message},
         )
 
-    return ApiResponse(data=OutAuthorSchema.from_entity(author))
+    return api_response(
+        OutAuthorSchema.to_payload(author), status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=ApiResponse[BulkCreateResponse],
+    status_code=status.HTTP_201_CREATED,
+    description="Create authors from a JSON array or an NDJSON (application/x-ndjson) body",
+    responses={
+        status.HTTP_201_CREATED: {"model": ApiResponse[BulkCreateResponse]},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+    },
+)
+async def bulk_create_authors_handler(
+    request: Request, container: Container = Depends(init_container)
+) -> ApiResponse[BulkCreateResponse]:
+    """Create authors in bulk, reporting invalid rows by index"""
+    settings: Settings = container.resolve(Settings)
+    use_case: BulkCreateAuthorsUseCase = container.resolve(BulkCreateAuthorsUseCase)
+
+    rows = await read_bulk_rows(request, max_rows=settings.BULK_CREATE_MAX_ROWS)
+    schemas, row_errors = parse_bulk_rows(rows, InAuthorSchema)
+
+    try:
+        result = await use_case.execute(
+            authors=[(index, schema.to_entity()) for index, schema in schemas]
+        )
+    except ApplicationException as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": err.message},
+        )
+
+    result.errors.extend(row_errors)
+    return api_response(
+        BulkCreateResponse.to_payload(result), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get(
@@ -61,19 +137,39 @@ async def create_author_handler(
     },
 )
 async def get_authors_handler(
+    request: Request,
     pagination_in: PaginationIn = Depends(),
+    include: str | None = Query(None, description="Comma separated: books"),
     container: Container = Depends(init_container),
 ) -> ApiResponse[ListPaginatedResponse[OutAuthorSchema]]:
     """Get authors list"""
     use_case: GetAuthorsUseCase = container.resolve(GetAuthorsUseCase)
 
     try:
-        author_list = await use_case.execute(pagination=pagination_in)
-        items = [OutAuthorSchema.from_entity(obj) for obj in author_list]
+        include_books = "books" in parse_include(include, allowed=AUTHOR_INCLUDES)
+        author_list, total = await use_case.execute(
+            pagination=pagination_in, include_books=include_books
+        )
+        books = [
+            book
+            for author in author_list
+            for book in sorted(author.books, key=lambda book: book.id)
+        ]
+        etag = list_etag("authors", [*author_list, *books], total.value)
+        last_modified = last_modified_of([*author_list, *books])
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        items = [
+            OutAuthorSchema.to_payload(obj, include_books=include_books)
+            for obj in author_list
+        ]
         pagination_out = PaginationOut(
             offset=pagination_in.offset,
             limit=pagination_in.limit,
-            total=len(items),
+            total=total.value,
+            total_kind=total.kind,
+            next_cursor=pagination_in.next_cursor(author_list),
         )
 
     except ApplicationException as err:
@@ -82,8 +178,67 @@ async def get_authors_handler(
             detail={"error": err.message},
         )
 
-    return ApiResponse(
-        data=ListPaginatedResponse(items=items, pagination=pagination_out)
+    response = api_response(list_payload(items, pagination_out))
+    set_validators(response, etag, last_modified)
+    return response
+
+
+@router.get(
+    "/popular",
+    response_model=ApiResponse[PopularAuthorsResponse],
+    status_code=status.HTTP_200_OK,
+    description="Most borrowed authors of the last seven days or of all time",
+    responses={
+        status.HTTP_200_OK: {"model": ApiResponse[PopularAuthorsResponse]},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+    },
+)
+async def get_popular_authors_handler(
+    period: PopularityPeriod = Query("week"),
+    limit: int = Query(10, ge=1, le=100),
+    container: Container = Depends(init_container),
+) -> ApiResponse[PopularAuthorsResponse]:
+    """Get popular authors"""
+    use_case: GetPopularAuthorsUseCase = container.resolve(GetPopularAuthorsUseCase)
+
+    try:
+        popular = await use_case.execute(period=period, limit=limit)
+
+    except ApplicationException as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": err.message},
+        )
+
+    items = [
+        PopularAuthorSchema.to_payload(author, borrows) for author, borrows in popular
+    ]
+    return api_response({"period": period, "items": items})
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    description="Stream every author as NDJSON or CSV",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+    },
+)
+async def export_authors_handler(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    container: Container = Depends(init_container),
+) -> StreamingResponse:
+    """Export authors"""
+    settings: Settings = container.resolve(Settings)
+    use_case: ExportAuthorsUseCase = container.resolve(ExportAuthorsUseCase)
+
+    return export_response(
+        use_case.execute(batch_size=settings.EXPORT_BATCH_SIZE),
+        to_payload=OutAuthorSchema.to_payload,
+        fields=[field for field in OutAuthorSchema.model_fields if field != "books"],
+        export_format=export_format,
+        filename="authors",
     )
 
 
@@ -98,13 +253,29 @@ async def get_authors_handler(
     },
 )
 async def get_author_detail_handler(
-    author_id: int, container: Container = Depends(init_container)
+    author_id: int,
+    request: Request,
+    include: str | None = Query(None, description="Comma separated: books"),
+    container: Container = Depends(init_container),
 ) -> ApiResponse[OutAuthorSchema]:
     """Get author detail"""
     use_case: GetAuthorUseCase = container.resolve(GetAuthorUseCase)
 
     try:
-        author = await use_case.execute(author_id=author_id)
+        include_books = "books" in parse_include(include, allowed=AUTHOR_INCLUDES)
+        # the author's own version does not cover its books
+        if has_validators(request) and not include_books:
+            version_use_case: GetAuthorVersionUseCase = container.resolve(
+                GetAuthorVersionUseCase
+            )
+            version = await version_use_case.execute(author_id=author_id)
+            etag = version_etag(version.number)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified_response(etag, version.updated_at)
+
+        author = await use_case.execute(
+            author_id=author_id, include_books=include_books
+        )
 
     except ApplicationException as err:
         raise HTTPException(
@@ -112,37 +283,64 @@ async def get_author_detail_handler(
             detail={"error": err.message},
         )
 
-    return ApiResponse(data=OutAuthorSchema.from_entity(author))
+    books = sorted(author.books, key=lambda book: book.id)
+    if include_books:
+        # not a version: writes to the author are conditioned on the plain form
+        etag = entity_etag("author", author.id, author.updated_at, *books)
+    else:
+        etag = version_etag(author.version)
+    last_modified = last_modified_of([author, *books])
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    response = api_response(
+        OutAuthorSchema.to_payload(author, include_books=include_books)
+    )
+    set_validators(response, etag, last_modified)
+    return response
 
 
 @router.put(
     "/{author_id}/",
     response_model=ApiResponse[OutAuthorSchema],
     status_code=status.HTTP_200_OK,
-    description="Update author",
+    description="Update author; with If-Match, only if it is still at that version",
     responses={
         status.HTTP_200_OK: {"model": ApiResponse[OutAuthorSchema]},
         status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+        status.HTTP_412_PRECONDITION_FAILED: {"model": ErrorSchema},
     },
 )
 async def update_author_handler(
     schema: InAuthorSchema,
     author_id: int,
+    request: Request,
     container: Container = Depends(init_container),
 ) -> ApiResponse[OutAuthorSchema]:
     """Update book"""
     use_case: UpdateAuthorUseCase = container.resolve(UpdateAuthorUseCase)
 
     try:
-        author = await use_case.execute(author_id=author_id, author=schema.to_entity())
+        author = await use_case.execute(
+            author_id=author_id,
+            author=schema.to_entity(),
+            expected_versions=if_match_versions(request),
+        )
 
+    except AuthorVersionConflictException as err:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail={"error": err.message},
+        )
     except ApplicationException as err:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"error": err.message},
         )
 
-    return ApiResponse(data=OutAuthorSchema.from_entity(author))
+    response = api_response(OutAuthorSchema.to_payload(author))
+    set_validators(response, version_etag(author.version), author.updated_at)
+    return response
 
 
 @router.delete(
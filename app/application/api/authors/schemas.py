@@ -1,8 +1,10 @@
 from datetime import date
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
+from application.api.books.schemas import OutBookSchema
 from domain.entities.library import Author as AuthorEntity
+from logic.services.popularity import PopularityPeriod
 
 
 class InAuthorSchema(BaseModel):
@@ -21,19 +23,73 @@ class OutAuthorSchema(BaseModel):
     name: str
     surname: str
     date_of_birth: date
+    version: int
     created_at: datetime
     updated_at: datetime
+    books: list[OutBookSchema] | None = Field(
+        default=None, description="Present only with include=books"
+    )
 
     @staticmethod
-    def from_entity(entity: AuthorEntity) -> "OutAuthorSchema":
+    def from_entity(
+        entity: AuthorEntity, include_books: bool = False
+    ) -> "OutAuthorSchema":
         return OutAuthorSchema(
             id=entity.id,
             name=entity.name,
             surname=entity.surname,
             date_of_birth=entity.date_of_birth,
+            version=entity.version,
             created_at=entity.created_at,
             updated_at=entity.updated_at,
+            books=(
+                [
+                    OutBookSchema.from_entity(book)
+                    for book in sorted(entity.books, key=lambda book: book.id)
+                ]
+                if include_books
+                else None
+            ),
         )
 
+    @staticmethod
+    def to_payload(entity: AuthorEntity, include_books: bool = False) -> dict:
+        """Plain-data form of `from_entity` for the fast serialization path"""
+        return {
+            "id": entity.id,
+            "name": entity.name,
+            "surname": entity.surname,
+            # the column is a DateTime; the schema exposes only the date part
+            "date_of_birth": (
+                entity.date_of_birth.date()
+                if isinstance(entity.date_of_birth, datetime)
+                else entity.date_of_birth
+            ),
+            "version": entity.version,
+            "created_at": entity.created_at,
+            "updated_at": entity.updated_at,
+            "books": (
+                [
+                    OutBookSchema.to_payload(book)
+                    for book in sorted(entity.books, key=lambda book: book.id)
+                ]
+                if include_books
+                else None
+            ),
+        }
+
+
+class PopularAuthorSchema(OutAuthorSchema):
+    borrows: int
+
+    @staticmethod
+    def to_payload(author: AuthorEntity, borrows: int) -> dict:
+        return {**OutAuthorSchema.to_payload(author), "borrows": borrows}
+
+
+class PopularAuthorsResponse(BaseModel):
+    period: PopularityPeriod
+    items: list[PopularAuthorSchema]
+
 
 AuthorListSchema = list[OutAuthorSchema]
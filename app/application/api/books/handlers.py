@@ -1,21 +1,79 @@
+from datetime import datetime
+
 from fastapi.routing import APIRouter
-from fastapi import status, Depends
+from fastapi import Query, Request, status, Depends
+from fastapi.responses import StreamingResponse
 from fastapi.exceptions import HTTPException
 
-from application.api.books.schemas import InBookSchema, OutBookSchema
-from application.api.filters import PaginationIn, PaginationOut
-from application.api.schemas import ApiResponse, ErrorSchema, ListPaginatedResponse
+from application.api.books.schemas import (
+    BookFilterIn,
+    PopularBookSchema,
+    PopularBooksResponse,
+    BookSearchHitSchema,
+    BookSearchResponse,
+    InBookSchema,
+    OutBookSchema,
+)
+from application.api.bulk import parse_bulk_rows, read_bulk_rows
+from application.api.conditional import (
+    has_validators,
+    if_match_versions,
+    is_not_modified,
+    last_modified_of,
+    list_etag,
+    not_modified_response,
+    set_validators,
+    version_etag,
+)
+from application.api.export import ExportFormat, export_response
+from application.api.filters import (
+    PaginationIn,
+    PaginationOut,
+    SearchIn,
+    SearchPaginationOut,
+    parse_ids,
+    parse_sort,
+)
+from application.api.idempotency import idempotency_key_of
+from application.api.schemas import (
+    list_payload,
+    ApiResponse,
+    BulkCreateResponse,
+    ErrorSchema,
+    ListPaginatedResponse,
+)
+from application.api.serialization import api_response
 from domain.exceptions.base import ApplicationException
 
 from punq import Container
 
 from logic.init import init_container
+from logic.exceptions.books import BookVersionConflictException
+from logic.exceptions.idempotency import (
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+)
+from logic.use_cases.books.bulk_create import BulkCreateBooksUseCase
 
 from logic.use_cases.books.create import CreateBookUseCase
 from logic.use_cases.books.delete import DeleteBookUseCase
-from logic.use_cases.books.get import GetBookUseCase, GetBooksUseCase
+from logic.use_cases.books.export import ExportBooksUseCase
+from logic.use_cases.books.get import (
+    GetBookUseCase,
+    GetBooksByIdsUseCase,
+    GetBooksUseCase,
+    GetBookVersionUseCase,
+)
+from logic.services.popularity import PopularityPeriod
+from logic.services.totals import TotalCount
+from logic.use_cases.books.search import SearchBooksUseCase
+from logic.use_cases.books.popular import GetPopularBooksUseCase
 from logic.use_cases.books.update import UpdateBookUseCase
+from settings.config import Settings
+
 
+# sort keys backed by a (column, id) index, with the type of their cursor value
+BOOK_SORTS = {"id": int, "created_at": datetime, "title": str}
 
 router = APIRouter(
     tags=["Book"],
@@ -26,27 +84,81 @@ router = APIRouter(
     "/",
     response_model=ApiResponse[OutBookSchema],
     status_code=status.HTTP_201_CREATED,
-    description="Create new book",
+    description="Create new book; retries with the same Idempotency-Key get the first result, and a key reused for a different body gets 422",
     responses={
         status.HTTP_201_CREATED: {"model": OutBookSchema},
         status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+        status.HTTP_409_CONFLICT: {"model": ErrorSchema},
     },
 )
 async def create_book_handler(
-    schema: InBookSchema, container: Container = Depends(init_container)
+    schema: InBookSchema,
+    request: Request,
+    container: Container = Depends(init_container),
 ) -> ApiResponse[OutBookSchema]:
     """Create new book"""
     use_case: CreateBookUseCase = container.resolve(CreateBookUseCase)
 
     try:
-        book = await use_case.execute(book=schema.to_entity())
+        book = await use_case.execute(
+            book=schema.to_entity(),
+            idempotency_key=idempotency_key_of(request, "books.create", schema),
+        )
+    except IdempotencyKeyReusedException as err:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"error": err.message},
+        )
+    except IdempotencyKeyInProgressException as err:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": err.message},
+        )
     except ApplicationException as err:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"error": err.message},
         )
 
-    return ApiResponse(data=OutBookSchema.from_entity(book))
+    return api_response(
+        OutBookSchema.to_payload(book), status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=ApiResponse[BulkCreateResponse],
+    status_code=status.HTTP_201_CREATED,
+    description="Create books from a JSON array or an NDJSON (application/x-ndjson) body",
+    responses={
+        status.HTTP_201_CREATED: {"model": ApiResponse[BulkCreateResponse]},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+    },
+)
+async def bulk_create_books_handler(
+    request: Request, container: Container = Depends(init_container)
+) -> ApiResponse[BulkCreateResponse]:
+    """Create books in bulk, reporting invalid rows by index"""
+    settings: Settings = container.resolve(Settings)
+    use_case: BulkCreateBooksUseCase = container.resolve(BulkCreateBooksUseCase)
+
+    rows = await read_bulk_rows(request, max_rows=settings.BULK_CREATE_MAX_ROWS)
+    schemas, row_errors = parse_bulk_rows(rows, InBookSchema)
+
+    try:
+        result = await use_case.execute(
+            books=[(index, schema.to_entity()) for index, schema in schemas]
+        )
+    except ApplicationException as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": err.message},
+        )
+
+    result.errors.extend(row_errors)
+    return api_response(
+        BulkCreateResponse.to_payload(result), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get(
@@ -62,20 +174,58 @@ async def create_book_handler(
     },
 )
 async def get_books_handler(
+    request: Request,
     pagination_in: PaginationIn = Depends(),
+    filter_in: BookFilterIn = Depends(),
+    sort: str = Query(
+        "id", description="id, created_at or title; prefix with - to reverse"
+    ),
+    ids: str | None = Query(
+        None, description="Comma separated book ids; replaces paging when given"
+    ),
     container: Container = Depends(init_container),
 ) -> ApiResponse[ListPaginatedResponse[OutBookSchema]]:
     """Get books list"""
     use_case: GetBooksUseCase = container.resolve(GetBooksUseCase)
 
     try:
-        book_list = await use_case.execute(pagination=pagination_in)
-        items = [OutBookSchema.from_entity(obj) for obj in book_list]
-        pagination_out = PaginationOut(
-            offset=pagination_in.offset,
-            limit=pagination_in.limit,
-            total=len(items),
-        )
+        if ids is not None:
+            settings: Settings = container.resolve(Settings)
+            by_ids_use_case: GetBooksByIdsUseCase = container.resolve(
+                GetBooksByIdsUseCase
+            )
+            book_ids = parse_ids(ids, max_ids=settings.GET_MANY_MAX_IDS)
+            book_list = await by_ids_use_case.execute(book_ids=book_ids)
+            total = TotalCount(value=len(book_list), exact=True)
+        else:
+            book_sort = parse_sort(sort, allowed=BOOK_SORTS)
+            book_list, total = await use_case.execute(
+                pagination=pagination_in,
+                filters=filter_in.to_filter(),
+                sort=book_sort,
+                after_key=pagination_in.after_key(
+                    book_sort, key_type=BOOK_SORTS[book_sort.key]
+                ),
+            )
+
+        etag = list_etag("books", book_list, total.value)
+        last_modified = last_modified_of(book_list)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        items = [OutBookSchema.to_payload(obj) for obj in book_list]
+        if ids is not None:
+            pagination_out = PaginationOut(
+                offset=0, limit=len(book_ids), total=total.value
+            )
+        else:
+            pagination_out = PaginationOut(
+                offset=pagination_in.offset,
+                limit=pagination_in.limit,
+                total=total.value,
+                total_kind=total.kind,
+                next_cursor=pagination_in.next_cursor(book_list, sort=book_sort),
+            )
 
     except ApplicationException as err:
         raise HTTPException(
@@ -83,11 +233,105 @@ async def get_books_handler(
             detail={"error": err.message},
         )
 
-    return ApiResponse(
-        data=ListPaginatedResponse(items=items, pagination=pagination_out)
+    response = api_response(list_payload(items, pagination_out))
+    set_validators(response, etag, last_modified)
+    return response
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    description="Stream every book as NDJSON or CSV",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+    },
+)
+async def export_books_handler(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    container: Container = Depends(init_container),
+) -> StreamingResponse:
+    """Export books"""
+    settings: Settings = container.resolve(Settings)
+    use_case: ExportBooksUseCase = container.resolve(ExportBooksUseCase)
+
+    return export_response(
+        use_case.execute(batch_size=settings.EXPORT_BATCH_SIZE),
+        to_payload=OutBookSchema.to_payload,
+        fields=list(OutBookSchema.model_fields),
+        export_format=export_format,
+        filename="books",
     )
 
 
+@router.get(
+    "/popular",
+    response_model=ApiResponse[PopularBooksResponse],
+    status_code=status.HTTP_200_OK,
+    description="Most borrowed books of the last seven days or of all time",
+    responses={
+        status.HTTP_200_OK: {"model": ApiResponse[PopularBooksResponse]},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+    },
+)
+async def get_popular_books_handler(
+    period: PopularityPeriod = Query("week"),
+    limit: int = Query(10, ge=1, le=100),
+    container: Container = Depends(init_container),
+) -> ApiResponse[PopularBooksResponse]:
+    """Get popular books"""
+    use_case: GetPopularBooksUseCase = container.resolve(GetPopularBooksUseCase)
+
+    try:
+        popular = await use_case.execute(period=period, limit=limit)
+
+    except ApplicationException as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": err.message},
+        )
+
+    items = [PopularBookSchema.to_payload(book, borrows) for book, borrows in popular]
+    return api_response({"period": period, "items": items})
+
+
+@router.get(
+    "/search",
+    response_model=ApiResponse[BookSearchResponse],
+    status_code=status.HTTP_200_OK,
+    description="Full-text search over book titles and descriptions, best match first",
+    responses={
+        status.HTTP_200_OK: {"model": ApiResponse[BookSearchResponse]},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+    },
+)
+async def search_books_handler(
+    search_in: SearchIn = Depends(),
+    container: Container = Depends(init_container),
+) -> ApiResponse[BookSearchResponse]:
+    """Search books"""
+    use_case: SearchBooksUseCase = container.resolve(SearchBooksUseCase)
+
+    try:
+        hits = await use_case.execute(
+            query=search_in.q,
+            limit=search_in.limit,
+            after=search_in.after_position,
+        )
+        pagination_out = SearchPaginationOut(
+            limit=search_in.limit, next_cursor=search_in.next_cursor(hits)
+        )
+
+    except ApplicationException as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": err.message},
+        )
+
+    items = [BookSearchHitSchema.to_payload(book, rank) for book, rank in hits]
+    return api_response(list_payload(items, pagination_out))
+
+
 @router.get(
     "/{book_id}/",
     response_model=ApiResponse[OutBookSchema],
@@ -99,12 +343,23 @@ async def get_books_handler(
     },
 )
 async def get_book_detail_handler(
-    book_id: int, container: Container = Depends(init_container)
+    book_id: int,
+    request: Request,
+    container: Container = Depends(init_container),
 ) -> ApiResponse[OutBookSchema]:
     """Get book detail"""
     use_case: GetBookUseCase = container.resolve(GetBookUseCase)
 
     try:
+        if has_validators(request):
+            version_use_case: GetBookVersionUseCase = container.resolve(
+                GetBookVersionUseCase
+            )
+            version = await version_use_case.execute(book_id=book_id)
+            etag = version_etag(version.number)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified_response(etag, version.updated_at)
+
         book = await use_case.execute(book_id=book_id)
 
     except ApplicationException as err:
@@ -113,35 +368,52 @@ async def get_book_detail_handler(
             detail={"error": err.message},
         )
 
-    return ApiResponse(data=OutBookSchema.from_entity(book))
+    response = api_response(OutBookSchema.to_payload(book))
+    set_validators(response, version_etag(book.version), book.updated_at)
+    return response
 
 
 @router.put(
     "/{book_id}/",
     response_model=ApiResponse[OutBookSchema],
     status_code=status.HTTP_200_OK,
-    description="Update book",
+    description="Update book; with If-Match, only if it is still at that version",
     responses={
         status.HTTP_200_OK: {"model": ApiResponse[OutBookSchema]},
         status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+        status.HTTP_412_PRECONDITION_FAILED: {"model": ErrorSchema},
     },
 )
 async def update_book_handler(
-    schema: InBookSchema, book_id: int, container: Container = Depends(init_container)
+    schema: InBookSchema,
+    book_id: int,
+    request: Request,
+    container: Container = Depends(init_container),
 ) -> ApiResponse[OutBookSchema]:
     """Update book"""
     use_case: UpdateBookUseCase = container.resolve(UpdateBookUseCase)
 
     try:
-        book = await use_case.execute(book_id=book_id, book=schema.to_entity())
+        book = await use_case.execute(
+            book_id=book_id,
+            book=schema.to_entity(),
+            expected_versions=if_match_versions(request),
+        )
 
+    except BookVersionConflictException as err:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail={"error": err.message},
+        )
     except ApplicationException as err:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"error": err.message},
         )
 
-    return ApiResponse(data=OutBookSchema.from_entity(book))
+    response = api_response(OutBookSchema.to_payload(book))
+    set_validators(response, version_etag(book.version), book.updated_at)
+    return response
 
 
 @router.delete(
@@ -1,7 +1,10 @@
 from datetime import datetime
 from pydantic import BaseModel
 
+from application.api.filters import SearchPaginationOut
 from domain.entities.library import Book as BookEntity
+from infra.repositories.books.base import BookFilter
+from logic.services.popularity import PopularityPeriod
 
 
 class InBookSchema(BaseModel):
@@ -19,12 +22,26 @@ class InBookSchema(BaseModel):
         )
 
 
+class BookFilterIn(BaseModel):
+    author_id: int | None = None
+    available: bool = False
+    created_since: datetime | None = None
+
+    def to_filter(self) -> BookFilter:
+        return BookFilter(
+            author_id=self.author_id,
+            available_only=self.available,
+            created_since=self.created_since,
+        )
+
+
 class OutBookSchema(BaseModel):
     id: int
     title: str
     description: str
     author_id: int
     available_copies: int
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -36,9 +53,50 @@ class OutBookSchema(BaseModel):
             description=book.description,
             author_id=book.author_id,
             available_copies=book.available_copies,
+            version=book.version,
             created_at=book.created_at,
             updated_at=book.updated_at,
         )
 
+    @staticmethod
+    def to_payload(book: BookEntity) -> dict:
+        """Plain-data form of `from_entity` for the fast serialization path"""
+        return {
+            "id": book.id,
+            "title": book.title,
+            "description": book.description,
+            "author_id": book.author_id,
+            "available_copies": book.available_copies,
+            "version": book.version,
+            "created_at": book.created_at,
+            "updated_at": book.updated_at,
+        }
+
+
+class BookSearchHitSchema(OutBookSchema):
+    rank: float
+
+    @staticmethod
+    def to_payload(book: BookEntity, rank: float) -> dict:
+        return {**OutBookSchema.to_payload(book), "rank": rank}
+
+
+class BookSearchResponse(BaseModel):
+    items: list[BookSearchHitSchema]
+    pagination: SearchPaginationOut
+
+
+class PopularBookSchema(OutBookSchema):
+    borrows: int
+
+    @staticmethod
+    def to_payload(book: BookEntity, borrows: int) -> dict:
+        return {**OutBookSchema.to_payload(book), "borrows": borrows}
+
+
+class PopularBooksResponse(BaseModel):
+    period: PopularityPeriod
+    items: list[PopularBookSchema]
+
 
 BookListSchema = list[OutBookSchema]
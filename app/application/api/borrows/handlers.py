@@ -1,19 +1,56 @@
+from datetime import datetime
+
 from fastapi.routing import APIRouter
-from fastapi import status, Depends
+from fastapi import Query, Request, status, Depends
+from fastapi.responses import StreamingResponse
 from fastapi.exceptions import HTTPException
 
-from application.api.borrows.schemas import InBorrowSchema, OutBorrowSchema
-from application.api.filters import PaginationIn, PaginationOut
-from application.api.schemas import ApiResponse, ErrorSchema, ListPaginatedResponse
+from application.api.borrows.schemas import (
+    BorrowFilterIn,
+    InBorrowSchema,
+    OutBorrowSchema,
+)
+from application.api.conditional import (
+    entity_etag,
+    has_validators,
+    is_not_modified,
+    last_modified_of,
+    list_etag,
+    not_modified_response,
+    set_validators,
+)
+from application.api.export import ExportFormat, export_response
+from application.api.filters import PaginationIn, PaginationOut, parse_sort
+from application.api.idempotency import idempotency_key_of
+from application.api.schemas import (
+    ApiResponse,
+    ErrorSchema,
+    ListPaginatedResponse,
+    list_payload,
+)
+from application.api.serialization import api_response
 from domain.exceptions.base import ApplicationException
 
 from punq import Container
 
 from logic.init import init_container
+from logic.exceptions.idempotency import (
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+)
 from logic.use_cases.borrows.create import CreateBorrowUseCase
-from logic.use_cases.borrows.get import GetBorrowUseCase, GetBorrowsUseCase
+from logic.use_cases.borrows.export import ExportBorrowsUseCase
+from logic.use_cases.borrows.get import (
+    GetBorrowUseCase,
+    GetBorrowsUseCase,
+    GetBorrowVersionUseCase,
+)
 from logic.use_cases.borrows.update import UpdateBorrowUseCase
+from settings.config import Settings
+
 
+# sort keys backed by a (column, id) index, with the type of their cursor value
+BORROW_SORTS = {"id": int, "borrow_date": datetime}
 
 router = APIRouter(
     tags=["Borrow"],
@@ -24,27 +61,45 @@ router = APIRouter(
     "/",
     response_model=ApiResponse[OutBorrowSchema],
     status_code=status.HTTP_201_CREATED,
-    description="Create new borrow",
+    description="Create new borrow; retries with the same Idempotency-Key get the first result, and a key reused for a different body gets 422",
     responses={
         status.HTTP_201_CREATED: {"model": OutBorrowSchema},
         status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+        status.HTTP_409_CONFLICT: {"model": ErrorSchema},
     },
 )
 async def create_borrow_handler(
-    schema: InBorrowSchema, container: Container = Depends(init_container)
+    schema: InBorrowSchema,
+    request: Request,
+    container: Container = Depends(init_container),
 ) -> ApiResponse[OutBorrowSchema]:
     """Create new borrow"""
     use_case: CreateBorrowUseCase = container.resolve(CreateBorrowUseCase)
 
     try:
-        borrow = await use_case.execute(borrow=schema.to_entity())
+        borrow = await use_case.execute(
+            borrow=schema.to_entity(),
+            idempotency_key=idempotency_key_of(request, "borrows.create", schema),
+        )
+    except IdempotencyKeyReusedException as err:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"error": err.message},
+        )
+    except IdempotencyKeyInProgressException as err:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": err.message},
+        )
     except ApplicationException as err:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"error": err.message},
         )
 
-    return ApiResponse(data=OutBorrowSchema.from_entity(borrow))
+    return api_response(
+        OutBorrowSchema.to_payload(borrow), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get(
@@ -60,19 +115,37 @@ async def create_borrow_handler(
     },
 )
 async def get_borrows_handler(
+    request: Request,
     pagination_in: PaginationIn = Depends(),
+    filter_in: BorrowFilterIn = Depends(),
+    sort: str = Query("id", description="id or borrow_date; prefix with - to reverse"),
     container: Container = Depends(init_container),
 ) -> ApiResponse[ListPaginatedResponse[OutBorrowSchema]]:
     """Get borrows list"""
     use_case: GetBorrowsUseCase = container.resolve(GetBorrowsUseCase)
 
     try:
-        borrow_list = await use_case.execute(pagination=pagination_in)
-        items = [OutBorrowSchema.from_entity(obj) for obj in borrow_list]
+        borrow_sort = parse_sort(sort, allowed=BORROW_SORTS)
+        borrow_list, total = await use_case.execute(
+            pagination=pagination_in,
+            filters=filter_in.to_filter(),
+            sort=borrow_sort,
+            after_key=pagination_in.after_key(
+                borrow_sort, key_type=BORROW_SORTS[borrow_sort.key]
+            ),
+        )
+        etag = list_etag("borrows", borrow_list, total.value)
+        last_modified = last_modified_of(borrow_list)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        items = [OutBorrowSchema.to_payload(obj) for obj in borrow_list]
         pagination_out = PaginationOut(
             offset=pagination_in.offset,
             limit=pagination_in.limit,
-            total=len(items),
+            total=total.value,
+            total_kind=total.kind,
+            next_cursor=pagination_in.next_cursor(borrow_list, sort=borrow_sort),
         )
 
     except ApplicationException as err:
@@ -81,8 +154,34 @@ async def get_borrows_handler(
             detail={"error": err.message},
         )
 
-    return ApiResponse(
-        data=ListPaginatedResponse(items=items, pagination=pagination_out)
+    response = api_response(list_payload(items, pagination_out))
+    set_validators(response, etag, last_modified)
+    return response
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    description="Stream every borrow as NDJSON or CSV",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+    },
+)
+async def export_borrows_handler(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    container: Container = Depends(init_container),
+) -> StreamingResponse:
+    """Export borrows"""
+    settings: Settings = container.resolve(Settings)
+    use_case: ExportBorrowsUseCase = container.resolve(ExportBorrowsUseCase)
+
+    return export_response(
+        use_case.execute(batch_size=settings.EXPORT_BATCH_SIZE),
+        to_payload=OutBorrowSchema.to_payload,
+        fields=list(OutBorrowSchema.model_fields),
+        export_format=export_format,
+        filename="borrows",
     )
 
 
@@ -97,12 +196,23 @@ async def get_borrows_handler(
     },
 )
 async def get_borrow_detail_handler(
-    borrow_id: int, container: Container = Depends(init_container)
+    borrow_id: int,
+    request: Request,
+    container: Container = Depends(init_container),
 ) -> ApiResponse[OutBorrowSchema]:
     """Get borrow detail"""
     use_case: GetBorrowUseCase = container.resolve(GetBorrowUseCase)
 
     try:
+        if has_validators(request):
+            version_use_case: GetBorrowVersionUseCase = container.resolve(
+                GetBorrowVersionUseCase
+            )
+            updated_at = await version_use_case.execute(borrow_id=borrow_id)
+            etag = entity_etag("borrow", borrow_id, updated_at)
+            if is_not_modified(request, etag, updated_at):
+                return not_modified_response(etag, updated_at)
+
         borrow = await use_case.execute(borrow_id=borrow_id)
 
     except ApplicationException as err:
@@ -111,7 +221,11 @@ async def get_borrow_detail_handler(
             detail={"error": err.message},
         )
 
-    return ApiResponse(data=OutBorrowSchema.from_entity(borrow))
+    response = api_response(OutBorrowSchema.to_payload(borrow))
+    set_validators(
+        response, entity_etag("borrow", borrow.id, borrow.updated_at), borrow.updated_at
+    )
+    return response
 
 
 @router.patch(
@@ -1,7 +1,10 @@
 from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel
 
 from domain.entities.library import Borrow as BorrowEntity
+from infra.repositories.borrows.base import BorrowFilter
 
 
 class InBorrowSchema(BaseModel):
@@ -15,6 +18,21 @@ class InBorrowSchema(BaseModel):
         )
 
 
+class BorrowFilterIn(BaseModel):
+    status: Literal["active", "returned", "overdue"] | None = None
+    book_id: int | None = None
+    reader_name: str | None = None
+    borrowed_since: datetime | None = None
+
+    def to_filter(self) -> BorrowFilter:
+        return BorrowFilter(
+            status=self.status,
+            book_id=self.book_id,
+            reader_name=self.reader_name,
+            borrowed_since=self.borrowed_since,
+        )
+
+
 class OutBorrowSchema(BaseModel):
     id: int
     book_id: int
@@ -35,3 +53,16 @@ class OutBorrowSchema(BaseModel):
             created_at=borrow.created_at,
             updated_at=borrow.updated_at,
         )
+
+    @staticmethod
+    def to_payload(borrow: BorrowEntity) -> dict:
+        """Plain-data form of `from_entity` for the fast serialization path"""
+        return {
+            "id": borrow.id,
+            "book_id": borrow.book_id,
+            "reader_name": borrow.reader_name,
+            "borrow_date": borrow.borrow_date,
+            "return_date": borrow.return_date,
+            "created_at": borrow.created_at,
+            "updated_at": borrow.updated_at,
+        }
@@ -0,0 +1,72 @@
+import json
+from typing import Any, TypeVar
+
+from fastapi import Request, status
+from fastapi.exceptions import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from logic.services.bulk import RowError
+
+
+TSchema = TypeVar("TSchema", bound=BaseModel)
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson")
+
+
+async def read_bulk_rows(request: Request, max_rows: int) -> list[Any]:
+    """Read a JSON array or an NDJSON body into a list of raw rows"""
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type in NDJSON_MEDIA_TYPES:
+        rows = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                # kept as a row so the error is reported with its index
+                rows.append(None)
+    else:
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": "Request body is not valid JSON"},
+            )
+        if not isinstance(rows, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": "Request body must be a JSON array"},
+            )
+
+    if len(rows) > max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": f"Too many rows: {len(rows)} > {max_rows}"},
+        )
+    return rows
+
+
+def parse_bulk_rows(
+    rows: list[Any], schema: type[TSchema]
+) -> tuple[list[tuple[int, TSchema]], list[RowError]]:
+    parsed, errors = [], []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append(RowError(index=index, error="Row must be a JSON object"))
+            continue
+        try:
+            parsed.append((index, schema.model_validate(row)))
+        except ValidationError as err:
+            errors.append(RowError(index=index, error=_format_validation_error(err)))
+    return parsed, errors
+
+
+def _format_validation_error(err: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in err.errors()
+    )
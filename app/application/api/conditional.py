@@ -0,0 +1,112 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=16
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+def entity_etag(kind: str, entity_id: int, updated_at: datetime, *related) -> str:
+    """Strong validator of a single row, plus any related rows embedded in it;
+    it changes whenever one of them is written"""
+    return make_etag(
+        kind,
+        entity_id,
+        updated_at.isoformat(),
+        *(f"{entity.id}:{entity.updated_at.isoformat()}" for entity in related),
+    )
+
+
+def version_etag(version: int) -> str:
+    """Strong validator of a versioned row; the version reads back out of it, so
+    an If-Match write is checked by the update itself rather than a lookup"""
+    return f'"v{version}"'
+
+
+def list_etag(kind: str, entities: Iterable, *extra) -> str:
+    """Weak validator of a list page built from its rows' versions; whether the
+    total was counted or served from cache does not change it"""
+    etag = make_etag(
+        kind,
+        *extra,
+        *(f"{entity.id}:{entity.updated_at.isoformat()}" for entity in entities),
+    )
+    return f"W/{etag}"
+
+
+def last_modified_of(entities: Iterable) -> datetime | None:
+    return max((entity.updated_at for entity in entities), default=None)
+
+
+def _http_date(value: datetime) -> str:
+    # naive timestamps are written in server local time by the models
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def has_validators(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match uses the weak comparison, and takes precedence
+        # over If-Modified-Since when both are sent
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    modified = last_modified.astimezone(timezone.utc).replace(microsecond=0)
+    return modified <= since
+
+
+def if_match_versions(request: Request) -> frozenset[int] | None:
+    """Versions an If-Match write is conditioned on, or None when it is not
+    conditional. If-Match uses the strong comparison, so weak and foreign
+    ETags never match: a header made only of those yields an empty set"""
+    if_match = request.headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    versions = set()
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag.startswith('"v') and tag.endswith('"') and tag[2:-1].isdigit():
+            versions.add(int(tag[2:-1]))
+    return frozenset(versions)
+
+
+def set_validators(
+    response: Response, etag: str, last_modified: datetime | None = None
+):
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(last_modified)
+
+
+def not_modified_response(etag: str, last_modified: datetime | None = None) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
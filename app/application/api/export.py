@@ -0,0 +1,77 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Callable
+from datetime import date, datetime
+from typing import Any, Literal
+
+from fastapi.responses import StreamingResponse
+
+from application.api.serialization import dumps
+
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def ndjson_chunks(
+    batches: AsyncIterator[list], to_payload: Callable[[Any], dict]
+) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(dumps(to_payload(entity)) + b"\n" for entity in batch)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def csv_chunks(
+    batches: AsyncIterator[list],
+    to_payload: Callable[[Any], dict],
+    fields: list[str],
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    async for batch in batches:
+        for entity in batch:
+            payload = to_payload(entity)
+            writer.writerow([_csv_value(payload[field]) for field in fields])
+
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # header of an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+    batches: AsyncIterator[list],
+    to_payload: Callable[[Any], dict],
+    fields: list[str],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Chunked response writing one chunk per fetched batch of rows"""
+    if export_format == "csv":
+        chunks = csv_chunks(batches, to_payload, fields)
+    else:
+        chunks = ndjson_chunks(batches, to_payload)
+
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format}"'
+        },
+    )
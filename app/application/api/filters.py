@@ -1,12 +1,150 @@
-from pydantic import BaseModel
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Literal, Mapping, Sequence
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from infra.repositories.listing import Sort
+from logic.exceptions.filters import (
+    InvalidIdsException,
+    InvalidIncludeException,
+    InvalidSortException,
+)
+from logic.exceptions.pagination import InvalidCursorException
+
+
+def encode_cursor(position: dict[str, Any]) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise InvalidCursorException(cursor=cursor)
+
+    if not isinstance(position, dict):
+        raise InvalidCursorException(cursor=cursor)
+    return position
+
+
+def parse_include(include: str | None, allowed: frozenset[str]) -> set[str]:
+    """Split a comma separated `include` query parameter, rejecting unknown names"""
+    if not include:
+        return set()
+
+    names = {name.strip() for name in include.split(",") if name.strip()}
+    for name in names:
+        if name not in allowed:
+            raise InvalidIncludeException(include=name, allowed=allowed)
+    return names
+
+
+def parse_ids(ids: str, max_ids: int) -> list[int]:
+    """Split a comma separated `ids` query parameter, keeping the given order"""
+    try:
+        parsed = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise InvalidIdsException(ids=ids, max_ids=max_ids)
+
+    if not parsed or len(parsed) > max_ids:
+        raise InvalidIdsException(ids=ids, max_ids=max_ids)
+    return parsed
+
+
+def parse_sort(sort: str, allowed: Mapping[str, type]) -> Sort:
+    """Parse a `sort` query parameter such as `-created_at` against the
+    indexed sort keys of a list and their value types"""
+    key = sort.removeprefix("-")
+    if key not in allowed:
+        raise InvalidSortException(sort=sort, allowed=frozenset(allowed))
+    return Sort(key=key, descending=sort.startswith("-"))
 
 
 class PaginationOut(BaseModel):
     offset: int
     limit: int
     total: int
+    total_kind: Literal["exact", "cached"] = "exact"
+    next_cursor: str | None = None
 
 
 class PaginationIn(BaseModel):
     offset: int = 0
     limit: int = 20
+    after: str | None = None
+    exact_total: bool = False
+
+    @property
+    def after_id(self) -> int | None:
+        """Last id of the previous page; when set, offset is ignored"""
+        if self.after is None:
+            return None
+
+        after_id = decode_cursor(self.after).get("id")
+        if not isinstance(after_id, int):
+            raise InvalidCursorException(cursor=self.after)
+        return after_id
+
+    def after_key(self, sort: Sort, key_type: type) -> Any:
+        """Sort value of the last item of the previous page; a cursor only
+        continues the sort it was issued for"""
+        if self.after is None:
+            return None
+
+        position = decode_cursor(self.after)
+        if position.get("sort", "id") != sort.name:
+            raise InvalidCursorException(cursor=self.after)
+        if sort.key == "id":
+            return None
+
+        try:
+            return TypeAdapter(key_type).validate_python(position.get("key"))
+        except ValidationError:
+            raise InvalidCursorException(cursor=self.after)
+
+    def next_cursor(self, items: Sequence[Any], sort: Sort = Sort()) -> str | None:
+        if not items or len(items) < self.limit:
+            return None
+
+        last = items[-1]
+        if sort == Sort():
+            return encode_cursor({"id": last.id})
+        position = {"sort": sort.name, "id": last.id}
+        if sort.key != "id":
+            key = getattr(last, sort.key)
+            position["key"] = key.isoformat() if isinstance(key, datetime) else key
+        return encode_cursor(position)
+
+
+class SearchPaginationOut(BaseModel):
+    limit: int
+    next_cursor: str | None = None
+
+
+class SearchIn(BaseModel):
+    q: str
+    limit: int = 20
+    after: str | None = None
+
+    @property
+    def after_position(self) -> tuple[float, int] | None:
+        """(rank, id) of the last hit of the previous page"""
+        if self.after is None:
+            return None
+
+        position = decode_cursor(self.after)
+        rank, after_id = position.get("rank"), position.get("id")
+        if not isinstance(rank, (int, float)) or not isinstance(after_id, int):
+            raise InvalidCursorException(cursor=self.after)
+        return float(rank), after_id
+
+    def next_cursor(self, hits: Sequence[tuple[Any, float]]) -> str | None:
+        if not hits or len(hits) < self.limit:
+            return None
+        book, rank = hits[-1]
+        return encode_cursor({"rank": rank, "id": book.id})
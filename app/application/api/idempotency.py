@@ -0,0 +1,27 @@
+import hashlib
+
+from fastapi import Request
+from pydantic import BaseModel
+
+from logic.exceptions.idempotency import InvalidIdempotencyKeyException
+from logic.services.idempotency import IdempotencyKey
+
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def idempotency_key_of(
+    request: Request, scope: str, schema: BaseModel
+) -> IdempotencyKey | None:
+    """The request's Idempotency-Key, fingerprinted by its validated body so a
+    key reused for a different payload is told apart from a retry"""
+    key = request.headers.get("idempotency-key")
+    if key is None:
+        return None
+    if not 0 < len(key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise InvalidIdempotencyKeyException(key=key)
+
+    fingerprint = hashlib.blake2b(
+        schema.model_dump_json().encode(), digest_size=16
+    ).hexdigest()
+    return IdempotencyKey(scope=scope, key=key, fingerprint=fingerprint)
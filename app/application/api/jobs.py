@@ -0,0 +1,40 @@
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    """Runs `run` in the background right away and then every `interval` seconds,
+    until stopped; a failed run is logged and retried on the next tick"""
+
+    name: str
+    interval: float
+    run: Callable[[], Awaitable[Any]]
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run()
+            except Exception:
+                logger.exception("Job %s failed", self.name)
+            await asyncio.sleep(self.interval)
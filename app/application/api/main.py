@@ -1,19 +1,61 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from punq import Container
+from fastapi.responses import PlainTextResponse
 from application.api.authors.handlers import router as author_router
 from application.api.books.handlers import router as book_router
 from application.api.borrows.handlers import router as borrow_router
+from application.api.jobs import PeriodicJob
+from application.api.admission import build_admission_controller
+from application.api.metrics import render_metrics, request_metrics
+from application.api.middlewares import (
+    AdmissionControlMiddleware,
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+)
 from infra.database.manager import DatabaseManager
 from logic.init import init_container
+from logic.use_cases.borrows.remind import RemindOverdueBorrowsUseCase
+from logic.use_cases.idempotency.purge import PurgeIdempotencyKeysUseCase
+from settings.config import Settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    container: Container = init_container()
+    container = init_container()
     database_manager: DatabaseManager = container.resolve(DatabaseManager)
-    await database_manager.init_models()
+    settings: Settings = container.resolve(Settings)
+
+    jobs = []
+    if settings.OVERDUE_SCAN_INTERVAL_SECONDS > 0:
+        remind_overdue: RemindOverdueBorrowsUseCase = container.resolve(
+            RemindOverdueBorrowsUseCase
+        )
+        jobs.append(
+            PeriodicJob(
+                name="overdue-scan",
+                interval=settings.OVERDUE_SCAN_INTERVAL_SECONDS,
+                run=remind_overdue.execute,
+            )
+        )
+
+    if settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS > 0:
+        purge_idempotency_keys: PurgeIdempotencyKeysUseCase = container.resolve(
+            PurgeIdempotencyKeysUseCase
+        )
+        jobs.append(
+            PeriodicJob(
+                name="idempotency-key-purge",
+                interval=settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+                run=purge_idempotency_keys.execute,
+            )
+        )
+
+    for job in jobs:
+        job.start()
     yield
+    for job in jobs:
+        await job.stop()
+    await database_manager.dispose()
 
 
 def create_app() -> FastAPI:
@@ -21,8 +63,29 @@ def create_app() -> FastAPI:
         title="Library Service", docs_url="/api/docs", debug=True, lifespan=lifespan
     )
 
+    # admission control belongs to the HTTP layer, so it is built here rather
+    # than registered in the logic container
+    admission_controller = build_admission_controller(
+        init_container().resolve(Settings)
+    )
+
+    app.add_middleware(ReadYourWritesMiddleware)
+    # ahead of the routers, so a shed request costs no work at all
+    app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+    # around admission control, so shed requests are counted and timed too
+    app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
+    app.state.admission_controller = admission_controller
+
     app.include_router(author_router, prefix="/authors")
     app.include_router(book_router, prefix="/books")
     app.include_router(borrow_router, prefix="/borrows")
 
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(
+            render_metrics(init_container(), admission_controller),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
     return app
@@ -0,0 +1,349 @@
+from dataclasses import dataclass, field
+
+from punq import Container
+
+from application.api.admission import AdmissionController
+from infra.cache.entities import EntityCaches
+from infra.database.instrumentation import TimingSummary
+from infra.database.manager import DatabaseManager
+from infra.database.pool import PoolStatus
+from infra.metrics import Exposition, Histogram
+from logic.services.loader import EntityLoaders
+from logic.services.reminders import OverdueScanStats
+from logic.services.single_flight import SingleFlight
+from logic.use_cases.base import use_case_latency
+
+
+@dataclass
+class RequestMetrics:
+    latency: Histogram = field(
+        default_factory=lambda: Histogram(
+            name="http_request_duration_seconds",
+            help="Duration of HTTP requests, by method, route template and status",
+            labels=("method", "route", "status"),
+        )
+    )
+    in_flight: int = 0
+
+
+request_metrics = RequestMetrics()
+
+
+def render_metrics(
+    container: Container, admission_controller: AdmissionController
+) -> str:
+    exposition = Exposition()
+
+    exposition.histogram(request_metrics.latency)
+    exposition.gauge(
+        "http_requests_in_flight",
+        "HTTP requests being handled by this worker",
+        [((), request_metrics.in_flight)],
+    )
+    exposition.histogram(use_case_latency)
+
+    database_manager = container.resolve(DatabaseManager)
+    _pool_metrics(exposition, database_manager)
+    _timing_metrics(
+        exposition,
+        "db_statement",
+        "operation",
+        "database statements, by the repository method that ran them",
+        database_manager.query_timings.statement_summary(),
+    )
+    _timing_metrics(
+        exposition,
+        "db_repository_operation",
+        "operation",
+        "repository methods, by repository and method",
+        database_manager.query_timings.operation_summary(),
+    )
+    _cache_metrics(exposition, container.resolve(EntityCaches))
+    _loader_metrics(exposition, container.resolve(EntityLoaders))
+    _single_flight_metrics(exposition, container.resolve(SingleFlight))
+    _admission_metrics(exposition, admission_controller)
+    _overdue_scan_metrics(exposition, container.resolve(OverdueScanStats))
+
+    return exposition.text()
+
+
+def _pool_metrics(exposition: Exposition, database_manager: DatabaseManager):
+    pools: list[tuple[tuple, PoolStatus]] = [
+        (("primary",), database_manager.pool_status())
+    ]
+    if database_manager.has_replica:
+        pools.append((("replica",), database_manager.replica_pool_status()))
+
+    labels = ("pool",)
+    exposition.gauge(
+        "db_pool_size",
+        "Connections the pool keeps open",
+        [(pool, status.size) for pool, status in pools],
+        labels,
+    )
+    exposition.gauge(
+        "db_pool_checked_out",
+        "Connections in use",
+        [(pool, status.checked_out) for pool, status in pools],
+        labels,
+    )
+    exposition.gauge(
+        "db_pool_checked_in",
+        "Idle connections in the pool",
+        [(pool, status.checked_in) for pool, status in pools],
+        labels,
+    )
+    exposition.gauge(
+        "db_pool_overflow",
+        "Connections open beyond the pool size",
+        [(pool, status.overflow) for pool, status in pools],
+        labels,
+    )
+    exposition.counter(
+        "db_pool_checkouts_total",
+        "Connections handed out by the pool",
+        [(pool, status.checkouts) for pool, status in pools],
+        labels,
+    )
+    exposition.counter(
+        "db_pool_checkout_timeouts_total",
+        "Checkouts that gave up waiting for a connection",
+        [(pool, status.timeouts) for pool, status in pools],
+        labels,
+    )
+    exposition.gauge(
+        "db_pool_checkout_wait_seconds_avg",
+        "Average wait for a connection",
+        [(pool, status.avg_wait) for pool, status in pools],
+        labels,
+    )
+    exposition.gauge(
+        "db_pool_checkout_wait_seconds_max",
+        "Longest wait for a connection",
+        [(pool, status.max_wait) for pool, status in pools],
+        labels,
+    )
+
+
+def _timing_metrics(
+    exposition: Exposition,
+    prefix: str,
+    label: str,
+    subject: str,
+    summaries: dict[str, TimingSummary],
+):
+    timings = sorted(summaries.items())
+    labels = (label,)
+    exposition.counter(
+        f"{prefix}_executions_total",
+        f"Executions of {subject}",
+        [((key,), summary.count) for key, summary in timings],
+        labels,
+    )
+    exposition.counter(
+        f"{prefix}_seconds_total",
+        f"Time spent in {subject}",
+        [((key,), summary.total) for key, summary in timings],
+        labels,
+    )
+    # percentiles cover the latest QueryTimings.window executions of each key
+    exposition.gauge(
+        f"{prefix}_duration_seconds",
+        f"Recent duration percentiles of {subject}",
+        [
+            sample
+            for key, summary in timings
+            for sample in (
+                ((key, "0.5"), summary.p50),
+                ((key, "0.95"), summary.p95),
+                ((key, "0.99"), summary.p99),
+            )
+        ],
+        (label, "quantile"),
+    )
+    exposition.gauge(
+        f"{prefix}_duration_seconds_max",
+        f"Longest duration of {subject}",
+        [((key,), summary.max) for key, summary in timings],
+        labels,
+    )
+
+
+def _loader_metrics(exposition: Exposition, entity_loaders: EntityLoaders):
+    loaders = [
+        (name, loader)
+        for name, loader in (
+            ("authors", entity_loaders.authors),
+            ("books", entity_loaders.books),
+            ("borrows", entity_loaders.borrows),
+        )
+        if loader is not None
+    ]
+    labels = ("loader",)
+    exposition.counter(
+        "batch_loader_loads_total",
+        "Lookups requested through a batch loader",
+        [((name,), loader.stats.loads) for name, loader in loaders],
+        labels,
+    )
+    exposition.counter(
+        "batch_loader_batches_total",
+        "Batched fetches issued by a batch loader",
+        [((name,), loader.stats.batches) for name, loader in loaders],
+        labels,
+    )
+    exposition.counter(
+        "batch_loader_keys_total",
+        "Distinct keys fetched by a batch loader",
+        [((name,), loader.stats.keys) for name, loader in loaders],
+        labels,
+    )
+    exposition.counter(
+        "batch_loader_coalesced_total",
+        "Lookups answered without a query of their own",
+        [((name,), loader.stats.coalesced) for name, loader in loaders],
+        labels,
+    )
+
+
+def _cache_metrics(exposition: Exposition, entity_caches: EntityCaches):
+    caches = entity_caches.items()
+    labels = ("cache",)
+    exposition.gauge(
+        "cache_entries",
+        "Entries held by an entity cache",
+        [((name,), len(cache)) for name, cache in caches],
+        labels,
+    )
+    exposition.gauge(
+        "cache_max_entries",
+        "Entries an entity cache holds before evicting",
+        [((name,), cache.maxsize) for name, cache in caches],
+        labels,
+    )
+    exposition.counter(
+        "cache_hits_total",
+        "Entity cache lookups served from memory",
+        [((name,), cache.stats.hits) for name, cache in caches],
+        labels,
+    )
+    exposition.counter(
+        "cache_misses_total",
+        "Entity cache lookups that went to the database",
+        [((name,), cache.stats.misses) for name, cache in caches],
+        labels,
+    )
+    exposition.counter(
+        "cache_evictions_total",
+        "Least recently used entries dropped to stay within the size limit",
+        [((name,), cache.stats.evictions) for name, cache in caches],
+        labels,
+    )
+    exposition.counter(
+        "cache_expirations_total",
+        "Entries dropped because their ttl ran out",
+        [((name,), cache.stats.expirations) for name, cache in caches],
+        labels,
+    )
+    exposition.counter(
+        "cache_invalidations_total",
+        "Entries dropped because the entity was written",
+        [((name,), cache.stats.invalidations) for name, cache in caches],
+        labels,
+    )
+
+
+def _single_flight_metrics(exposition: Exposition, single_flight: SingleFlight | None):
+    # the container registers None when SINGLE_FLIGHT_ENABLED is off
+    exposition.gauge(
+        "single_flight_enabled",
+        "Whether concurrent identical reads share one execution",
+        [((), int(single_flight is not None))],
+    )
+    if single_flight is None:
+        return
+
+    kinds = sorted(single_flight.stats.items())
+    labels = ("kind",)
+    exposition.counter(
+        "single_flight_calls_total",
+        "Reads requested through single flight, by kind of read",
+        [((kind,), stats.calls) for kind, stats in kinds],
+        labels,
+    )
+    exposition.counter(
+        "single_flight_executions_total",
+        "Reads actually executed, by kind of read",
+        [((kind,), stats.executions) for kind, stats in kinds],
+        labels,
+    )
+    exposition.counter(
+        "single_flight_coalesced_total",
+        "Callers that shared another caller's in-flight read, by kind of read",
+        [((kind,), stats.coalesced) for kind, stats in kinds],
+        labels,
+    )
+
+
+def _admission_metrics(exposition: Exposition, controller: AdmissionController):
+    limiters = sorted(controller.limiters.items())
+    labels = ("group",)
+    exposition.gauge(
+        "admission_in_flight",
+        "Admitted requests running, by route group",
+        [((group,), limiter.in_flight) for group, limiter in limiters],
+        labels,
+    )
+    exposition.gauge(
+        "admission_waiting",
+        "Requests queued for a slot, by route group",
+        [((group,), limiter.waiting) for group, limiter in limiters],
+        labels,
+    )
+    exposition.counter(
+        "admission_admitted_total",
+        "Requests admitted, by route group",
+        [((group,), limiter.stats.admitted) for group, limiter in limiters],
+        labels,
+    )
+    exposition.counter(
+        "admission_queued_total",
+        "Requests that had to queue for a slot, by route group",
+        [((group,), limiter.stats.queued) for group, limiter in limiters],
+        labels,
+    )
+    exposition.counter(
+        "admission_shed_total",
+        "Requests turned away with a 503, by route group and reason",
+        [
+            sample
+            for group, limiter in limiters
+            for sample in (
+                ((group, "queue_full"), limiter.stats.shed_queue_full),
+                ((group, "wait_timeout"), limiter.stats.shed_wait_timeout),
+            )
+        ],
+        ("group", "reason"),
+    )
+
+
+def _overdue_scan_metrics(exposition: Exposition, stats: OverdueScanStats):
+    exposition.counter(
+        "overdue_scan_runs_total", "Overdue borrow scans run", [((), stats.runs)]
+    )
+    exposition.counter(
+        "overdue_scan_borrows_total",
+        "Outstanding borrows looked at by overdue scans",
+        [((), stats.scanned)],
+    )
+    exposition.counter(
+        "overdue_scan_reminders_total",
+        "Overdue reminders recorded",
+        [((), stats.reminded)],
+    )
+    if stats.last_run is not None:
+        exposition.gauge(
+            "overdue_scan_last_duration_seconds",
+            "Duration of the latest overdue scan",
+            [((), stats.last_run.duration)],
+        )
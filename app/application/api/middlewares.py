@@ -0,0 +1,119 @@
+import time
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from application.api.admission import AdmissionController
+from application.api.metrics import RequestMetrics
+from infra.database.unit_of_work import read_your_writes
+
+
+READ_YOUR_WRITES_HEADER = b"x-read-your-writes"
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+_TRUTHY = {b"1", b"true", b"yes"}
+
+
+class ReadYourWritesMiddleware:
+    """Pins reads of writing requests, or of requests sending `X-Read-Your-Writes: 1`, to the primary"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._needs_primary(scope):
+            await self.app(scope, receive, send)
+            return
+
+        with read_your_writes():
+            await self.app(scope, receive, send)
+
+    @staticmethod
+    def _needs_primary(scope: Scope) -> bool:
+        if scope["method"] not in _READ_METHODS:
+            return True
+
+        for name, value in scope["headers"]:
+            if name == READ_YOUR_WRITES_HEADER:
+                return value.strip().lower() in _TRUTHY
+        return False
+
+
+class AdmissionControlMiddleware:
+    """Turns requests away with a fast 503 once their route group has as many
+    running and queued as it admits, instead of letting them pile up on the
+    database pool"""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiter_for(scope["method"], scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            response = JSONResponse(
+                {"detail": {"error": "Server is busy, retry later"}},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(self.controller.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+class MetricsMiddleware:
+    """Counts requests in flight and times each one by its route template, so
+    `/books/{book_id}/` is one series however many books are requested"""
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.metrics.in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight -= 1
+            self.metrics.latency.observe(
+                time.perf_counter() - started_at,
+                scope["method"],
+                _route_template(scope),
+                str(status_code),
+            )
+
+
+def _route_template(scope: Scope) -> str:
+    # set by the router on the scope once a route matched
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        # plain starlette routes, such as the docs, have static paths
+        return scope["path"]
+    return "unmatched"
@@ -2,6 +2,7 @@ from typing import Any, Generic, TypeVar
 from pydantic import Field, BaseModel
 
 from application.api.filters import PaginationOut
+from logic.services.bulk import BulkCreateResult
 
 
 TData = TypeVar("TData")
@@ -13,6 +14,11 @@ class ListPaginatedResponse(BaseModel, Generic[TListItem]):
     pagination: PaginationOut
 
 
+def list_payload(items: list[dict], pagination: PaginationOut) -> dict:
+    """Plain-data form of `ListPaginatedResponse` for the fast serialization path"""
+    return {"items": items, "pagination": pagination.model_dump()}
+
+
 class ApiResponse(BaseModel, Generic[TData]):
     data: TData | dict = Field(default_factory=dict)
     meta: dict[str, Any] = Field(default_factory=dict)
@@ -21,3 +27,44 @@ class ApiResponse(BaseModel, Generic[TData]):
 
 class ErrorSchema(BaseModel):
     error: str
+
+
+class BulkCreatedItemSchema(BaseModel):
+    index: int
+    id: int
+
+
+class BulkRowErrorSchema(BaseModel):
+    index: int
+    error: str
+
+
+class BulkCreateResponse(BaseModel):
+    created: list[BulkCreatedItemSchema]
+    errors: list[BulkRowErrorSchema]
+
+    @staticmethod
+    def from_result(result: BulkCreateResult) -> "BulkCreateResponse":
+        return BulkCreateResponse(
+            created=[
+                BulkCreatedItemSchema(index=index, id=obj_id)
+                for index, obj_id in result.created
+            ],
+            errors=[
+                BulkRowErrorSchema(index=error.index, error=error.error)
+                for error in sorted(result.errors, key=lambda error: error.index)
+            ],
+        )
+
+    @staticmethod
+    def to_payload(result: BulkCreateResult) -> dict:
+        """Plain-data form of `from_result` for the fast serialization path"""
+        return {
+            "created": [
+                {"index": index, "id": obj_id} for index, obj_id in result.created
+            ],
+            "errors": [
+                {"index": error.index, "error": error.error}
+                for error in sorted(result.errors, key=lambda error: error.index)
+            ],
+        }
@@ -0,0 +1,33 @@
+from typing import Any, Mapping
+
+import orjson
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for payloads that are already trusted plain data.
+
+    Returning it from a handler bypasses `response_model` validation, so the
+    payload must come from the `to_payload` helpers rather than user input.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def api_response(
+    data: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Mapping[str, str] | None = None,
+) -> FastJSONResponse:
+    """Same envelope as `ApiResponse`, without building and re-validating models"""
+    return FastJSONResponse(
+        {"data": data, "meta": {}, "errors": []},
+        status_code=status_code,
+        headers=headers,
+    )
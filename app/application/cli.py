@@ -0,0 +1,29 @@
+import argparse
+import asyncio
+
+from infra.database.manager import DatabaseManager
+from logic.init import init_container
+from logic.use_cases.borrows.counters import RebuildBorrowCountersUseCase
+
+
+async def main(command: str):
+    container = init_container()
+    database_manager: DatabaseManager = container.resolve(DatabaseManager)
+
+    try:
+        if command == "rebuild-borrow-counters":
+            use_case: RebuildBorrowCountersUseCase = container.resolve(
+                RebuildBorrowCountersUseCase
+            )
+            counted = await use_case.execute()
+            print(f"Rebuilt borrow counters of {counted} books and authors")
+
+    finally:
+        await database_manager.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Library service maintenance")
+    parser.add_argument("command", choices=["rebuild-borrow-counters"])
+    args = parser.parse_args()
+    asyncio.run(main(args.command))
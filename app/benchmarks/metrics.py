@@ -0,0 +1,84 @@
+"""Measure the per-request cost of the metrics collectors.
+
+Run from the `app` directory:
+
+    python -m benchmarks.metrics --rounds 200000
+"""
+
+import argparse
+import asyncio
+import time
+
+from application.api.metrics import RequestMetrics
+from application.api.middlewares import MetricsMiddleware
+from logic.use_cases.base import BaseUseCase
+
+
+class _Route:
+    path = "/books/{book_id}/"
+
+
+async def bare_app(scope, receive, send):
+    # what the router leaves on the scope, and the smallest response
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+class NoopUseCase(BaseUseCase):
+    async def execute(self) -> None:
+        return None
+
+
+async def untimed_execute(self) -> None:
+    return None
+
+
+async def measure(name: str, rounds: int, call) -> float:
+    for _ in range(1000):
+        await call()
+    started = time.process_time()
+    for _ in range(rounds):
+        await call()
+    per_call = (time.process_time() - started) / rounds * 1_000_000
+    print(f"{name:<22} {per_call:8.3f} us/call")
+    return per_call
+
+
+def scope() -> dict:
+    return {"type": "http", "method": "GET", "path": "/books/1/"}
+
+
+async def main(rounds: int):
+    middleware = MetricsMiddleware(bare_app, metrics=RequestMetrics())
+    print(f"{rounds} rounds")
+
+    bare_us = await measure(
+        "request, bare", rounds, lambda: bare_app(scope(), receive, send)
+    )
+    metered_us = await measure(
+        "request, metered", rounds, lambda: middleware(scope(), receive, send)
+    )
+    print(f"{'request overhead':<22} {metered_us - bare_us:8.3f} us/request")
+
+    use_case = NoopUseCase()
+    untimed_us = await measure(
+        "use case, untimed", rounds, lambda: untimed_execute(use_case)
+    )
+    timed_us = await measure("use case, timed", rounds, use_case.execute)
+    print(f"{'use case overhead':<22} {timed_us - untimed_us:8.3f} us/call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
@@ -0,0 +1,100 @@
+"""Compare the CPU cost of the `response_model` path with the fast JSON path.
+
+Run from the `app` directory:
+
+    python -m benchmarks.serialization --items 100 --rounds 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from application.api.books.handlers import router as book_router
+from application.api.books.schemas import OutBookSchema
+from application.api.filters import PaginationOut
+from application.api.schemas import ApiResponse, ListPaginatedResponse, list_payload
+from application.api.serialization import api_response
+from domain.entities.library import Book
+
+
+def build_books(count: int) -> list[Book]:
+    created_at = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    return [
+        Book(
+            id=book_id,
+            title=f"Book {book_id}",
+            description="A fairly ordinary description of a library book",
+            author_id=book_id % 50 + 1,
+            available_copies=book_id % 7,
+            created_at=created_at,
+            updated_at=created_at + timedelta(seconds=book_id),
+        )
+        for book_id in range(1, count + 1)
+    ]
+
+
+def list_route_field():
+    for route in book_router.routes:
+        if isinstance(route, APIRoute) and route.name == "get_books_handler":
+            return route.secure_cloned_response_field
+    raise LookupError("get_books_handler route not found")
+
+
+async def legacy_body(books: list[Book], pagination: PaginationOut, field) -> bytes:
+    """What the handlers did before: build models, then let FastAPI validate
+    them against `response_model` and encode the result"""
+    data = ApiResponse(
+        data=ListPaginatedResponse(
+            items=[OutBookSchema.from_entity(book) for book in books],
+            pagination=pagination,
+        )
+    )
+    content = await serialize_response(field=field, response_content=data)
+    return JSONResponse(content).body
+
+
+async def fast_body(books: list[Book], pagination: PaginationOut) -> bytes:
+    items = [OutBookSchema.to_payload(book) for book in books]
+    return api_response(list_payload(items, pagination)).body
+
+
+async def measure(name: str, rounds: int, body) -> float:
+    await body()
+    started = time.process_time()
+    for _ in range(rounds):
+        await body()
+    per_request = (time.process_time() - started) / rounds * 1_000_000
+    print(f"{name:<10} {per_request:10.1f} us/request")
+    return per_request
+
+
+async def main(items: int, rounds: int):
+    books = build_books(items)
+    pagination = PaginationOut(offset=0, limit=items, total=items * 10)
+    field = list_route_field()
+
+    legacy = await legacy_body(books, pagination, field)
+    fast = await fast_body(books, pagination)
+    assert json.loads(legacy) == json.loads(fast), "payloads differ"
+
+    print(f"{items} items per page, {rounds} rounds")
+    legacy_us = await measure(
+        "legacy", rounds, lambda: legacy_body(books, pagination, field)
+    )
+    fast_us = await measure("fast", rounds, lambda: fast_body(books, pagination))
+    print(
+        f"saving     {legacy_us - fast_us:10.1f} us/request ({1 - fast_us / legacy_us:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.rounds))
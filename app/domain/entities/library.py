@@ -9,6 +9,7 @@ class Book:
     author_id: int
     available_copies: int
     id: int | None = field(default=None, kw_only=True)
+    version: int = field(default=1, kw_only=True)
     created_at: datetime = field(default_factory=datetime.now, kw_only=True)
     updated_at: datetime | None = field(default=None)
 
@@ -20,6 +21,7 @@ class Author:
     date_of_birth: date
     books: set[Book] = field(default_factory=set, kw_only=True)
     id: int | None = field(default=None, kw_only=True)
+    version: int = field(default=1, kw_only=True)
     created_at: datetime = field(default_factory=datetime.now, kw_only=True)
     updated_at: datetime | None = field(default=None)
 
@@ -33,3 +35,11 @@ class Borrow:
     id: int | None = field(default=None, kw_only=True)
     created_at: datetime = field(default_factory=datetime.now, kw_only=True)
     updated_at: datetime | None = field(default=None)
+
+
+@dataclass(frozen=True)
+class EntityVersion:
+    """Write counter of a row, bumped by every update, and when it was last written"""
+
+    number: int
+    updated_at: datetime
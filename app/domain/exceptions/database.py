@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from domain.exceptions.base import ApplicationException
+
+
+@dataclass(eq=False)
+class UnsupportedDatabaseDialectException(ApplicationException):
+    dialect: str
+
+    @property
+    def message(self):
+        return f"Unsupported database dialect: {self.dialect}"
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+from infra.cache.memory import TTLCache
+
+
+@dataclass
+class EntityCaches:
+    """Per-entity lookup caches; an entity without a cache is always read from the database"""
+
+    authors: TTLCache | None = None
+    books: TTLCache | None = None
+    borrows: TTLCache | None = None
+
+    def items(self) -> list[tuple[str, TTLCache]]:
+        return [
+            (name, cache)
+            for name, cache in (
+                ("authors", self.authors),
+                ("books", self.books),
+                ("borrows", self.borrows),
+            )
+            if cache is not None
+        ]
+
+
+def build_cache(maxsize: int, ttl: float) -> TTLCache | None:
+    if maxsize <= 0 or ttl <= 0:
+        return None
+    return TTLCache(maxsize=maxsize, ttl=ttl)
@@ -0,0 +1,40 @@
+from typing import Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infra.cache.memory import TTLCache
+
+
+def _on_transaction_end(session: AsyncSession, callback: Callable[[], None]):
+    # a rollback also ends the transaction: entries cached while it was open
+    # may have been filled with rows it wrote or locked, so drop them as well
+    for event_name in ("after_commit", "after_rollback"):
+        event.listen(
+            session.sync_session,
+            event_name,
+            lambda _session: callback(),
+            once=True,
+        )
+
+
+def invalidate_on_commit(session: AsyncSession, cache: TTLCache, key: Hashable):
+    """Drop a cached entry now and again once the writing transaction ends
+
+    The second pass catches readers that re-cached the old row between the
+    write and the commit or rollback.
+    """
+    cache.delete(key)
+    _on_transaction_end(session, lambda: cache.delete(key))
+
+
+def invalidate_matching_on_commit(
+    session: AsyncSession, cache: TTLCache, predicate: Callable[[Hashable], bool]
+):
+    cache.delete_matching(predicate)
+    _on_transaction_end(session, lambda: cache.delete_matching(predicate))
+
+
+def clear_on_commit(session: AsyncSession, cache: TTLCache):
+    cache.clear()
+    _on_transaction_end(session, cache.clear)
@@ -0,0 +1,23 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+from domain.exceptions.database import UnsupportedDatabaseDialectException
+
+
+# upserts, full-text search and the migrations are written for these only
+SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+
+def check_dialect(dialect: str):
+    """Fail at startup, rather than on the first request that needs a dialect
+    specific statement"""
+    if dialect not in SUPPORTED_DIALECTS:
+        raise UnsupportedDatabaseDialectException(dialect=dialect)
+
+
+def upsert_insert(dialect: str):
+    """`insert` of the dialect, which supports ON CONFLICT clauses"""
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise UnsupportedDatabaseDialectException(dialect=dialect)
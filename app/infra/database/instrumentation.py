@@ -0,0 +1,169 @@
+import logging
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+from inspect import iscoroutinefunction
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+_current_operation: ContextVar[str | None] = ContextVar(
+    "current_repository_operation", default=None
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+_PLACEHOLDER = r"(?:\?|%s|\$\d+(?:::\w+)?|:\w+)"
+_PLACEHOLDER_LIST_RE = re.compile(
+    rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)"
+)
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(statement: str) -> str:
+    """Collapse a SQL statement to a stable key: literals and IN-lists become placeholders"""
+    normalized = _WHITESPACE_RE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL_RE.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST_RE.sub("(?)", normalized)
+    return _NUMBER_LITERAL_RE.sub("?", normalized)
+
+
+@dataclass(frozen=True)
+class TimingSummary:
+    count: int
+    total: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+@dataclass
+class _TimingSeries:
+    samples: deque
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def record(self, duration: float):
+        self.samples.append(duration)
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def summary(self) -> TimingSummary:
+        ordered = sorted(self.samples)
+        return TimingSummary(
+            count=self.count,
+            total=self.total,
+            p50=_percentile(ordered, 50),
+            p95=_percentile(ordered, 95),
+            p99=_percentile(ordered, 99),
+            max=self.max,
+        )
+
+
+def _percentile(ordered: list[float], percent: int) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+@dataclass
+class QueryTimings:
+    """Keeps a bounded window of durations (in seconds) per repository method, for its
+    statements and for the method call as a whole. Statements run outside a repository
+    method (migrations, schema reflection) share the "<unknown>" key"""
+
+    window: int = 1000
+    statements: dict[str, _TimingSeries] = field(default_factory=dict)
+    operations: dict[str, _TimingSeries] = field(default_factory=dict)
+
+    def _series(self, registry: dict[str, _TimingSeries], key: str) -> _TimingSeries:
+        series = registry.get(key)
+        if series is None:
+            series = registry[key] = _TimingSeries(samples=deque(maxlen=self.window))
+        return series
+
+    def record_statement(self, operation: str, duration: float):
+        self._series(self.statements, operation).record(duration)
+
+    def record_operation(self, operation: str, duration: float):
+        self._series(self.operations, operation).record(duration)
+
+    def statement_summary(self) -> dict[str, TimingSummary]:
+        return {key: series.summary() for key, series in self.statements.items()}
+
+    def operation_summary(self) -> dict[str, TimingSummary]:
+        return {key: series.summary() for key, series in self.operations.items()}
+
+    def reset(self):
+        self.statements.clear()
+        self.operations.clear()
+
+
+query_timings = QueryTimings()
+
+
+def instrument_engine(
+    engine: Engine,
+    timings: QueryTimings,
+    slow_query_threshold: float,
+):
+    """Time every statement executed by the engine, logging the ones slower than the threshold (seconds)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        duration = time.perf_counter() - context._query_started_at
+        # keyed by repository method rather than statement text: the set of methods
+        # is fixed, so the metrics exported from these keys stay bounded
+        operation = _current_operation.get() or "<unknown>"
+        timings.record_statement(operation, duration)
+
+        if duration >= slow_query_threshold:
+            logger.warning(
+                "Slow query (%.1f ms) in %s: %s",
+                duration * 1000,
+                operation,
+                normalize_statement(statement),
+            )
+
+
+def instrument_repository(cls):
+    """Class decorator timing every public coroutine method of a repository"""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _timed_operation(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _timed_operation(operation: str, method):
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = _current_operation.set(operation)
+        started_at = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            query_timings.record_operation(operation, time.perf_counter() - started_at)
+            _current_operation.reset(token)
+
+    return wrapper
@@ -1,15 +1,126 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from infra.database.models import Base
+from infra.database.dialects import check_dialect
+from infra.database.instrumentation import instrument_engine, query_timings
+from infra.database.pool import (
+    InstrumentedAsyncQueuePool,
+    PoolStatus,
+    PoolWaitStats,
+    get_pool_status,
+)
 
 
 class DatabaseManager:
-    def __init__(self, database_url: str):
-        self.engine = create_async_engine(database_url, echo=True)
+    def __init__(
+        self,
+        database_url: str,
+        replica_url: str | None = None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        statement_cache_size: int = 100,
+        echo: bool = False,
+        slow_query_threshold_ms: float = 200,
+    ):
+        self.pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping,
+            "statement_cache_size": statement_cache_size,
+        }
+        self.echo = echo
+        self.slow_query_threshold = slow_query_threshold_ms / 1000
+        self.query_timings = query_timings
+
+        self.pool_wait_stats = PoolWaitStats()
+        self.engine = self._create_engine(database_url, self.pool_wait_stats)
         self.SessionLocal = sessionmaker(
             bind=self.engine, class_=AsyncSession, expire_on_commit=False
         )
 
-    async def init_models(self):
-        async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        # without a replica, reads share the primary engine
+        self.replica_pool_wait_stats = self.pool_wait_stats
+        self.read_engine = self.engine
+        self.ReadSessionLocal = self.SessionLocal
+        if replica_url:
+            self.replica_pool_wait_stats = PoolWaitStats()
+            self.read_engine = self._create_engine(
+                replica_url, self.replica_pool_wait_stats
+            )
+            self.ReadSessionLocal = sessionmaker(
+                bind=self.read_engine, class_=AsyncSession, expire_on_commit=False
+            )
+
+    @property
+    def has_replica(self) -> bool:
+        return self.read_engine is not self.engine
+
+    def _create_engine(
+        self, database_url: str, wait_stats: PoolWaitStats
+    ) -> AsyncEngine:
+        check_dialect(make_url(database_url).get_backend_name())
+        engine = create_async_engine(
+            database_url,
+            echo=self.echo,
+            **self._build_pool_options(database_url, **self.pool_options),
+        )
+        if isinstance(engine.pool, InstrumentedAsyncQueuePool):
+            engine.pool.wait_stats = wait_stats
+
+        instrument_engine(
+            engine.sync_engine,
+            timings=self.query_timings,
+            slow_query_threshold=self.slow_query_threshold,
+        )
+        return engine
+
+    @staticmethod
+    def _build_pool_options(
+        database_url: str,
+        pool_size: int,
+        max_overflow: int,
+        pool_timeout: float,
+        pool_recycle: int,
+        pool_pre_ping: bool,
+        statement_cache_size: int,
+    ) -> dict:
+        url = make_url(database_url)
+
+        # in-memory sqlite lives inside a single connection, so it keeps
+        # the dialect's default static pool
+        if url.get_backend_name() == "sqlite" and url.database in (
+            None,
+            "",
+            ":memory:",
+        ):
+            return {}
+
+        options = {
+            "poolclass": InstrumentedAsyncQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping,
+        }
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "prepared_statement_cache_size": statement_cache_size
+            }
+        return options
+
+    def pool_status(self) -> PoolStatus:
+        return get_pool_status(self.engine.pool, self.pool_wait_stats)
+
+    def replica_pool_status(self) -> PoolStatus:
+        return get_pool_status(self.read_engine.pool, self.replica_pool_wait_stats)
+
+    async def dispose(self):
+        await self.engine.dispose()
+        if self.has_replica:
+            await self.read_engine.dispose()
@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+
+from infra.database.manager import DatabaseManager
+from infra.database.migrations.runner import current_version, load_migrations, upgrade
+from logic.init import init_container
+
+
+async def main(command: str):
+    database_manager: DatabaseManager = init_container().resolve(DatabaseManager)
+
+    try:
+        if command == "upgrade":
+            applied = await upgrade(database_manager.engine)
+            for migration in applied:
+                print(f"Applied {migration.version}: {migration.description}")
+            if not applied:
+                print("Database is up to date")
+
+        elif command == "current":
+            print(await current_version(database_manager.engine) or "<empty>")
+
+        elif command == "history":
+            for migration in load_migrations():
+                print(f"{migration.version}: {migration.description}")
+
+    finally:
+        await database_manager.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    parser.add_argument("command", choices=["upgrade", "current", "history"])
+    args = parser.parse_args()
+    asyncio.run(main(args.command))
@@ -0,0 +1,127 @@
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infra.database.migrations import versions
+
+
+# arbitrary key shared by every process running migrations against one database
+_POSTGRES_LOCK_KEY = 7_452_001
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", String(64), primary_key=True),
+    Column("applied_at", DateTime, nullable=False, default=datetime.now),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    description: str
+    module: ModuleType
+
+    @property
+    def transactional(self) -> bool:
+        """False for a migration that must run outside a transaction, such as
+        CREATE INDEX CONCURRENTLY on postgres; it declares
+        `TRANSACTIONAL = False`"""
+        return getattr(self.module, "TRANSACTIONAL", True)
+
+    def upgrade(self, connection: Connection):
+        self.module.upgrade(connection)
+
+
+def load_migrations() -> list[Migration]:
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(
+            Migration(
+                version=module_info.name.split("_", 1)[0],
+                description=(module.__doc__ or module_info.name).strip(),
+                module=module,
+            )
+        )
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+def _applied_versions(connection: Connection) -> set[str]:
+    schema_migrations.create(connection, checkfirst=True)
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def _apply(connection: Connection, migration: Migration):
+    migration.upgrade(connection)
+    connection.execute(
+        schema_migrations.insert().values(
+            version=migration.version, applied_at=datetime.now()
+        )
+    )
+
+
+def _apply_autocommit(connection: Connection, migration: Migration):
+    # on a connection of its own, so the shared one keeps its isolation level
+    # and holds no transaction a concurrent index build would wait for. A
+    # concurrent build that fails leaves an INVALID index behind, which has
+    # to be dropped by hand before the migration is run again
+    with connection.engine.connect() as autocommit_connection:
+        _apply(
+            autocommit_connection.execution_options(isolation_level="AUTOCOMMIT"),
+            migration,
+        )
+
+
+def _upgrade(connection: Connection) -> list[Migration]:
+    postgresql = connection.dialect.name == "postgresql"
+    if postgresql:
+        # a session lock, as it has to outlive the per-migration transactions
+        connection.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": _POSTGRES_LOCK_KEY}
+        )
+        connection.commit()
+
+    try:
+        applied = _applied_versions(connection)
+        connection.commit()
+        pending = [
+            migration
+            for migration in load_migrations()
+            if migration.version not in applied
+        ]
+        for migration in pending:
+            if not migration.transactional:
+                _apply_autocommit(connection, migration)
+            else:
+                _apply(connection, migration)
+                connection.commit()
+        return pending
+    finally:
+        if postgresql:
+            connection.rollback()
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": _POSTGRES_LOCK_KEY}
+            )
+            connection.commit()
+
+
+async def upgrade(engine: AsyncEngine) -> list[Migration]:
+    """Apply every pending migration in version order, each in its own
+    transaction unless it opts out"""
+    async with engine.connect() as conn:
+        return await conn.run_sync(_upgrade)
+
+
+async def current_version(engine: AsyncEngine) -> str | None:
+    async with engine.begin() as conn:
+        applied = await conn.run_sync(_applied_versions)
+    return max(applied, default=None)
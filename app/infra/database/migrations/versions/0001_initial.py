@@ -0,0 +1,56 @@
+"""Create authors, books and borrows tables"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.engine import Connection
+
+
+metadata = MetaData()
+
+Table(
+    "authors",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(255), nullable=False),
+    Column("surname", String(255), nullable=False),
+    Column("date_of_birth", DateTime, nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "books",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("title", String(255), nullable=False),
+    Column("description", String(255), nullable=True),
+    Column("author_id", ForeignKey("authors.id"), nullable=False),
+    Column("available_copies", Integer, nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "borrows",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("book_id", ForeignKey("books.id"), nullable=False),
+    Column("reader_name", String(255), nullable=False),
+    Column("borrow_date", DateTime),
+    Column("return_date", DateTime, nullable=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+
+def upgrade(connection: Connection):
+    # databases created by the former create_all() at startup already have
+    # these tables, so they are adopted as-is
+    metadata.create_all(connection, checkfirst=True)
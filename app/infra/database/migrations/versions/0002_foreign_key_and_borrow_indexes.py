@@ -0,0 +1,48 @@
+"""Index foreign keys, borrow lookups and active borrows"""
+
+from sqlalchemy import Index, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+
+# builds indexes concurrently on postgres, which cannot run in a transaction
+TRANSACTIONAL = False
+
+
+def upgrade(connection: Connection):
+    metadata = MetaData()
+    books = Table("books", metadata, autoload_with=connection)
+    borrows = Table("borrows", metadata, autoload_with=connection)
+
+    # the (column, id) forms serve the equality lookups and also return the
+    # rows already in keyset order for the filtered lists
+    indexes = [
+        Index(
+            "ix_books_author_id_id",
+            books.c.author_id,
+            books.c.id,
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_borrows_book_id_id",
+            borrows.c.book_id,
+            borrows.c.id,
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_borrows_reader_name_id",
+            borrows.c.reader_name,
+            borrows.c.id,
+            postgresql_concurrently=True,
+        ),
+        # only outstanding borrows are looked up by their return date, so a
+        # partial index covers them without indexing every returned row
+        Index(
+            "ix_borrows_active",
+            borrows.c.id,
+            postgresql_where=text("return_date IS NULL"),
+            sqlite_where=text("return_date IS NULL"),
+            postgresql_concurrently=True,
+        ),
+    ]
+    for index in indexes:
+        index.create(connection, checkfirst=True)
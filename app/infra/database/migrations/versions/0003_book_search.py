@@ -0,0 +1,121 @@
+"""Full-text search index over book titles and descriptions"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+# the search column is backfilled in batches and indexed concurrently on postgres
+TRANSACTIONAL = False
+
+_BACKFILL_BATCH_SIZE = 1000
+
+
+def _search_vector(row: str = "") -> str:
+    return (
+        f"setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') "
+        f"|| setweight(to_tsvector('simple', coalesce({row}description, '')), 'B')"
+    )
+
+
+def upgrade(connection: Connection):
+    if connection.dialect.name == "postgresql":
+        _upgrade_postgresql(connection)
+    elif connection.dialect.name == "sqlite":
+        _upgrade_sqlite(connection)
+
+
+def _upgrade_postgresql(connection: Connection):
+    # a plain nullable column is added without rewriting books; a generated
+    # STORED column would rewrite the whole table under an exclusive lock
+    connection.execute(
+        text("ALTER TABLE books ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    )
+
+    # the trigger keeps the column current for every insert and update,
+    # including the bulk and core statements that bypass the ORM
+    connection.execute(
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION books_search_vector_update() RETURNS trigger
+            AS $$
+            BEGIN
+                NEW.search_vector := {_search_vector("NEW.")};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+    connection.execute(text("DROP TRIGGER IF EXISTS books_search_vector ON books"))
+    connection.execute(
+        text(
+            """
+            CREATE TRIGGER books_search_vector
+            BEFORE INSERT OR UPDATE OF title, description ON books
+            FOR EACH ROW EXECUTE FUNCTION books_search_vector_update()
+            """
+        )
+    )
+
+    # the migration runs in autocommit, so each batch is its own short
+    # transaction and only locks the rows it updates
+    backfill = text(
+        f"""
+        UPDATE books SET search_vector = {_search_vector()}
+        WHERE id IN (
+            SELECT id FROM books WHERE search_vector IS NULL
+            ORDER BY id LIMIT :batch_size
+        )
+        """
+    )
+    while connection.execute(backfill, {"batch_size": _BACKFILL_BATCH_SIZE}).rowcount:
+        pass
+
+    connection.execute(
+        text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_books_search_vector "
+            "ON books USING GIN (search_vector)"
+        )
+    )
+
+
+def _upgrade_sqlite(connection: Connection):
+    # external content table: the index stores only tokens, triggers keep it
+    # in step with books
+    connection.execute(
+        text(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+                title, description,
+                content='books', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+    )
+    for statement in (
+        """
+        CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_fts_update
+        AFTER UPDATE OF title, description ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO books_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """,
+    ):
+        connection.execute(text(statement))
+
+    connection.execute(text("INSERT INTO books_fts(books_fts) VALUES ('rebuild')"))
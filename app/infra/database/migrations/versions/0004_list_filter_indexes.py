@@ -0,0 +1,44 @@
+"""Composite indexes behind the list filters and sort keys"""
+
+from sqlalchemy import Index, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+
+TRANSACTIONAL = False
+
+
+def upgrade(connection: Connection):
+    metadata = MetaData()
+    books = Table("books", metadata, autoload_with=connection)
+    borrows = Table("borrows", metadata, autoload_with=connection)
+
+    # the author, book and reader filters use the (column, id) indexes of 0002
+    indexes = [
+        Index(
+            "ix_books_created_at_id",
+            books.c.created_at,
+            books.c.id,
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_books_title_id",
+            books.c.title,
+            books.c.id,
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_books_available",
+            books.c.id,
+            postgresql_where=text("available_copies > 0"),
+            sqlite_where=text("available_copies > 0"),
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_borrows_borrow_date_id",
+            borrows.c.borrow_date,
+            borrows.c.id,
+            postgresql_concurrently=True,
+        ),
+    ]
+    for index in indexes:
+        index.create(connection, checkfirst=True)
@@ -0,0 +1,23 @@
+"""Index outstanding borrows by borrow date for the active and overdue views"""
+
+from sqlalchemy import Index, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+
+TRANSACTIONAL = False
+
+
+def upgrade(connection: Connection):
+    metadata = MetaData()
+    borrows = Table("borrows", metadata, autoload_with=connection)
+
+    # outstanding loans are a small, hot part of a table that only grows;
+    # overdue is a range on borrow_date within them
+    Index(
+        "ix_borrows_active_borrow_date",
+        borrows.c.borrow_date,
+        borrows.c.id,
+        postgresql_where=text("return_date IS NULL"),
+        sqlite_where=text("return_date IS NULL"),
+        postgresql_concurrently=True,
+    ).create(connection, checkfirst=True)
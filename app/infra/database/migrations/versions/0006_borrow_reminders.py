@@ -0,0 +1,32 @@
+"""Create borrow_reminders, recording each reminder sent for a borrow once"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.engine import Connection
+
+
+metadata = MetaData()
+
+Table("borrows", metadata, Column("id", Integer, primary_key=True))
+
+borrow_reminders = Table(
+    "borrow_reminders",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("borrow_id", ForeignKey("borrows.id"), nullable=False),
+    Column("kind", String(32), nullable=False),
+    Column("created_at", DateTime),
+    Index("ux_borrow_reminders_borrow_id_kind", "borrow_id", "kind", unique=True),
+)
+
+
+def upgrade(connection: Connection):
+    borrow_reminders.create(connection, checkfirst=True)
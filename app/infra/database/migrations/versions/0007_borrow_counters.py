@@ -0,0 +1,65 @@
+"""Create per-book and per-author borrow counters, filled from borrow history"""
+
+from sqlalchemy import (
+    Column,
+    Date,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+
+metadata = MetaData()
+
+Table(
+    "borrow_counts",
+    metadata,
+    Column("scope", String(16), primary_key=True),
+    Column("subject_id", Integer, primary_key=True),
+    Column("borrows", Integer, nullable=False),
+    Index("ix_borrow_counts_scope_borrows", "scope", "borrows"),
+)
+
+Table(
+    "daily_borrow_counts",
+    metadata,
+    Column("scope", String(16), primary_key=True),
+    Column("subject_id", Integer, primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("borrows", Integer, nullable=False),
+    Index("ix_daily_borrow_counts_scope_day", "scope", "day"),
+)
+
+_BACKFILL = [
+    """
+    INSERT INTO borrow_counts (scope, subject_id, borrows)
+    SELECT 'book', book_id, count(*) FROM borrows GROUP BY book_id
+    """,
+    """
+    INSERT INTO borrow_counts (scope, subject_id, borrows)
+    SELECT 'author', books.author_id, count(*)
+    FROM borrows JOIN books ON books.id = borrows.book_id
+    GROUP BY books.author_id
+    """,
+    """
+    INSERT INTO daily_borrow_counts (scope, subject_id, day, borrows)
+    SELECT 'book', book_id, date(borrow_date), count(*)
+    FROM borrows GROUP BY book_id, date(borrow_date)
+    """,
+    """
+    INSERT INTO daily_borrow_counts (scope, subject_id, day, borrows)
+    SELECT 'author', books.author_id, date(borrows.borrow_date), count(*)
+    FROM borrows JOIN books ON books.id = borrows.book_id
+    GROUP BY books.author_id, date(borrows.borrow_date)
+    """,
+]
+
+
+def upgrade(connection: Connection):
+    metadata.create_all(connection, checkfirst=True)
+    for statement in _BACKFILL:
+        connection.execute(text(statement))
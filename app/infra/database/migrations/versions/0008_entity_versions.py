@@ -0,0 +1,17 @@
+"""Version counters on authors and books for optimistic concurrency control"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(connection: Connection):
+    inspector = inspect(connection)
+    for table in ("authors", "books"):
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "version" in columns:
+            continue
+        # a constant default fills the existing rows without rewriting the
+        # table on PostgreSQL 11+, and is a plain column append on SQLite
+        connection.execute(
+            text(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        )
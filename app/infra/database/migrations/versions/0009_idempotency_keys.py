@@ -0,0 +1,35 @@
+"""Create idempotency_keys, storing the result of writes retried with a key"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+)
+from sqlalchemy.engine import Connection
+
+
+metadata = MetaData()
+
+idempotency_keys = Table(
+    "idempotency_keys",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("scope", String(32), nullable=False),
+    Column("key", String(255), nullable=False),
+    Column("fingerprint", String(64), nullable=False),
+    Column("result", Text, nullable=True),
+    Column("created_at", DateTime),
+    Column("expires_at", DateTime, nullable=False),
+    Index("ux_idempotency_keys_scope_key", "scope", "key", unique=True),
+    # the purge walks expired keys in expiry order
+    Index("ix_idempotency_keys_expires_at", "expires_at"),
+)
+
+
+def upgrade(connection: Connection):
+    idempotency_keys.create(connection, checkfirst=True)
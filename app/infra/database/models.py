@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Integer, ForeignKey
+from sqlalchemy import Date, String, DateTime, Integer, ForeignKey, Index, Text, text
 
 
 class Base(DeclarativeBase):
@@ -15,6 +15,9 @@ class AuthorModel(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     surname: Mapped[str] = mapped_column(String(255), nullable=False)
     date_of_birth: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.now, onupdate=datetime.now
@@ -33,6 +36,9 @@ class BookModel(Base):
     description: Mapped[str] = mapped_column(String(255), nullable=True)
     author_id: Mapped[int] = mapped_column(ForeignKey("authors.id"), nullable=False)
     available_copies: Mapped[int] = mapped_column(Integer, nullable=False)
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.now, onupdate=datetime.now
@@ -44,6 +50,18 @@ class BookModel(Base):
         "BorrowModel", back_populates="book"
     )
 
+    __table_args__ = (
+        Index("ix_books_author_id_id", "author_id", "id"),
+        Index("ix_books_created_at_id", "created_at", "id"),
+        Index("ix_books_title_id", "title", "id"),
+        Index(
+            "ix_books_available",
+            "id",
+            postgresql_where=text("available_copies > 0"),
+            sqlite_where=text("available_copies > 0"),
+        ),
+    )
+
 
 class BorrowModel(Base):
     __tablename__ = "borrows"
@@ -59,3 +77,79 @@ class BorrowModel(Base):
     )
 
     book: Mapped["BookModel"] = relationship("BookModel", back_populates="borrows")
+
+    __table_args__ = (
+        Index("ix_borrows_book_id_id", "book_id", "id"),
+        Index("ix_borrows_reader_name_id", "reader_name", "id"),
+        Index("ix_borrows_borrow_date_id", "borrow_date", "id"),
+        Index(
+            "ix_borrows_active",
+            "id",
+            postgresql_where=text("return_date IS NULL"),
+            sqlite_where=text("return_date IS NULL"),
+        ),
+        Index(
+            "ix_borrows_active_borrow_date",
+            "borrow_date",
+            "id",
+            postgresql_where=text("return_date IS NULL"),
+            sqlite_where=text("return_date IS NULL"),
+        ),
+    )
+
+
+class BorrowReminderModel(Base):
+    __tablename__ = "borrow_reminders"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    borrow_id: Mapped[int] = mapped_column(ForeignKey("borrows.id"), nullable=False)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+    __table_args__ = (
+        Index("ux_borrow_reminders_borrow_id_kind", "borrow_id", "kind", unique=True),
+    )
+
+
+class BorrowCountModel(Base):
+    """All-time borrows of a book or author, kept current by every new borrow"""
+
+    __tablename__ = "borrow_counts"
+
+    scope: Mapped[str] = mapped_column(String(16), primary_key=True)
+    subject_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    borrows: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_borrow_counts_scope_borrows", "scope", "borrows"),)
+
+
+class DailyBorrowCountModel(Base):
+    """Borrows of a book or author per day, summed for recent-period rankings"""
+
+    __tablename__ = "daily_borrow_counts"
+
+    scope: Mapped[str] = mapped_column(String(16), primary_key=True)
+    subject_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    borrows: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_daily_borrow_counts_scope_day", "scope", "day"),)
+
+
+class IdempotencyKeyModel(Base):
+    """Result of a write made with an Idempotency-Key, replayed to its retries"""
+
+    __tablename__ = "idempotency_keys"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    scope: Mapped[str] = mapped_column(String(32), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ux_idempotency_keys_scope_key", "scope", "key", unique=True),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
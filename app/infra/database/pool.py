@@ -0,0 +1,84 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+@dataclass
+class PoolWaitStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    last_wait: float = 0.0
+
+    def record(self, wait: float):
+        self.checkouts += 1
+        self.total_wait += wait
+        self.last_wait = wait
+        if wait > self.max_wait:
+            self.max_wait = wait
+
+
+@dataclass(frozen=True)
+class PoolStatus:
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait: float
+    max_wait: float
+    last_wait: float
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that measures how long each checkout waits for a connection"""
+
+    wait_stats: PoolWaitStats | None = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.wait_stats is not None:
+                self.wait_stats.timeouts += 1
+            raise
+
+        if self.wait_stats is not None:
+            self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+def get_pool_status(pool: Pool, wait_stats: PoolWaitStats) -> PoolStatus:
+    if isinstance(pool, QueuePool):
+        size = pool.size()
+        checked_in = pool.checkedin()
+        checked_out = pool.checkedout()
+        overflow = max(pool.overflow(), 0)
+    else:
+        size = checked_in = checked_out = overflow = 0
+
+    return PoolStatus(
+        size=size,
+        checked_in=checked_in,
+        checked_out=checked_out,
+        overflow=overflow,
+        checkouts=wait_stats.checkouts,
+        timeouts=wait_stats.timeouts,
+        avg_wait=(
+            wait_stats.total_wait / wait_stats.checkouts
+            if wait_stats.checkouts
+            else 0.0
+        ),
+        max_wait=wait_stats.max_wait,
+        last_wait=wait_stats.last_wait,
+    )
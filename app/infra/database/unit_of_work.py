@@ -0,0 +1,102 @@
+from contextlib import (
+    AbstractAsyncContextManager,
+    asynccontextmanager,
+    contextmanager,
+)
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncGenerator, Generator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+
+_current_session: ContextVar[AsyncSession | None] = ContextVar(
+    "unit_of_work_session", default=None
+)
+_read_your_writes: ContextVar[bool] = ContextVar("read_your_writes", default=False)
+
+
+@asynccontextmanager
+async def session_scope(
+    session_factory: sessionmaker,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yield the session of the active unit of work, or a new session committed on exit"""
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+
+    session: AsyncSession = session_factory()
+    try:
+        yield session
+        await session.commit()
+
+    except Exception:
+        await session.rollback()
+        raise
+
+    finally:
+        await session.close()
+
+
+def read_session_scope(
+    read_session_factory: sessionmaker, session_factory: sessionmaker
+) -> AbstractAsyncContextManager[AsyncSession]:
+    """Route a read to the replica unless it has to observe writes of the current request"""
+    if _read_your_writes.get():
+        return session_scope(session_factory)
+    return session_scope(read_session_factory)
+
+
+@contextmanager
+def read_your_writes() -> Generator[None, None, None]:
+    """Send every read made inside the block to the primary database"""
+    token = _read_your_writes.set(True)
+    try:
+        yield
+    finally:
+        _read_your_writes.reset(token)
+
+
+@dataclass
+class UnitOfWork:
+    """Runs every service call made inside `begin()` on one session and one commit"""
+
+    session_factory: sessionmaker
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncGenerator[AsyncSession, None]:
+        outer_session = _current_session.get()
+        if outer_session is not None:
+            yield outer_session
+            return
+
+        async with session_scope(self.session_factory) as session:
+            token = _current_session.set(session)
+            try:
+                yield session
+            finally:
+                _current_session.reset(token)
+
+
+@asynccontextmanager
+async def primary_session_scope(
+    session: AsyncSession, session_factory: sessionmaker | None
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yield `session` if it is bound to the primary, or a new primary session"""
+    if session_factory is None or session.bind is session_factory.kw.get("bind"):
+        yield session
+        return
+
+    async with session_scope(session_factory) as primary_session:
+        yield primary_session
+
+
+def in_unit_of_work() -> bool:
+    return _current_session.get() is not None
+
+
+def can_share_reads() -> bool:
+    """Whether a read may be answered by a query shared with other callers"""
+    return _current_session.get() is None and not _read_your_writes.get()
@@ -0,0 +1,120 @@
+"""Prometheus text-format metrics without a client library.
+
+Collectors are updated from the event loop thread only, so they need no locks:
+an observation is a dict lookup, a bisect and two additions.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Iterable
+
+
+# seconds; request and use case latencies of a database backed API
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+@dataclass
+class _HistogramSeries:
+    counts: list[int]
+    sum: float = 0.0
+
+
+@dataclass
+class Histogram:
+    name: str
+    help: str
+    labels: tuple[str, ...]
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    series: dict[tuple[str, ...], _HistogramSeries] = field(default_factory=dict)
+
+    def observe(self, value: float, *label_values: str):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = _HistogramSeries(
+                counts=[0] * (len(self.buckets) + 1)
+            )
+        # the last slot counts the observations above every bucket, +Inf
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+
+    def reset(self):
+        self.series.clear()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+@dataclass
+class Exposition:
+    """Builds a scrape in the Prometheus text exposition format"""
+
+    lines: list[str] = field(default_factory=list)
+
+    def _header(self, name: str, help: str, kind: str):
+        self.lines.append(f"# HELP {name} {help}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def _samples(
+        self, name: str, labels: tuple[str, ...], samples: Iterable[tuple[tuple, float]]
+    ):
+        for label_values, value in samples:
+            self.lines.append(f"{name}{_labels(labels, label_values)} {value}")
+
+    def counter(
+        self,
+        name: str,
+        help: str,
+        samples: Iterable[tuple[tuple, float]],
+        labels: tuple[str, ...] = (),
+    ):
+        self._header(name, help, "counter")
+        self._samples(name, labels, samples)
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        samples: Iterable[tuple[tuple, float]],
+        labels: tuple[str, ...] = (),
+    ):
+        self._header(name, help, "gauge")
+        self._samples(name, labels, samples)
+
+    def histogram(self, histogram: Histogram):
+        self._header(histogram.name, histogram.help, "histogram")
+        bucket_labels = (*histogram.labels, "le")
+        bounds = [*(repr(bound) for bound in histogram.buckets), "+Inf"]
+        for label_values, series in sorted(histogram.series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series.counts):
+                cumulative += count
+                self.lines.append(
+                    f"{histogram.name}_bucket"
+                    f"{_labels(bucket_labels, (*label_values, bound))} {cumulative}"
+                )
+            labels = _labels(histogram.labels, label_values)
+            self.lines.append(f"{histogram.name}_sum{labels} {series.sum}")
+            self.lines.append(f"{histogram.name}_count{labels} {cumulative}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Collection
 from dataclasses import dataclass
 
-from domain.entities.library import Author
+from domain.entities.library import Author, EntityVersion
 
 
 @dataclass
@@ -10,13 +11,44 @@ class BaseAuthorRepository(ABC):
     async def add(self, author: Author) -> Author: ...
 
     @abstractmethod
-    async def get_by_id(self, author_id: int) -> Author | None: ...
+    async def add_many(self, authors: list[Author]) -> list[int]: ...
 
     @abstractmethod
-    async def get_all(self, limit: int, offset: int) -> list[Author]: ...
+    async def get_by_id(
+        self, author_id: int, include_books: bool = False
+    ) -> Author | None: ...
 
     @abstractmethod
-    async def update(self, author: Author) -> Author: ...
+    async def get_existing_ids(self, author_ids: set[int]) -> set[int]: ...
+
+    @abstractmethod
+    async def get_many(self, author_ids: Collection[int]) -> list[Author]: ...
+
+    @abstractmethod
+    async def get_version(self, author_id: int) -> EntityVersion | None: ...
+
+    @abstractmethod
+    async def count(self) -> int: ...
+
+    @abstractmethod
+    async def get_all(
+        self,
+        limit: int,
+        offset: int,
+        after_id: int | None = None,
+        include_books: bool = False,
+    ) -> list[Author]: ...
+
+    @abstractmethod
+    def stream_all(self, batch_size: int) -> AsyncIterator[list[Author]]: ...
+
+    @abstractmethod
+    async def update(
+        self,
+        author_id: int,
+        author: Author,
+        expected_versions: Collection[int] | None = None,
+    ) -> Author | None: ...
 
     @abstractmethod
     async def delete(self, author_id: int) -> bool: ...
@@ -0,0 +1,145 @@
+import copy
+from collections.abc import AsyncIterator, Collection
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from domain.entities.library import Author as AuthorEntity, EntityVersion
+from infra.cache.invalidation import clear_on_commit, invalidate_on_commit
+from infra.cache.memory import TTLCache
+from infra.database.unit_of_work import can_share_reads, primary_session_scope
+from infra.repositories.authors.base import BaseAuthorRepository
+
+
+@dataclass
+class CachedAuthorRepository(BaseAuthorRepository):
+    """Read-through cache over `get_by_id`; every write to an author invalidates its entry"""
+
+    repository: BaseAuthorRepository
+    cache: TTLCache
+    # misses are filled from the primary: a lagging replica would put back a
+    # row older than the write that just invalidated it
+    session_factory: sessionmaker | None = None
+    # deleting an author cascades to its books
+    book_cache: TTLCache | None = None
+
+    async def add(self, author: AuthorEntity, session: AsyncSession) -> AuthorEntity:
+        return await self.repository.add(author=author, session=session)
+
+    async def add_many(
+        self, authors: list[AuthorEntity], session: AsyncSession
+    ) -> list[int]:
+        return await self.repository.add_many(authors=authors, session=session)
+
+    async def get_by_id(
+        self, author_id: int, session: AsyncSession, include_books: bool = False
+    ) -> AuthorEntity | None:
+        # only bare authors are cached; their books are invalidated separately
+        if include_books:
+            return await self.repository.get_by_id(
+                author_id=author_id, session=session, include_books=True
+            )
+
+        if not can_share_reads():
+            return await self.repository.get_by_id(author_id=author_id, session=session)
+
+        author = self.cache.get(author_id)
+        if author is None:
+            async with primary_session_scope(session, self.session_factory) as primary:
+                author = await self.repository.get_by_id(
+                    author_id=author_id, session=primary
+                )
+            if author is None:
+                return None
+            self.cache.set(author_id, author)
+
+        return copy.copy(author)
+
+    async def get_existing_ids(
+        self, author_ids: set[int], session: AsyncSession
+    ) -> set[int]:
+        return await self.repository.get_existing_ids(
+            author_ids=author_ids, session=session
+        )
+
+    async def get_many(
+        self, author_ids: Collection[int], session: AsyncSession
+    ) -> list[AuthorEntity]:
+        if not can_share_reads():
+            return await self.repository.get_many(
+                author_ids=author_ids, session=session
+            )
+
+        authors = []
+        missing = []
+        for author_id in author_ids:
+            author = self.cache.get(author_id)
+            if author is None:
+                missing.append(author_id)
+            else:
+                authors.append(copy.copy(author))
+
+        if missing:
+            async with primary_session_scope(session, self.session_factory) as primary:
+                found = await self.repository.get_many(
+                    author_ids=missing, session=primary
+                )
+            for author in found:
+                self.cache.set(author.id, author)
+                authors.append(copy.copy(author))
+
+        return sorted(authors, key=lambda author: author.id)
+
+    async def get_version(
+        self, author_id: int, session: AsyncSession
+    ) -> EntityVersion | None:
+        author = self.cache.get(author_id) if can_share_reads() else None
+        if author is not None:
+            return EntityVersion(number=author.version, updated_at=author.updated_at)
+        return await self.repository.get_version(author_id=author_id, session=session)
+
+    async def count(self, session: AsyncSession) -> int:
+        return await self.repository.count(session=session)
+
+    async def get_all(
+        self,
+        session: AsyncSession,
+        limit: int = 20,
+        offset: int = 0,
+        after_id: int | None = None,
+        include_books: bool = False,
+    ) -> list[AuthorEntity]:
+        return await self.repository.get_all(
+            session=session,
+            limit=limit,
+            offset=offset,
+            after_id=after_id,
+            include_books=include_books,
+        )
+
+    def stream_all(
+        self, session: AsyncSession, batch_size: int = 1000
+    ) -> AsyncIterator[list[AuthorEntity]]:
+        return self.repository.stream_all(session=session, batch_size=batch_size)
+
+    async def update(
+        self,
+        session: AsyncSession,
+        author_id: int,
+        author: AuthorEntity,
+        expected_versions: Collection[int] | None = None,
+    ) -> AuthorEntity | None:
+        invalidate_on_commit(session, self.cache, author_id)
+        return await self.repository.update(
+            session=session,
+            author_id=author_id,
+            author=author,
+            expected_versions=expected_versions,
+        )
+
+    async def delete(self, session: AsyncSession, author_id: int) -> bool:
+        invalidate_on_commit(session, self.cache, author_id)
+        if self.book_cache is not None:
+            clear_on_commit(session, self.book_cache)
+        return await self.repository.delete(session=session, author_id=author_id)
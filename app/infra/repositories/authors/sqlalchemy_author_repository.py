@@ -1,12 +1,20 @@
-from sqlalchemy.orm import Session
+from collections.abc import AsyncIterator, Collection
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, insert, update
 from sqlalchemy.future import select
 
-from domain.entities.library import Author as AuthorEntity
+from domain.entities.library import (
+    Author as AuthorEntity,
+    Book as BookEntity,
+    EntityVersion,
+)
+from infra.database.instrumentation import instrument_repository
 from infra.database.models import AuthorModel
 from infra.repositories.authors.base import BaseAuthorRepository
 from dataclasses import dataclass
 
 
+@instrument_repository
 @dataclass
 class SQLAlchemyAuthorRepository(BaseAuthorRepository):
     async def add(self, author: AuthorEntity, session: Session) -> AuthorEntity:
@@ -20,14 +28,38 @@ class SQLAlchemyAuthorRepository(BaseAuthorRepository):
             name=author_model.name,
             surname=author_model.surname,
             date_of_birth=author_model.date_of_birth,
+            version=author_model.version,
             created_at=author_model.created_at,
             updated_at=author_model.updated_at,
         )
 
-    async def get_by_id(self, author_id: int, session: Session) -> AuthorEntity | None:
+    async def add_many(
+        self, authors: list[AuthorEntity], session: Session
+    ) -> list[int]:
+        if not authors:
+            return []
+
         result = await session.execute(
-            select(AuthorModel).where(AuthorModel.id == author_id)
+            insert(AuthorModel).returning(AuthorModel.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": author.name,
+                    "surname": author.surname,
+                    "date_of_birth": author.date_of_birth,
+                }
+                for author in authors
+            ],
         )
+        return list(result.scalars().all())
+
+    async def get_by_id(
+        self, author_id: int, session: Session, include_books: bool = False
+    ) -> AuthorEntity | None:
+        query = select(AuthorModel).where(AuthorModel.id == author_id)
+        if include_books:
+            query = query.options(selectinload(AuthorModel.books))
+
+        result = await session.execute(query)
         author_model = result.scalars().one_or_none()
         if author_model:
             return AuthorEntity(
@@ -35,14 +67,82 @@ class SQLAlchemyAuthorRepository(BaseAuthorRepository):
                 name=author_model.name,
                 surname=author_model.surname,
                 date_of_birth=author_model.date_of_birth,
+                version=author_model.version,
+                books=self._books_of(author_model) if include_books else set(),
                 created_at=author_model.created_at,
                 updated_at=author_model.updated_at,
             )
 
+    async def get_existing_ids(
+        self, author_ids: set[int], session: Session
+    ) -> set[int]:
+        if not author_ids:
+            return set()
+
+        result = await session.execute(
+            select(AuthorModel.id).where(AuthorModel.id.in_(author_ids))
+        )
+        return set(result.scalars().all())
+
+    async def get_many(
+        self, author_ids: Collection[int], session: Session
+    ) -> list[AuthorEntity]:
+        if not author_ids:
+            return []
+
+        result = await session.execute(
+            select(AuthorModel)
+            .where(AuthorModel.id.in_(author_ids))
+            .order_by(AuthorModel.id)
+        )
+        author_models = result.scalars().all()
+        return [
+            AuthorEntity(
+                id=author_model.id,
+                name=author_model.name,
+                surname=author_model.surname,
+                date_of_birth=author_model.date_of_birth,
+                version=author_model.version,
+                created_at=author_model.created_at,
+                updated_at=author_model.updated_at,
+            )
+            for author_model in author_models
+        ]
+
+    async def get_version(
+        self, author_id: int, session: Session
+    ) -> EntityVersion | None:
+        result = await session.execute(
+            select(AuthorModel.version, AuthorModel.updated_at).where(
+                AuthorModel.id == author_id
+            )
+        )
+        row = result.one_or_none()
+        if row:
+            return EntityVersion(number=row.version, updated_at=row.updated_at)
+
+    async def count(self, session: Session) -> int:
+        result = await session.execute(select(func.count()).select_from(AuthorModel))
+        return result.scalar_one()
+
     async def get_all(
-        self, session: Session, limit: int = 20, offset: int = 0
+        self,
+        session: Session,
+        limit: int = 20,
+        offset: int = 0,
+        after_id: int | None = None,
+        include_books: bool = False,
     ) -> list[AuthorEntity]:
-        result = await session.execute(select(AuthorModel).offset(offset).limit(limit))
+        query = select(AuthorModel).order_by(AuthorModel.id).limit(limit)
+        if after_id is not None:
+            query = query.where(AuthorModel.id > after_id)
+        else:
+            query = query.offset(offset)
+        if include_books:
+            # one extra IN query for the whole page instead of one per author
+            query = query.options(selectinload(AuthorModel.books))
+
+        result = await session.execute(query)
         author_models = result.scalars().all()
         return [
             AuthorEntity(
@@ -50,30 +150,66 @@ class SQLAlchemyAuthorRepository(BaseAuthorRepository):
                 name=author_model.name,
                 surname=author_model.surname,
                 date_of_birth=author_model.date_of_birth,
+                version=author_model.version,
+                books=self._books_of(author_model) if include_books else set(),
                 created_at=author_model.created_at,
                 updated_at=author_model.updated_at,
             )
             for author_model in author_models
         ]
 
+    async def stream_all(
+        self, session: Session, batch_size: int = 1000
+    ) -> AsyncIterator[list[AuthorEntity]]:
+        result = await session.stream_scalars(
+            select(AuthorModel)
+            .order_by(AuthorModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for author_models in result.partitions():
+            yield [
+                AuthorEntity(
+                    id=author_model.id,
+                    name=author_model.name,
+                    surname=author_model.surname,
+                    date_of_birth=author_model.date_of_birth,
+                    version=author_model.version,
+                    created_at=author_model.created_at,
+                    updated_at=author_model.updated_at,
+                )
+                for author_model in author_models
+            ]
+
     async def update(
-        self, session: Session, author_id: int, author: AuthorEntity
+        self,
+        session: Session,
+        author_id: int,
+        author: AuthorEntity,
+        expected_versions: Collection[int] | None = None,
     ) -> AuthorEntity | None:
-        result = await session.execute(
-            select(AuthorModel).where(AuthorModel.id == author_id)
+        query = (
+            update(AuthorModel)
+            .where(AuthorModel.id == author_id)
+            .values(
+                name=author.name,
+                surname=author.surname,
+                date_of_birth=author.date_of_birth,
+                version=AuthorModel.version + 1,
+            )
+            .returning(AuthorModel)
         )
-        author_model = result.scalars().one_or_none()
+        if expected_versions is not None:
+            query = query.where(AuthorModel.version.in_(expected_versions))
 
+        result = await session.execute(query)
+        author_model = result.scalars().one_or_none()
         if author_model:
-            author_model.name = author.name
-            author_model.surname = author.surname
-            author_model.date_of_birth = author.date_of_birth
-            session.flush()
             return AuthorEntity(
                 id=author_model.id,
                 name=author_model.name,
                 surname=author_model.surname,
                 date_of_birth=author_model.date_of_birth,
+                version=author_model.version,
                 created_at=author_model.created_at,
                 updated_at=author_model.updated_at,
             )
@@ -89,3 +225,19 @@ class SQLAlchemyAuthorRepository(BaseAuthorRepository):
             await session.flush()
             return True
         return False
+
+    @staticmethod
+    def _books_of(author_model: AuthorModel) -> set[BookEntity]:
+        return {
+            BookEntity(
+                id=book_model.id,
+                title=book_model.title,
+                description=book_model.description,
+                author_id=book_model.author_id,
+                available_copies=book_model.available_copies,
+                version=book_model.version,
+                created_at=book_model.created_at,
+                updated_at=book_model.updated_at,
+            )
+            for book_model in author_model.books
+        }
@@ -1,7 +1,18 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Collection
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 
-from domain.entities.library import Book
+from domain.entities.library import Book, EntityVersion
+from infra.repositories.listing import Sort
+
+
+@dataclass(frozen=True)
+class BookFilter:
+    author_id: int | None = None
+    available_only: bool = False
+    created_since: datetime | None = None
 
 
 @dataclass
@@ -9,14 +20,47 @@ class BaseBookRepository(ABC):
     @abstractmethod
     async def add(self, book: Book) -> Book: ...
 
+    @abstractmethod
+    async def add_many(self, books: list[Book]) -> list[int]: ...
+
     @abstractmethod
     async def get_by_id(self, book_id: int) -> Book | None: ...
 
     @abstractmethod
-    async def get_all(self, limit: int, offset: int) -> list[Book]: ...
+    async def get_many(self, book_ids: Collection[int]) -> list[Book]: ...
+
+    @abstractmethod
+    async def get_version(self, book_id: int) -> EntityVersion | None: ...
+
+    @abstractmethod
+    async def count(self, filters: BookFilter = BookFilter()) -> int: ...
+
+    @abstractmethod
+    async def get_all(
+        self,
+        limit: int,
+        offset: int,
+        after_id: int | None = None,
+        filters: BookFilter = BookFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
+    ) -> list[Book]: ...
+
+    @abstractmethod
+    async def search(
+        self, terms: list[str], limit: int, after: tuple[float, int] | None = None
+    ) -> list[tuple[Book, float]]: ...
+
+    @abstractmethod
+    def stream_all(self, batch_size: int) -> AsyncIterator[list[Book]]: ...
 
     @abstractmethod
-    async def update(self, book: Book) -> Book: ...
+    async def update(
+        self,
+        book_id: int,
+        book: Book,
+        expected_versions: Collection[int] | None = None,
+    ) -> Book | None: ...
 
     @abstractmethod
     async def delete(self, book_id: int) -> bool: ...
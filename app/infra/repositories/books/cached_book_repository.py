@@ -0,0 +1,149 @@
+import copy
+from collections.abc import AsyncIterator, Collection
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from domain.entities.library import Book as BookEntity, EntityVersion
+from infra.cache.invalidation import invalidate_on_commit
+from infra.cache.memory import TTLCache
+from infra.database.unit_of_work import can_share_reads, primary_session_scope
+from infra.repositories.books.base import BaseBookRepository, BookFilter
+from infra.repositories.listing import Sort
+
+
+@dataclass
+class CachedBookRepository(BaseBookRepository):
+    """Read-through cache over `get_by_id`; every write to a book invalidates its entry"""
+
+    repository: BaseBookRepository
+    cache: TTLCache
+    # misses are filled from the primary: a lagging replica would put back a
+    # row older than the write that just invalidated it
+    session_factory: sessionmaker | None = None
+
+    async def add(self, book: BookEntity, session: AsyncSession) -> BookEntity:
+        return await self.repository.add(book=book, session=session)
+
+    async def add_many(
+        self, books: list[BookEntity], session: AsyncSession
+    ) -> list[int]:
+        return await self.repository.add_many(books=books, session=session)
+
+    async def get_by_id(self, book_id: int, session: AsyncSession) -> BookEntity | None:
+        if not can_share_reads():
+            return await self.repository.get_by_id(book_id=book_id, session=session)
+
+        book = self.cache.get(book_id)
+        if book is None:
+            async with primary_session_scope(session, self.session_factory) as primary:
+                book = await self.repository.get_by_id(book_id=book_id, session=primary)
+            if book is None:
+                return None
+            self.cache.set(book_id, book)
+
+        return copy.copy(book)
+
+    async def get_many(
+        self, book_ids: Collection[int], session: AsyncSession
+    ) -> list[BookEntity]:
+        if not can_share_reads():
+            return await self.repository.get_many(book_ids=book_ids, session=session)
+
+        books = []
+        missing = []
+        for book_id in book_ids:
+            book = self.cache.get(book_id)
+            if book is None:
+                missing.append(book_id)
+            else:
+                books.append(copy.copy(book))
+
+        if missing:
+            async with primary_session_scope(session, self.session_factory) as primary:
+                found = await self.repository.get_many(
+                    book_ids=missing, session=primary
+                )
+            for book in found:
+                self.cache.set(book.id, book)
+                books.append(copy.copy(book))
+
+        return sorted(books, key=lambda book: book.id)
+
+    async def get_version(
+        self, book_id: int, session: AsyncSession
+    ) -> EntityVersion | None:
+        book = self.cache.get(book_id) if can_share_reads() else None
+        if book is not None:
+            return EntityVersion(number=book.version, updated_at=book.updated_at)
+        return await self.repository.get_version(book_id=book_id, session=session)
+
+    async def count(
+        self, session: AsyncSession, filters: BookFilter = BookFilter()
+    ) -> int:
+        return await self.repository.count(session=session, filters=filters)
+
+    async def get_all(
+        self,
+        session: AsyncSession,
+        limit: int = 20,
+        offset: int = 0,
+        after_id: int | None = None,
+        filters: BookFilter = BookFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
+    ) -> list[BookEntity]:
+        return await self.repository.get_all(
+            session=session,
+            limit=limit,
+            offset=offset,
+            after_id=after_id,
+            filters=filters,
+            sort=sort,
+            after_key=after_key,
+        )
+
+    async def search(
+        self,
+        session: AsyncSession,
+        terms: list[str],
+        limit: int = 20,
+        after: tuple[float, int] | None = None,
+    ) -> list[tuple[BookEntity, float]]:
+        return await self.repository.search(
+            session=session, terms=terms, limit=limit, after=after
+        )
+
+    def stream_all(
+        self, session: AsyncSession, batch_size: int = 1000
+    ) -> AsyncIterator[list[BookEntity]]:
+        return self.repository.stream_all(session=session, batch_size=batch_size)
+
+    async def update(
+        self,
+        session: AsyncSession,
+        book_id: int,
+        book: BookEntity,
+        expected_versions: Collection[int] | None = None,
+    ) -> BookEntity | None:
+        invalidate_on_commit(session, self.cache, book_id)
+        return await self.repository.update(
+            session=session,
+            book_id=book_id,
+            book=book,
+            expected_versions=expected_versions,
+        )
+
+    async def delete(self, session: AsyncSession, book_id: int) -> bool:
+        invalidate_on_commit(session, self.cache, book_id)
+        return await self.repository.delete(session=session, book_id=book_id)
+
+    async def reduce_by_one(self, session: AsyncSession, book_id: int) -> bool:
+        invalidate_on_commit(session, self.cache, book_id)
+        return await self.repository.reduce_by_one(session=session, book_id=book_id)
+
+    async def increase_by_one(self, session: AsyncSession, book_id: int) -> bool:
+        invalidate_on_commit(session, self.cache, book_id)
+        return await self.repository.increase_by_one(session=session, book_id=book_id)
@@ -0,0 +1,87 @@
+import re
+
+from sqlalchemy import (
+    Float,
+    Select,
+    and_,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+)
+from sqlalchemy.sql.expression import Subquery
+
+from domain.exceptions.database import UnsupportedDatabaseDialectException
+
+from infra.database.models import BookModel
+
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# bm25 weights of the title and description columns of books_fts
+_SQLITE_COLUMN_WEIGHTS = (10.0, 1.0)
+
+_books_fts = table("books_fts", column("rowid"))
+
+
+def search_terms(query: str) -> list[str]:
+    """Words of a user query; punctuation and operators are dropped"""
+    return _TERM.findall(query.lower())
+
+
+def _postgresql_ranked(terms: list[str]) -> Subquery:
+    # every term must match, the last one as a prefix for search-as-you-type
+    tsquery = func.to_tsquery("simple", " & ".join(terms[:-1] + [f"{terms[-1]}:*"]))
+    search_vector = literal_column("books.search_vector")
+    return (
+        select(
+            BookModel.id.label("id"),
+            func.ts_rank_cd(search_vector, tsquery).cast(Float).label("rank"),
+        )
+        .where(search_vector.op("@@")(tsquery))
+        .subquery("ranked")
+    )
+
+
+def _sqlite_ranked(terms: list[str]) -> Subquery:
+    match = " AND ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+    # bm25 is lower for better matches
+    rank = -func.bm25(literal_column("books_fts"), *_SQLITE_COLUMN_WEIGHTS)
+    return (
+        select(_books_fts.c.rowid.label("id"), rank.label("rank"))
+        .where(literal_column("books_fts").op("MATCH")(match))
+        .subquery("ranked")
+    )
+
+
+def build_search_query(
+    dialect: str,
+    terms: list[str],
+    limit: int,
+    after: tuple[float, int] | None = None,
+) -> Select:
+    """Books matching every term, best first, keyset paginated on (rank, id)"""
+    if dialect == "postgresql":
+        ranked = _postgresql_ranked(terms)
+    elif dialect == "sqlite":
+        ranked = _sqlite_ranked(terms)
+    else:
+        raise UnsupportedDatabaseDialectException(dialect=dialect)
+
+    query = (
+        select(BookModel, ranked.c.rank)
+        .join(ranked, ranked.c.id == BookModel.id)
+        .order_by(ranked.c.rank.desc(), ranked.c.id)
+        .limit(limit)
+    )
+    if after is not None:
+        after_rank, after_id = after
+        query = query.where(
+            or_(
+                ranked.c.rank < after_rank,
+                and_(ranked.c.rank == after_rank, ranked.c.id > after_id),
+            )
+        )
+    return query
@@ -1,15 +1,41 @@
+from collections.abc import AsyncIterator, Collection
+from typing import Any
+
+from sqlalchemy import Select, func, insert, update
 from sqlalchemy.orm import Session
 from sqlalchemy.future import select
 
 
-from domain.entities.library import Book as BookEntity
+from domain.entities.library import Book as BookEntity, EntityVersion
 
+from infra.database.instrumentation import instrument_repository
 from infra.database.models import BookModel
 from dataclasses import dataclass
 
-from infra.repositories.books.base import BaseBookRepository
+from infra.repositories.books.base import BaseBookRepository, BookFilter
+from infra.repositories.books.search import build_search_query
+from infra.repositories.listing import Sort, order_and_seek
+
+
+# every sort key is backed by a (column, id) index, see migration 0004
+_SORT_COLUMNS = {
+    "id": BookModel.id,
+    "created_at": BookModel.created_at,
+    "title": BookModel.title,
+}
+
 
+def _filtered(query: Select, filters: BookFilter) -> Select:
+    if filters.author_id is not None:
+        query = query.where(BookModel.author_id == filters.author_id)
+    if filters.available_only:
+        query = query.where(BookModel.available_copies > 0)
+    if filters.created_since is not None:
+        query = query.where(BookModel.created_at >= filters.created_since)
+    return query
 
+
+@instrument_repository
 @dataclass
 class SQLAlchemyBookRepository(BaseBookRepository):
     async def add(self, book: BookEntity, session: Session) -> BookEntity:
@@ -27,10 +53,29 @@ class SQLAlchemyBookRepository(BaseBookRepository):
             description=book_model.description,
             author_id=book_model.author_id,
             available_copies=book_model.available_copies,
+            version=book_model.version,
             created_at=book_model.created_at,
             updated_at=book_model.updated_at,
         )
 
+    async def add_many(self, books: list[BookEntity], session: Session) -> list[int]:
+        if not books:
+            return []
+
+        result = await session.execute(
+            insert(BookModel).returning(BookModel.id, sort_by_parameter_order=True),
+            [
+                {
+                    "title": book.title,
+                    "description": book.description,
+                    "author_id": book.author_id,
+                    "available_copies": book.available_copies,
+                }
+                for book in books
+            ],
+        )
+        return list(result.scalars().all())
+
     async def get_by_id(self, book_id: int, session: Session) -> BookEntity | None:
         result = await session.execute(select(BookModel).where(BookModel.id == book_id))
         book_model = result.scalars().one_or_none()
@@ -41,14 +86,72 @@ class SQLAlchemyBookRepository(BaseBookRepository):
                 description=book_model.description,
                 author_id=book_model.author_id,
                 available_copies=book_model.available_copies,
+                version=book_model.version,
                 created_at=book_model.created_at,
                 updated_at=book_model.updated_at,
             )
 
+    async def get_many(
+        self, book_ids: Collection[int], session: Session
+    ) -> list[BookEntity]:
+        if not book_ids:
+            return []
+
+        result = await session.execute(
+            select(BookModel).where(BookModel.id.in_(book_ids)).order_by(BookModel.id)
+        )
+        book_models = result.scalars().all()
+        return [
+            BookEntity(
+                id=book_model.id,
+                title=book_model.title,
+                description=book_model.description,
+                author_id=book_model.author_id,
+                available_copies=book_model.available_copies,
+                version=book_model.version,
+                created_at=book_model.created_at,
+                updated_at=book_model.updated_at,
+            )
+            for book_model in book_models
+        ]
+
+    async def get_version(self, book_id: int, session: Session) -> EntityVersion | None:
+        result = await session.execute(
+            select(BookModel.version, BookModel.updated_at).where(
+                BookModel.id == book_id
+            )
+        )
+        row = result.one_or_none()
+        if row:
+            return EntityVersion(number=row.version, updated_at=row.updated_at)
+
+    async def count(self, session: Session, filters: BookFilter = BookFilter()) -> int:
+        result = await session.execute(
+            _filtered(select(func.count()).select_from(BookModel), filters)
+        )
+        return result.scalar_one()
+
     async def get_all(
-        self, session: Session, limit: int = 20, offset: int = 0
+        self,
+        session: Session,
+        limit: int = 20,
+        offset: int = 0,
+        after_id: int | None = None,
+        filters: BookFilter = BookFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
     ) -> list[BookEntity]:
-        result = await session.execute(select(BookModel).offset(offset).limit(limit))
+        query = order_and_seek(
+            _filtered(select(BookModel), filters).limit(limit),
+            column=_SORT_COLUMNS[sort.key],
+            id_column=BookModel.id,
+            sort=sort,
+            offset=offset,
+            after_id=after_id,
+            after_key=after_key,
+        )
+
+        result = await session.execute(query)
         book_models = result.scalars().all()
         return [
             BookEntity(
@@ -57,30 +160,99 @@ class SQLAlchemyBookRepository(BaseBookRepository):
                 description=book_model.description,
                 author_id=book_model.author_id,
                 available_copies=book_model.available_copies,
+                version=book_model.version,
                 created_at=book_model.created_at,
                 updated_at=book_model.updated_at,
             )
             for book_model in book_models
         ]
 
+    async def search(
+        self,
+        session: Session,
+        terms: list[str],
+        limit: int = 20,
+        after: tuple[float, int] | None = None,
+    ) -> list[tuple[BookEntity, float]]:
+        result = await session.execute(
+            build_search_query(
+                session.bind.dialect.name, terms=terms, limit=limit, after=after
+            )
+        )
+        return [
+            (
+                BookEntity(
+                    id=book_model.id,
+                    title=book_model.title,
+                    description=book_model.description,
+                    author_id=book_model.author_id,
+                    available_copies=book_model.available_copies,
+                    version=book_model.version,
+                    created_at=book_model.created_at,
+                    updated_at=book_model.updated_at,
+                ),
+                rank,
+            )
+            for book_model, rank in result.all()
+        ]
+
+    async def stream_all(
+        self, session: Session, batch_size: int = 1000
+    ) -> AsyncIterator[list[BookEntity]]:
+        result = await session.stream_scalars(
+            select(BookModel)
+            .order_by(BookModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for book_models in result.partitions():
+            yield [
+                BookEntity(
+                    id=book_model.id,
+                    title=book_model.title,
+                    description=book_model.description,
+                    author_id=book_model.author_id,
+                    available_copies=book_model.available_copies,
+                    version=book_model.version,
+                    created_at=book_model.created_at,
+                    updated_at=book_model.updated_at,
+                )
+                for book_model in book_models
+            ]
+
     async def update(
-        self, session: Session, book_id: int, book: BookEntity
+        self,
+        session: Session,
+        book_id: int,
+        book: BookEntity,
+        expected_versions: Collection[int] | None = None,
     ) -> BookEntity | None:
-        result = await session.execute(select(BookModel).where(BookModel.id == book_id))
-        book_model = result.scalars().one_or_none()
+        # compare-and-swap: the version check and the write are one statement,
+        # so a concurrent writer between a read and this update is detected
+        query = (
+            update(BookModel)
+            .where(BookModel.id == book_id)
+            .values(
+                title=book.title,
+                description=book.description,
+                available_copies=book.available_copies,
+                author_id=book.author_id,
+                version=BookModel.version + 1,
+            )
+            .returning(BookModel)
+        )
+        if expected_versions is not None:
+            query = query.where(BookModel.version.in_(expected_versions))
 
+        result = await session.execute(query)
+        book_model = result.scalars().one_or_none()
         if book_model:
-            book_model.title = book.title
-            book_model.description = book.description
-            book_model.available_copies = book.available_copies
-            book_model.author_id = book.author_id
-            session.flush()
             return BookEntity(
                 id=book_model.id,
                 title=book_model.title,
                 description=book_model.description,
                 author_id=book_model.author_id,
                 available_copies=book_model.available_copies,
+                version=book_model.version,
                 created_at=book_model.created_at,
                 updated_at=book_model.updated_at,
             )
@@ -96,19 +268,25 @@ class SQLAlchemyBookRepository(BaseBookRepository):
         return False
 
     async def reduce_by_one(self, session: Session, book_id: int) -> bool:
-        result = await session.execute(select(BookModel).where(BookModel.id == book_id))
-        book_model: BookModel = result.scalars().one_or_none()
-        if book_model and book_model.available_copies >= 1:
-            book_model.available_copies -= 1
-            await session.flush()
-            return True
-        return False
+        result = await session.execute(
+            update(BookModel)
+            .where(BookModel.id == book_id, BookModel.available_copies > 0)
+            .values(
+                available_copies=BookModel.available_copies - 1,
+                version=BookModel.version + 1,
+            )
+            .returning(BookModel.id)
+        )
+        return result.scalar_one_or_none() is not None
 
     async def increase_by_one(self, session: Session, book_id: int) -> bool:
-        result = await session.execute(select(BookModel).where(BookModel.id == book_id))
-        book_model: BookModel = result.scalars().one_or_none()
-        if book_model:
-            book_model.available_copies += 1
-            await session.flush()
-            return True
-        return False
+        result = await session.execute(
+            update(BookModel)
+            .where(BookModel.id == book_id)
+            .values(
+                available_copies=BookModel.available_copies + 1,
+                version=BookModel.version + 1,
+            )
+            .returning(BookModel.id)
+        )
+        return result.scalar_one_or_none() is not None
@@ -1,7 +1,20 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Collection
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Literal
 
 from domain.entities.library import Borrow
+from infra.repositories.listing import Sort
+
+
+@dataclass(frozen=True)
+class BorrowFilter:
+    status: Literal["active", "returned", "overdue"] | None = None
+    book_id: int | None = None
+    reader_name: str | None = None
+    borrowed_since: datetime | None = None
+    borrowed_before: datetime | None = None
 
 
 @dataclass
@@ -13,7 +26,30 @@ class BaseBorrowRepository(ABC):
     async def get_by_id(self, borrow_id: int) -> Borrow | None: ...
 
     @abstractmethod
-    async def get_all(self, limit: int, offset: int) -> list[Borrow]: ...
+    async def get_many(self, borrow_ids: Collection[int]) -> list[Borrow]: ...
+
+    @abstractmethod
+    async def get_version(self, borrow_id: int) -> datetime | None: ...
+
+    @abstractmethod
+    async def count(self, filters: BorrowFilter = BorrowFilter()) -> int: ...
+
+    @abstractmethod
+    async def get_all(
+        self,
+        limit: int,
+        offset: int,
+        after_id: int | None = None,
+        filters: BorrowFilter = BorrowFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
+    ) -> list[Borrow]: ...
+
+    @abstractmethod
+    def stream_all(self, batch_size: int) -> AsyncIterator[list[Borrow]]: ...
+
+    @abstractmethod
+    async def add_reminders(self, borrow_ids: Collection[int], kind: str) -> int: ...
 
     @abstractmethod
     async def completion_issue(self, borrow_id: int) -> Borrow: ...
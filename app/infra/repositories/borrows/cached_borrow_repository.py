@@ -0,0 +1,128 @@
+import copy
+from collections.abc import AsyncIterator, Collection
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from domain.entities.library import Borrow as BorrowEntity
+from infra.cache.invalidation import invalidate_on_commit
+from infra.cache.memory import TTLCache
+from infra.database.unit_of_work import can_share_reads, primary_session_scope
+from infra.repositories.borrows.base import BaseBorrowRepository, BorrowFilter
+from infra.repositories.listing import Sort
+
+
+@dataclass
+class CachedBorrowRepository(BaseBorrowRepository):
+    """Read-through cache over `get_by_id`; returning a borrow invalidates its entry"""
+
+    repository: BaseBorrowRepository
+    cache: TTLCache
+    # misses are filled from the primary: a lagging replica would put back a
+    # row older than the write that just invalidated it
+    session_factory: sessionmaker | None = None
+
+    async def add(self, borrow: BorrowEntity, session: AsyncSession) -> BorrowEntity:
+        return await self.repository.add(borrow=borrow, session=session)
+
+    async def get_by_id(
+        self, borrow_id: int, session: AsyncSession
+    ) -> BorrowEntity | None:
+        if not can_share_reads():
+            return await self.repository.get_by_id(borrow_id=borrow_id, session=session)
+
+        borrow = self.cache.get(borrow_id)
+        if borrow is None:
+            async with primary_session_scope(session, self.session_factory) as primary:
+                borrow = await self.repository.get_by_id(
+                    borrow_id=borrow_id, session=primary
+                )
+            if borrow is None:
+                return None
+            self.cache.set(borrow_id, borrow)
+
+        return copy.copy(borrow)
+
+    async def get_many(
+        self, borrow_ids: Collection[int], session: AsyncSession
+    ) -> list[BorrowEntity]:
+        if not can_share_reads():
+            return await self.repository.get_many(
+                borrow_ids=borrow_ids, session=session
+            )
+
+        borrows = []
+        missing = []
+        for borrow_id in borrow_ids:
+            borrow = self.cache.get(borrow_id)
+            if borrow is None:
+                missing.append(borrow_id)
+            else:
+                borrows.append(copy.copy(borrow))
+
+        if missing:
+            async with primary_session_scope(session, self.session_factory) as primary:
+                found = await self.repository.get_many(
+                    borrow_ids=missing, session=primary
+                )
+            for borrow in found:
+                self.cache.set(borrow.id, borrow)
+                borrows.append(copy.copy(borrow))
+
+        return sorted(borrows, key=lambda borrow: borrow.id)
+
+    async def get_version(
+        self, borrow_id: int, session: AsyncSession
+    ) -> datetime | None:
+        borrow = self.cache.get(borrow_id) if can_share_reads() else None
+        if borrow is not None:
+            return borrow.updated_at
+        return await self.repository.get_version(borrow_id=borrow_id, session=session)
+
+    async def count(
+        self, session: AsyncSession, filters: BorrowFilter = BorrowFilter()
+    ) -> int:
+        return await self.repository.count(session=session, filters=filters)
+
+    async def get_all(
+        self,
+        session: AsyncSession,
+        limit: int = 20,
+        offset: int = 0,
+        after_id: int | None = None,
+        filters: BorrowFilter = BorrowFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
+    ) -> list[BorrowEntity]:
+        return await self.repository.get_all(
+            session=session,
+            limit=limit,
+            offset=offset,
+            after_id=after_id,
+            filters=filters,
+            sort=sort,
+            after_key=after_key,
+        )
+
+    def stream_all(
+        self, session: AsyncSession, batch_size: int = 1000
+    ) -> AsyncIterator[list[BorrowEntity]]:
+        return self.repository.stream_all(session=session, batch_size=batch_size)
+
+    async def add_reminders(
+        self, session: AsyncSession, borrow_ids: Collection[int], kind: str
+    ) -> int:
+        return await self.repository.add_reminders(
+            session=session, borrow_ids=borrow_ids, kind=kind
+        )
+
+    async def completion_issue(
+        self, session: AsyncSession, borrow_id: int
+    ) -> BorrowEntity | None:
+        invalidate_on_commit(session, self.cache, borrow_id)
+        return await self.repository.completion_issue(
+            session=session, borrow_id=borrow_id
+        )
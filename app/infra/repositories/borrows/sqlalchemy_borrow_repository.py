@@ -1,18 +1,59 @@
-from datetime import datetime
+from collections.abc import AsyncIterator, Collection
+from datetime import datetime, timedelta
+from typing import Any
+
 from sqlalchemy.orm import Session
+from sqlalchemy import Select, func
 from sqlalchemy.future import select
 
 
 from domain.entities.library import Borrow as BorrowEntity
 
-from infra.database.models import BorrowModel
+from infra.database.dialects import upsert_insert
+from infra.database.instrumentation import instrument_repository
+from infra.database.models import BorrowModel, BorrowReminderModel
 from dataclasses import dataclass
 
-from infra.repositories.borrows.base import BaseBorrowRepository
+from infra.repositories.borrows.base import BaseBorrowRepository, BorrowFilter
+from infra.repositories.listing import Sort, order_and_seek
+
+
+# every sort key is backed by a (column, id) index, see migration 0004
+_SORT_COLUMNS = {
+    "id": BorrowModel.id,
+    "borrow_date": BorrowModel.borrow_date,
+}
+
+
+def _filtered(query: Select, filters: BorrowFilter, loan_period: timedelta) -> Select:
+    # active and overdue borrows are served by the partial indexes on
+    # return_date IS NULL, see migrations 0002 and 0005
+    if filters.status == "active":
+        query = query.where(BorrowModel.return_date.is_(None))
+    elif filters.status == "overdue":
+        query = query.where(
+            BorrowModel.return_date.is_(None),
+            BorrowModel.borrow_date < datetime.now() - loan_period,
+        )
+    elif filters.status == "returned":
+        query = query.where(BorrowModel.return_date.is_not(None))
+    if filters.book_id is not None:
+        query = query.where(BorrowModel.book_id == filters.book_id)
+    if filters.reader_name is not None:
+        query = query.where(BorrowModel.reader_name == filters.reader_name)
+    if filters.borrowed_since is not None:
+        query = query.where(BorrowModel.borrow_date >= filters.borrowed_since)
+    if filters.borrowed_before is not None:
+        query = query.where(BorrowModel.borrow_date < filters.borrowed_before)
+    return query
 
 
+@instrument_repository
 @dataclass
 class SQLAlchemyBorrowRepository(BaseBorrowRepository):
+    # a borrow not returned within the loan period is overdue
+    loan_period: timedelta = timedelta(days=14)
+
     async def add(self, borrow: BorrowEntity, session: Session) -> BorrowEntity:
         borrow_model = BorrowModel(
             book_id=borrow.book_id,
@@ -47,10 +88,70 @@ class SQLAlchemyBorrowRepository(BaseBorrowRepository):
                 updated_at=borrow_model.updated_at,
             )
 
+    async def get_many(
+        self, borrow_ids: Collection[int], session: Session
+    ) -> list[BorrowEntity]:
+        if not borrow_ids:
+            return []
+
+        result = await session.execute(
+            select(BorrowModel)
+            .where(BorrowModel.id.in_(borrow_ids))
+            .order_by(BorrowModel.id)
+        )
+        borrow_models = result.scalars().all()
+        return [
+            BorrowEntity(
+                id=borrow_model.id,
+                book_id=borrow_model.book_id,
+                reader_name=borrow_model.reader_name,
+                borrow_date=borrow_model.borrow_date,
+                return_date=borrow_model.return_date,
+                created_at=borrow_model.created_at,
+                updated_at=borrow_model.updated_at,
+            )
+            for borrow_model in borrow_models
+        ]
+
+    async def get_version(self, borrow_id: int, session: Session) -> datetime | None:
+        result = await session.execute(
+            select(BorrowModel.updated_at).where(BorrowModel.id == borrow_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def count(
+        self, session: Session, filters: BorrowFilter = BorrowFilter()
+    ) -> int:
+        result = await session.execute(
+            _filtered(
+                select(func.count()).select_from(BorrowModel),
+                filters,
+                self.loan_period,
+            )
+        )
+        return result.scalar_one()
+
     async def get_all(
-        self, session: Session, limit: int = 20, offset: int = 0
+        self,
+        session: Session,
+        limit: int = 20,
+        offset: int = 0,
+        after_id: int | None = None,
+        filters: BorrowFilter = BorrowFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
     ) -> list[BorrowEntity]:
-        result = await session.execute(select(BorrowModel).offset(offset).limit(limit))
+        query = order_and_seek(
+            _filtered(select(BorrowModel), filters, self.loan_period).limit(limit),
+            column=_SORT_COLUMNS[sort.key],
+            id_column=BorrowModel.id,
+            sort=sort,
+            offset=offset,
+            after_id=after_id,
+            after_key=after_key,
+        )
+
+        result = await session.execute(query)
         borrow_models = result.scalars().all()
         return [
             BorrowEntity(
@@ -65,6 +166,51 @@ class SQLAlchemyBorrowRepository(BaseBorrowRepository):
             for borrow_model in borrow_models
         ]
 
+    async def stream_all(
+        self, session: Session, batch_size: int = 1000
+    ) -> AsyncIterator[list[BorrowEntity]]:
+        result = await session.stream_scalars(
+            select(BorrowModel)
+            .order_by(BorrowModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for borrow_models in result.partitions():
+            yield [
+                BorrowEntity(
+                    id=borrow_model.id,
+                    book_id=borrow_model.book_id,
+                    reader_name=borrow_model.reader_name,
+                    borrow_date=borrow_model.borrow_date,
+                    return_date=borrow_model.return_date,
+                    created_at=borrow_model.created_at,
+                    updated_at=borrow_model.updated_at,
+                )
+                for borrow_model in borrow_models
+            ]
+
+    async def add_reminders(
+        self, session: Session, borrow_ids: Collection[int], kind: str
+    ) -> int:
+        """Record a `kind` reminder for each borrow that has none yet,
+        returning how many were new"""
+        if not borrow_ids:
+            return 0
+
+        insert = upsert_insert(session.bind.dialect.name)
+        now = datetime.now()
+        result = await session.execute(
+            insert(BorrowReminderModel)
+            .values(
+                [
+                    {"borrow_id": borrow_id, "kind": kind, "created_at": now}
+                    for borrow_id in borrow_ids
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["borrow_id", "kind"])
+            .returning(BorrowReminderModel.id)
+        )
+        return len(result.all())
+
     async def completion_issue(self, session: Session, borrow_id: int) -> BorrowEntity:
         result = await session.execute(
             select(BorrowModel).where(BorrowModel.id == borrow_id)
@@ -72,7 +218,7 @@ class SQLAlchemyBorrowRepository(BaseBorrowRepository):
         borrow_model = result.scalars().one_or_none()
         if borrow_model:
             borrow_model.return_date = datetime.now()
-            session.flush()
+            await session.flush()
             return BorrowEntity(
                 id=borrow_model.id,
                 book_id=borrow_model.book_id,
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    fingerprint: str
+    result: str | None
+
+
+@dataclass
+class BaseIdempotencyRepository(ABC):
+    @abstractmethod
+    async def claim(
+        self, scope: str, key: str, fingerprint: str, expires_at: datetime
+    ) -> bool: ...
+
+    @abstractmethod
+    async def get(self, scope: str, key: str) -> IdempotencyRecord | None: ...
+
+    @abstractmethod
+    async def save_result(self, scope: str, key: str, result: str): ...
+
+    @abstractmethod
+    async def delete_expired(self, before: datetime, limit: int) -> int: ...
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from infra.database.dialects import upsert_insert
+from infra.database.instrumentation import instrument_repository
+from infra.database.models import IdempotencyKeyModel
+from infra.repositories.idempotency.base import (
+    BaseIdempotencyRepository,
+    IdempotencyRecord,
+)
+
+
+@instrument_repository
+@dataclass
+class SQLAlchemyIdempotencyRepository(BaseIdempotencyRepository):
+    async def claim(
+        self,
+        session: Session,
+        scope: str,
+        key: str,
+        fingerprint: str,
+        expires_at: datetime,
+    ) -> bool:
+        """Insert the key, or take over an expired one not purged yet; False
+        when it is held by another request. A concurrent claim of the same key
+        waits on the unique index until the transaction holding it ends"""
+        insert = upsert_insert(session.bind.dialect.name)
+        statement = insert(IdempotencyKeyModel).values(
+            scope=scope,
+            key=key,
+            fingerprint=fingerprint,
+            created_at=datetime.now(),
+            expires_at=expires_at,
+        )
+        result = await session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["scope", "key"],
+                set_={
+                    "fingerprint": statement.excluded.fingerprint,
+                    "result": None,
+                    "created_at": statement.excluded.created_at,
+                    "expires_at": statement.excluded.expires_at,
+                },
+                where=IdempotencyKeyModel.expires_at < statement.excluded.created_at,
+            ).returning(IdempotencyKeyModel.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def get(
+        self, session: Session, scope: str, key: str
+    ) -> IdempotencyRecord | None:
+        result = await session.execute(
+            select(IdempotencyKeyModel.fingerprint, IdempotencyKeyModel.result).where(
+                IdempotencyKeyModel.scope == scope, IdempotencyKeyModel.key == key
+            )
+        )
+        row = result.one_or_none()
+        if row:
+            return IdempotencyRecord(fingerprint=row.fingerprint, result=row.result)
+
+    async def save_result(self, session: Session, scope: str, key: str, result: str):
+        await session.execute(
+            update(IdempotencyKeyModel)
+            .where(IdempotencyKeyModel.scope == scope, IdempotencyKeyModel.key == key)
+            .values(result=result)
+        )
+
+    async def delete_expired(
+        self, session: Session, before: datetime, limit: int
+    ) -> int:
+        """Delete at most `limit` keys that expired before `before`, oldest first"""
+        expired = (
+            select(IdempotencyKeyModel.id)
+            .where(IdempotencyKeyModel.expires_at < before)
+            .order_by(IdempotencyKeyModel.expires_at)
+            .limit(limit)
+        )
+        result = await session.execute(
+            delete(IdempotencyKeyModel).where(IdempotencyKeyModel.id.in_(expired))
+        )
+        return result.rowcount
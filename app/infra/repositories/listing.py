@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, literal, tuple_
+
+
+@dataclass(frozen=True)
+class Sort:
+    """Order of a list query: one indexed column, with id breaking ties"""
+
+    key: str = "id"
+    descending: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"-{self.key}" if self.descending else self.key
+
+
+def order_and_seek(
+    query: Select,
+    column: ColumnElement,
+    id_column: ColumnElement,
+    sort: Sort,
+    offset: int = 0,
+    after_id: int | None = None,
+    after_key: Any = None,
+) -> Select:
+    """Order `query` by (column, id) and start it after the given position,
+    or at `offset` when there is none"""
+    if sort.key == "id":
+        order_by = [id_column.desc() if sort.descending else id_column.asc()]
+        position, after = id_column, literal(after_id, id_column.type)
+    else:
+        order_by = (
+            [column.desc(), id_column.desc()]
+            if sort.descending
+            else [column.asc(), id_column.asc()]
+        )
+        # a row value comparison lets the composite (column, id) index seek
+        position = tuple_(column, id_column)
+        after = tuple_(
+            literal(after_key, column.type), literal(after_id, id_column.type)
+        )
+
+    query = query.order_by(*order_by)
+    if after_id is None:
+        return query.offset(offset)
+    return query.where(position < after if sort.descending else position > after)
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Literal
+
+
+PopularityScope = Literal["book", "author"]
+
+
+@dataclass
+class BasePopularityRepository(ABC):
+    @abstractmethod
+    async def record_borrow(self, book_id: int, borrowed_at: datetime): ...
+
+    @abstractmethod
+    async def get_top(
+        self, scope: PopularityScope, limit: int, since: date | None = None
+    ) -> list[tuple[int, int]]: ...
+
+    @abstractmethod
+    async def rebuild(self) -> int: ...
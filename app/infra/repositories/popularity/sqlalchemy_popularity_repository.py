@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from sqlalchemy import Select, delete, func, insert, literal, select, text
+from sqlalchemy.orm import Session
+
+from infra.database.dialects import upsert_insert
+from infra.database.instrumentation import instrument_repository
+from infra.database.models import (
+    BookModel,
+    BorrowCountModel,
+    BorrowModel,
+    DailyBorrowCountModel,
+)
+from infra.repositories.popularity.base import (
+    BasePopularityRepository,
+    PopularityScope,
+)
+
+
+def _history(scope: PopularityScope, daily: bool) -> Select:
+    """Borrow counts of every book or author, recomputed from `borrows`"""
+    if scope == "book":
+        subject_id = BorrowModel.book_id
+        query = select(literal(scope), subject_id)
+    else:
+        subject_id = BookModel.author_id
+        query = (
+            select(literal(scope), subject_id)
+            .select_from(BorrowModel)
+            .join(BookModel, BookModel.id == BorrowModel.book_id)
+        )
+
+    if not daily:
+        return query.add_columns(func.count()).group_by(subject_id)
+
+    day = func.date(BorrowModel.borrow_date)
+    return query.add_columns(day, func.count()).group_by(subject_id, day)
+
+
+@instrument_repository
+@dataclass
+class SQLAlchemyPopularityRepository(BasePopularityRepository):
+    async def record_borrow(
+        self, session: Session, book_id: int, borrowed_at: datetime
+    ):
+        """Count a new borrow for its book and the book's author; it has to run
+        in the transaction adding the borrow, so counters and history agree"""
+        result = await session.execute(
+            select(BookModel.author_id).where(BookModel.id == book_id)
+        )
+        subjects = [("book", book_id), ("author", result.scalar_one())]
+        insert = upsert_insert(session.bind.dialect.name)
+
+        all_time = insert(BorrowCountModel).values(
+            [
+                {"scope": scope, "subject_id": subject_id, "borrows": 1}
+                for scope, subject_id in subjects
+            ]
+        )
+        await session.execute(
+            all_time.on_conflict_do_update(
+                index_elements=["scope", "subject_id"],
+                set_={"borrows": BorrowCountModel.borrows + 1},
+            )
+        )
+
+        daily = insert(DailyBorrowCountModel).values(
+            [
+                {
+                    "scope": scope,
+                    "subject_id": subject_id,
+                    "day": borrowed_at.date(),
+                    "borrows": 1,
+                }
+                for scope, subject_id in subjects
+            ]
+        )
+        await session.execute(
+            daily.on_conflict_do_update(
+                index_elements=["scope", "subject_id", "day"],
+                set_={"borrows": DailyBorrowCountModel.borrows + 1},
+            )
+        )
+
+    async def get_top(
+        self,
+        session: Session,
+        scope: PopularityScope,
+        limit: int,
+        since: date | None = None,
+    ) -> list[tuple[int, int]]:
+        """(subject id, borrows) of the most borrowed books or authors, all time
+        or from `since` on"""
+        if since is None:
+            query = (
+                select(BorrowCountModel.subject_id, BorrowCountModel.borrows)
+                .where(BorrowCountModel.scope == scope)
+                .order_by(BorrowCountModel.borrows.desc(), BorrowCountModel.subject_id)
+            )
+        else:
+            borrows = func.sum(DailyBorrowCountModel.borrows)
+            query = (
+                select(DailyBorrowCountModel.subject_id, borrows)
+                .where(
+                    DailyBorrowCountModel.scope == scope,
+                    DailyBorrowCountModel.day >= since,
+                )
+                .group_by(DailyBorrowCountModel.subject_id)
+                .order_by(borrows.desc(), DailyBorrowCountModel.subject_id)
+            )
+
+        result = await session.execute(query.limit(limit))
+        return [(subject_id, borrows) for subject_id, borrows in result.all()]
+
+    async def rebuild(self, session: Session) -> int:
+        """Recompute every counter from the borrow history in bulk, returning
+        the number of books and authors counted"""
+        if session.bind.dialect.name == "postgresql":
+            # borrows made meanwhile wait for the rebuild instead of updating
+            # counters that are about to be replaced
+            await session.execute(
+                text("LOCK TABLE borrow_counts, daily_borrow_counts IN EXCLUSIVE MODE")
+            )
+
+        await session.execute(delete(BorrowCountModel))
+        await session.execute(delete(DailyBorrowCountModel))
+
+        counted = 0
+        for scope in ("book", "author"):
+            result = await session.execute(
+                insert(BorrowCountModel).from_select(
+                    ["scope", "subject_id", "borrows"], _history(scope, daily=False)
+                )
+            )
+            counted += result.rowcount
+            await session.execute(
+                insert(DailyBorrowCountModel).from_select(
+                    ["scope", "subject_id", "day", "borrows"],
+                    _history(scope, daily=True),
+                )
+            )
+        return counted
@@ -17,3 +17,15 @@ class AuthorNotFoundException(LogicException):
     @property
     def message(self):
         return "Author not found"
+
+
+@dataclass(eq=False)
+class AuthorVersionConflictException(LogicException):
+    author_id: int
+
+    @property
+    def message(self):
+        return (
+            f"Author {self.author_id} was changed since the version "
+            "the update is based on"
+        )
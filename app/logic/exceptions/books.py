@@ -24,3 +24,23 @@ class BookIsNotAvailableException(LogicException):
     @property
     def message(self):
         return "book is not available now"
+
+
+@dataclass(eq=False)
+class BookSearchQueryIsEmptyException(LogicException):
+    query: str
+
+    @property
+    def message(self):
+        return f"Search query has no words to look for: {self.query}"
+
+
+@dataclass(eq=False)
+class BookVersionConflictException(LogicException):
+    book_id: int
+
+    @property
+    def message(self):
+        return (
+            f"Book {self.book_id} was changed since the version the update is based on"
+        )
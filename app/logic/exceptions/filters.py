@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+
+from logic.exceptions.base import LogicException
+
+
+@dataclass(eq=False)
+class InvalidIncludeException(LogicException):
+    include: str
+    allowed: frozenset[str]
+
+    @property
+    def message(self):
+        return (
+            f"Unknown include: {self.include}; "
+            f"expected one of {', '.join(sorted(self.allowed))}"
+        )
+
+
+@dataclass(eq=False)
+class InvalidIdsException(LogicException):
+    ids: str
+    max_ids: int
+
+    @property
+    def message(self):
+        return (
+            f"Invalid ids: {self.ids}; "
+            f"expected up to {self.max_ids} comma separated integers"
+        )
+
+
+@dataclass(eq=False)
+class InvalidSortException(LogicException):
+    sort: str
+    allowed: frozenset[str]
+
+    @property
+    def message(self):
+        return (
+            f"Unsupported sort: {self.sort}; expected one of "
+            f"{', '.join(sorted(self.allowed))}, optionally prefixed with -"
+        )
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+from logic.exceptions.base import LogicException
+
+
+@dataclass(eq=False)
+class InvalidIdempotencyKeyException(LogicException):
+    key: str
+
+    @property
+    def message(self):
+        return f"Idempotency-Key must be 1 to 255 characters long: {self.key}"
+
+
+@dataclass(eq=False)
+class IdempotencyKeyReusedException(LogicException):
+    key: str
+
+    @property
+    def message(self):
+        return f"Idempotency-Key was already used for a different request: {self.key}"
+
+
+@dataclass(eq=False)
+class IdempotencyKeyInProgressException(LogicException):
+    key: str
+
+    @property
+    def message(self):
+        return f"A request with this Idempotency-Key is still in progress: {self.key}"
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from logic.exceptions.base import LogicException
+
+
+@dataclass(eq=False)
+class InvalidCursorException(LogicException):
+    cursor: str
+
+    @property
+    def message(self):
+        return f"Invalid pagination cursor: {self.cursor}"
@@ -1,18 +1,33 @@
+from datetime import timedelta
 from functools import lru_cache
 
 from punq import Container, Scope
 
+from infra.cache.entities import EntityCaches, build_cache
+from infra.cache.memory import TTLCache
 from infra.database.manager import DatabaseManager
+from infra.database.unit_of_work import UnitOfWork
 from infra.repositories.authors.base import BaseAuthorRepository
+from infra.repositories.authors.cached_author_repository import CachedAuthorRepository
 from infra.repositories.authors.sqlalchemy_author_repository import (
     SQLAlchemyAuthorRepository,
 )
 from infra.repositories.books.base import BaseBookRepository
+from infra.repositories.books.cached_book_repository import CachedBookRepository
 from infra.repositories.books.sqlalchemy_book_repository import SQLAlchemyBookRepository
 from infra.repositories.borrows.base import BaseBorrowRepository
+from infra.repositories.borrows.cached_borrow_repository import CachedBorrowRepository
 from infra.repositories.borrows.sqlalchemy_borrow_repository import (
     SQLAlchemyBorrowRepository,
 )
+from infra.repositories.idempotency.base import BaseIdempotencyRepository
+from infra.repositories.idempotency.sqlalchemy_idempotency_repository import (
+    SQLAlchemyIdempotencyRepository,
+)
+from infra.repositories.popularity.base import BasePopularityRepository
+from infra.repositories.popularity.sqlalchemy_popularity_repository import (
+    SQLAlchemyPopularityRepository,
+)
 from logic.services.authors import (
     AuthorNameValidatorService,
     AuthorService,
@@ -35,17 +50,53 @@ from logic.services.borrows import (
     BorrowService,
     ComposedBorrowValidatorService,
 )
+from logic.services.idempotency import BaseIdempotencyService, IdempotencyService
+from logic.services.loader import EntityLoaders, build_loader
+from logic.services.single_flight import SingleFlight
+from logic.services.popularity import BasePopularityService, PopularityService
+from logic.services.reminders import (
+    BaseBorrowReminderService,
+    BorrowReminderService,
+    OverdueScanStats,
+)
+from logic.services.totals import TotalCounter
+from logic.use_cases.authors.bulk_create import BulkCreateAuthorsUseCase
 from logic.use_cases.authors.create import CreateAuthorUseCase
 from logic.use_cases.authors.delete import DeleteAuthorUseCase
-from logic.use_cases.authors.get import GetAuthorUseCase, GetAuthorsUseCase
+from logic.use_cases.authors.export import ExportAuthorsUseCase
+from logic.use_cases.authors.get import (
+    GetAuthorUseCase,
+    GetAuthorsByIdsUseCase,
+    GetAuthorsUseCase,
+    GetAuthorVersionUseCase,
+)
+from logic.use_cases.authors.popular import GetPopularAuthorsUseCase
 from logic.use_cases.authors.update import UpdateAuthorUseCase
+from logic.use_cases.books.bulk_create import BulkCreateBooksUseCase
 from logic.use_cases.books.create import CreateBookUseCase
 from logic.use_cases.books.delete import DeleteBookUseCase
-from logic.use_cases.books.get import GetBookUseCase, GetBooksUseCase
+from logic.use_cases.books.export import ExportBooksUseCase
+from logic.use_cases.books.get import (
+    GetBookUseCase,
+    GetBooksByIdsUseCase,
+    GetBooksUseCase,
+    GetBookVersionUseCase,
+)
+from logic.use_cases.books.popular import GetPopularBooksUseCase
+from logic.use_cases.books.search import SearchBooksUseCase
 from logic.use_cases.books.update import UpdateBookUseCase
 from logic.use_cases.borrows.create import CreateBorrowUseCase
-from logic.use_cases.borrows.get import GetBorrowUseCase, GetBorrowsUseCase
+from logic.use_cases.borrows.export import ExportBorrowsUseCase
+from logic.use_cases.borrows.get import (
+    GetBorrowUseCase,
+    GetBorrowsByIdsUseCase,
+    GetBorrowsUseCase,
+    GetBorrowVersionUseCase,
+)
+from logic.use_cases.borrows.counters import RebuildBorrowCountersUseCase
+from logic.use_cases.borrows.remind import RemindOverdueBorrowsUseCase
 from logic.use_cases.borrows.update import UpdateBorrowUseCase
+from logic.use_cases.idempotency.purge import PurgeIdempotencyKeysUseCase
 from settings.config import Settings
 
 
@@ -59,10 +110,59 @@ def _init_container() -> Container:
     container.register(Settings, instance=Settings(), scope=Scope.singleton)
     settings: Settings = container.resolve(Settings)
 
-    database_manager = DatabaseManager(settings.db_url)
+    database_manager = DatabaseManager(
+        settings.db_url,
+        replica_url=settings.DB_REPLICA_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        echo=settings.DB_ECHO,
+        slow_query_threshold_ms=settings.DB_SLOW_QUERY_THRESHOLD_MS,
+    )
     container.register(
         DatabaseManager, instance=database_manager, scope=Scope.singleton
     )
+    container.register(
+        UnitOfWork,
+        instance=UnitOfWork(session_factory=database_manager.SessionLocal),
+        scope=Scope.singleton,
+    )
+    total_counter = TotalCounter(
+        cache=TTLCache(maxsize=128, ttl=settings.TOTAL_COUNT_CACHE_TTL)
+    )
+    entity_caches = EntityCaches(
+        authors=build_cache(settings.CACHE_AUTHOR_MAXSIZE, settings.CACHE_AUTHOR_TTL),
+        books=build_cache(settings.CACHE_BOOK_MAXSIZE, settings.CACHE_BOOK_TTL),
+        borrows=build_cache(settings.CACHE_BORROW_MAXSIZE, settings.CACHE_BORROW_TTL),
+    )
+    container.register(EntityCaches, instance=entity_caches, scope=Scope.singleton)
+
+    # lookups from concurrent callers are merged into shared IN queries
+    async def load_authors(author_ids: list[int]) -> dict:
+        author_service: BaseAuthorService = container.resolve(BaseAuthorService)
+        return await author_service.load_authors(author_ids=author_ids)
+
+    async def load_books(book_ids: list[int]) -> dict:
+        book_service: BaseBookService = container.resolve(BaseBookService)
+        return await book_service.load_books(book_ids=book_ids)
+
+    async def load_borrows(borrow_ids: list[int]) -> dict:
+        borrow_service: BaseBorrowService = container.resolve(BaseBorrowService)
+        return await borrow_service.load_borrows(borrow_ids=borrow_ids)
+
+    entity_loaders = EntityLoaders(
+        authors=build_loader(load_authors, settings.BATCH_LOADER_MAX_SIZE),
+        books=build_loader(load_books, settings.BATCH_LOADER_MAX_SIZE),
+        borrows=build_loader(load_borrows, settings.BATCH_LOADER_MAX_SIZE),
+    )
+    container.register(EntityLoaders, instance=entity_loaders, scope=Scope.singleton)
+
+    # concurrent identical reads share one in-flight query
+    single_flight = SingleFlight() if settings.SINGLE_FLIGHT_ENABLED else None
+    container.register(SingleFlight, instance=single_flight, scope=Scope.singleton)
 
     ### authors
 
@@ -77,7 +177,15 @@ def _init_container() -> Container:
         )
 
     def build_author_repository() -> BaseAuthorRepository:
-        return SQLAlchemyAuthorRepository()
+        repository = SQLAlchemyAuthorRepository()
+        if entity_caches.authors is None:
+            return repository
+        return CachedAuthorRepository(
+            repository=repository,
+            cache=entity_caches.authors,
+            book_cache=entity_caches.books,
+            session_factory=database_manager.SessionLocal,
+        )
 
     container.register(BaseAuthorValidatorService, factory=build_author_validators)
     container.register(BaseAuthorRepository, factory=build_author_repository)
@@ -86,7 +194,11 @@ def _init_container() -> Container:
     def init_author_service() -> AuthorService:
         return AuthorService(
             session_factory=database_manager.SessionLocal,
+            read_session_factory=database_manager.ReadSessionLocal,
             author_repository=container.resolve(BaseAuthorRepository),
+            total_counter=total_counter,
+            author_loader=entity_loaders.authors,
+            single_flight=single_flight,
         )
 
     # register services
@@ -94,8 +206,12 @@ def _init_container() -> Container:
 
     # register use cases
     container.register(CreateAuthorUseCase)
+    container.register(BulkCreateAuthorsUseCase)
     container.register(GetAuthorsUseCase)
     container.register(GetAuthorUseCase)
+    container.register(GetAuthorVersionUseCase)
+    container.register(GetAuthorsByIdsUseCase)
+    container.register(ExportAuthorsUseCase)
     container.register(UpdateAuthorUseCase)
     container.register(DeleteAuthorUseCase)
 
@@ -112,7 +228,14 @@ def _init_container() -> Container:
         )
 
     def build_book_repository() -> BaseBookRepository:
-        return SQLAlchemyBookRepository()
+        repository = SQLAlchemyBookRepository()
+        if entity_caches.books is None:
+            return repository
+        return CachedBookRepository(
+            repository=repository,
+            cache=entity_caches.books,
+            session_factory=database_manager.SessionLocal,
+        )
 
     container.register(BaseBookValidatorService, factory=build_book_validators)
 
@@ -122,7 +245,11 @@ def _init_container() -> Container:
     def init_book_service() -> BookService:
         return BookService(
             session_factory=database_manager.SessionLocal,
+            read_session_factory=database_manager.ReadSessionLocal,
             book_repository=container.resolve(BaseBookRepository),
+            total_counter=total_counter,
+            book_loader=entity_loaders.books,
+            single_flight=single_flight,
         )
 
     # register services
@@ -130,8 +257,13 @@ def _init_container() -> Container:
 
     # register use cases
     container.register(CreateBookUseCase)
+    container.register(BulkCreateBooksUseCase)
     container.register(GetBooksUseCase)
     container.register(GetBookUseCase)
+    container.register(GetBookVersionUseCase)
+    container.register(GetBooksByIdsUseCase)
+    container.register(SearchBooksUseCase)
+    container.register(ExportBooksUseCase)
     container.register(UpdateBookUseCase)
     container.register(DeleteBookUseCase)
 
@@ -148,7 +280,16 @@ def _init_container() -> Container:
         )
 
     def build_borrow_repository() -> BaseBorrowRepository:
-        return SQLAlchemyBorrowRepository()
+        repository = SQLAlchemyBorrowRepository(
+            loan_period=timedelta(days=settings.BORROW_LOAN_PERIOD_DAYS)
+        )
+        if entity_caches.borrows is None:
+            return repository
+        return CachedBorrowRepository(
+            repository=repository,
+            cache=entity_caches.borrows,
+            session_factory=database_manager.SessionLocal,
+        )
 
     container.register(BaseBorrowValidatorService, factory=build_borrow_validators)
 
@@ -157,17 +298,71 @@ def _init_container() -> Container:
     # initial services
     def init_borrow_service() -> BorrowService:
         return BorrowService(
+            session_factory=database_manager.SessionLocal,
+            read_session_factory=database_manager.ReadSessionLocal,
+            borrow_repository=container.resolve(BaseBorrowRepository),
+            total_counter=total_counter,
+            borrow_loader=entity_loaders.borrows,
+            single_flight=single_flight,
+        )
+
+    def init_borrow_reminder_service() -> BorrowReminderService:
+        return BorrowReminderService(
             session_factory=database_manager.SessionLocal,
             borrow_repository=container.resolve(BaseBorrowRepository),
+            loan_period=timedelta(days=settings.BORROW_LOAN_PERIOD_DAYS),
+            batch_size=settings.OVERDUE_SCAN_BATCH_SIZE,
+            stats=container.resolve(OverdueScanStats),
         )
 
     # register services
     container.register(BaseBorrowService, factory=init_borrow_service)
+    container.register(
+        OverdueScanStats, instance=OverdueScanStats(), scope=Scope.singleton
+    )
+    container.register(BaseBorrowReminderService, factory=init_borrow_reminder_service)
 
     # register use cases
     container.register(CreateBorrowUseCase)
     container.register(GetBorrowsUseCase)
     container.register(GetBorrowUseCase)
+    container.register(GetBorrowVersionUseCase)
+    container.register(GetBorrowsByIdsUseCase)
+    container.register(ExportBorrowsUseCase)
     container.register(UpdateBorrowUseCase)
+    container.register(RemindOverdueBorrowsUseCase)
+    container.register(RebuildBorrowCountersUseCase)
+
+    # popularity
+    container.register(BasePopularityRepository, factory=SQLAlchemyPopularityRepository)
+
+    def init_popularity_service() -> PopularityService:
+        return PopularityService(
+            session_factory=database_manager.SessionLocal,
+            read_session_factory=database_manager.ReadSessionLocal,
+            popularity_repository=container.resolve(BasePopularityRepository),
+        )
+
+    container.register(BasePopularityService, factory=init_popularity_service)
+
+    container.register(GetPopularAuthorsUseCase)
+    container.register(GetPopularBooksUseCase)
+
+    # idempotency keys
+    container.register(
+        BaseIdempotencyRepository, factory=SQLAlchemyIdempotencyRepository
+    )
+
+    def init_idempotency_service() -> IdempotencyService:
+        return IdempotencyService(
+            session_factory=database_manager.SessionLocal,
+            idempotency_repository=container.resolve(BaseIdempotencyRepository),
+            ttl=timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS),
+            purge_batch_size=settings.IDEMPOTENCY_PURGE_BATCH_SIZE,
+        )
+
+    container.register(BaseIdempotencyService, factory=init_idempotency_service)
+
+    container.register(PurgeIdempotencyKeysUseCase)
 
     return container
@@ -1,35 +1,73 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Collection
 from dataclasses import dataclass
 from typing import Iterable
-from contextlib import asynccontextmanager
+from contextlib import AbstractAsyncContextManager
 
 from application.api.filters import PaginationIn
-from domain.entities.library import Author as AuthorEntity
+from domain.entities.library import Author as AuthorEntity, EntityVersion
 
+from infra.database.unit_of_work import (
+    can_share_reads,
+    read_session_scope,
+    session_scope,
+)
 from infra.repositories.authors.base import BaseAuthorRepository
-from logic.exceptions.authors import AuthorNameTooLongException, AuthorNotFoundException
+from logic.services.loader import BatchLoader
+from logic.services.single_flight import SingleFlight, shared_read
+from logic.services.totals import TotalCount, TotalCounter
+from logic.exceptions.authors import (
+    AuthorNameTooLongException,
+    AuthorNotFoundException,
+    AuthorVersionConflictException,
+)
 
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import AsyncGenerator
 
 
 @dataclass
 class BaseAuthorService(ABC):
     @abstractmethod
     async def get_author_list(
-        self, pagination: PaginationIn
+        self, pagination: PaginationIn, include_books: bool = False
     ) -> Iterable[AuthorEntity]: ...
 
     @abstractmethod
     async def create_author(self, author: AuthorEntity) -> AuthorEntity: ...
 
     @abstractmethod
-    async def get_author(self, author_id: int) -> AuthorEntity: ...
+    async def create_authors(self, authors: list[AuthorEntity]) -> list[int]: ...
+
+    @abstractmethod
+    async def get_existing_author_ids(self, author_ids: set[int]) -> set[int]: ...
+
+    @abstractmethod
+    async def get_author_total(self, exact: bool = False) -> TotalCount: ...
+
+    @abstractmethod
+    def stream_authors(self, batch_size: int) -> AsyncIterator[list[AuthorEntity]]: ...
+
+    @abstractmethod
+    async def get_authors_by_ids(self, author_ids: list[int]) -> list[AuthorEntity]: ...
+
+    @abstractmethod
+    async def load_authors(self, author_ids: list[int]) -> dict[int, AuthorEntity]: ...
+
+    @abstractmethod
+    async def get_author(
+        self, author_id: int, include_books: bool = False
+    ) -> AuthorEntity: ...
+
+    @abstractmethod
+    async def get_author_version(self, author_id: int) -> EntityVersion: ...
 
     @abstractmethod
     async def update_author(
-        self, author_id: int, author: AuthorEntity
+        self,
+        author_id: int,
+        author: AuthorEntity,
+        expected_versions: Collection[int] | None = None,
     ) -> AuthorEntity: ...
 
     @abstractmethod
@@ -64,55 +102,167 @@ class ComposedAuthorValidatorService:
 @dataclass
 class AuthorService(BaseAuthorService):
     session_factory: sessionmaker
+    read_session_factory: sessionmaker
     author_repository: BaseAuthorRepository
+    total_counter: TotalCounter
+    author_loader: BatchLoader[int, AuthorEntity] | None = None
+    single_flight: SingleFlight | None = None
 
-    @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        try:
-            session: AsyncSession = self.session_factory()
-            yield session
-            await session.commit()
+    def get_session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        return session_scope(self.session_factory)
 
-        except Exception:
-            await session.rollback()
-            raise
-
-        finally:
-            await session.close()
+    def get_read_session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        return read_session_scope(self.read_session_factory, self.session_factory)
 
     async def create_author(self, author: AuthorEntity) -> AuthorEntity:
         async with self.get_session() as session:
             saved_author = await self.author_repository.add(
                 author=author, session=session
             )
+            self.total_counter.invalidate("authors", session=session)
 
         return saved_author
 
-    async def get_author_list(self, pagination: PaginationIn) -> Iterable[AuthorEntity]:
+    async def create_authors(self, authors: list[AuthorEntity]) -> list[int]:
         async with self.get_session() as session:
-            authors = await self.author_repository.get_all(
-                session=session, limit=pagination.limit, offset=pagination.offset
+            author_ids = await self.author_repository.add_many(
+                authors=authors, session=session
             )
-        return authors
+            self.total_counter.invalidate("authors", session=session)
+
+        return author_ids
 
-    async def get_author(self, author_id: int) -> AuthorEntity:
+    async def get_existing_author_ids(self, author_ids: set[int]) -> set[int]:
         async with self.get_session() as session:
-            author = await self.author_repository.get_by_id(
-                author_id=author_id, session=session
+            return await self.author_repository.get_existing_ids(
+                author_ids=author_ids, session=session
             )
 
-            if author is None:
-                raise AuthorNotFoundException()
+    async def get_author_list(
+        self, pagination: PaginationIn, include_books: bool = False
+    ) -> Iterable[AuthorEntity]:
+        after_id = pagination.after_id
+
+        async def fetch() -> list[AuthorEntity]:
+            async with self.get_read_session() as session:
+                return await self.author_repository.get_all(
+                    session=session,
+                    limit=pagination.limit,
+                    offset=pagination.offset,
+                    after_id=after_id,
+                    include_books=include_books,
+                )
+
+        key = (
+            "authors.list",
+            pagination.limit,
+            pagination.offset,
+            after_id,
+            include_books,
+        )
+        return await shared_read(self.single_flight, key, fetch)
+
+    async def get_author_total(self, exact: bool = False) -> TotalCount:
+        async def count() -> int:
+            async with self.get_read_session() as session:
+                return await self.author_repository.count(session=session)
+
+        async def shared_count() -> int:
+            return await shared_read(self.single_flight, ("authors.total",), count)
+
+        return await self.total_counter.get(
+            key="authors", count=shared_count, exact=exact
+        )
+
+    async def stream_authors(
+        self, batch_size: int
+    ) -> AsyncIterator[list[AuthorEntity]]:
+        async with self.get_read_session() as session:
+            async for authors in self.author_repository.stream_all(
+                session=session, batch_size=batch_size
+            ):
+                yield authors
+
+    async def get_author_version(self, author_id: int) -> EntityVersion:
+        async def fetch() -> EntityVersion | None:
+            async with self.get_read_session() as session:
+                return await self.author_repository.get_version(
+                    author_id=author_id, session=session
+                )
+
+        version = await shared_read(
+            self.single_flight, ("authors.version", author_id), fetch
+        )
+        if version is None:
+            raise AuthorNotFoundException()
+
+        return version
+
+    async def get_author(
+        self, author_id: int, include_books: bool = False
+    ) -> AuthorEntity:
+        async def fetch() -> AuthorEntity | None:
+            if (
+                self.author_loader is not None
+                and can_share_reads()
+                and not include_books
+            ):
+                return await self.author_loader.load(author_id)
+
+            async with self.get_read_session() as session:
+                return await self.author_repository.get_by_id(
+                    author_id=author_id, session=session, include_books=include_books
+                )
+
+        key = ("authors.get", author_id, include_books)
+        author = await shared_read(self.single_flight, key, fetch)
+        if author is None:
+            raise AuthorNotFoundException()
 
         return author
 
-    async def update_author(self, author_id: int, author: AuthorEntity) -> AuthorEntity:
+    async def get_authors_by_ids(self, author_ids: list[int]) -> list[AuthorEntity]:
+        """Found authors in the requested order; unknown ids are skipped"""
+        if self.author_loader is not None and can_share_reads():
+            authors = await self.author_loader.load_many(author_ids)
+        else:
+            authors = await self.load_authors(author_ids=author_ids)
+
+        return [
+            authors[author_id]
+            for author_id in dict.fromkeys(author_ids)
+            if author_id in authors
+        ]
+
+    async def load_authors(self, author_ids: list[int]) -> dict[int, AuthorEntity]:
+        async with self.get_read_session() as session:
+            authors = await self.author_repository.get_many(
+                author_ids=author_ids, session=session
+            )
+        return {author.id: author for author in authors}
+
+    async def update_author(
+        self,
+        author_id: int,
+        author: AuthorEntity,
+        expected_versions: Collection[int] | None = None,
+    ) -> AuthorEntity:
         async with self.get_session() as session:
             author = await self.author_repository.update(
-                author_id=author_id, session=session, author=author
+                author_id=author_id,
+                session=session,
+                author=author,
+                expected_versions=expected_versions,
             )
 
             if author is None:
+                # nothing matched: either the author is gone or its version moved on
+                if expected_versions is not None and (
+                    await self.author_repository.get_version(
+                        author_id=author_id, session=session
+                    )
+                ):
+                    raise AuthorVersionConflictException(author_id=author_id)
                 raise AuthorNotFoundException()
 
         return author
@@ -125,3 +275,5 @@ class AuthorService(BaseAuthorService):
 
             if not deleted:
                 raise AuthorNotFoundException()
+
+            self.total_counter.invalidate("authors", session=session)
@@ -1,23 +1,35 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Collection
 from dataclasses import dataclass
-from typing import Iterable
-from contextlib import asynccontextmanager
+from typing import Any, Iterable
+from contextlib import AbstractAsyncContextManager
 
 from application.api.filters import PaginationIn
-from domain.entities.library import Book as BookEntity
+from domain.entities.library import Book as BookEntity, EntityVersion
 
 
-from infra.repositories.books.base import BaseBookRepository
+from infra.database.unit_of_work import (
+    can_share_reads,
+    read_session_scope,
+    session_scope,
+)
+from infra.repositories.books.base import BaseBookRepository, BookFilter
+from infra.repositories.listing import Sort
+from infra.repositories.books.search import search_terms
 
 
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import AsyncGenerator
 
+from logic.services.loader import BatchLoader
+from logic.services.single_flight import SingleFlight, shared_read
+from logic.services.totals import TotalCount, TotalCounter
 from logic.exceptions.books import (
     BookIsNotAvailableException,
     BookNotFoundException,
+    BookSearchQueryIsEmptyException,
     BookTitleTooLongException,
+    BookVersionConflictException,
 )
 
 
@@ -27,13 +39,49 @@ class BaseBookService(ABC):
     async def create_book(self, book: BookEntity) -> BookEntity: ...
 
     @abstractmethod
-    async def get_book_list(self, pagination: PaginationIn) -> Iterable[BookEntity]: ...
+    async def get_book_list(
+        self,
+        pagination: PaginationIn,
+        filters: BookFilter = BookFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
+    ) -> Iterable[BookEntity]: ...
+
+    @abstractmethod
+    async def create_books(self, books: list[BookEntity]) -> list[int]: ...
+
+    @abstractmethod
+    async def get_book_total(
+        self, exact: bool = False, filters: BookFilter = BookFilter()
+    ) -> TotalCount: ...
+
+    @abstractmethod
+    async def search_books(
+        self, query: str, limit: int, after: tuple[float, int] | None = None
+    ) -> list[tuple[BookEntity, float]]: ...
+
+    @abstractmethod
+    def stream_books(self, batch_size: int) -> AsyncIterator[list[BookEntity]]: ...
+
+    @abstractmethod
+    async def get_books_by_ids(self, book_ids: list[int]) -> list[BookEntity]: ...
+
+    @abstractmethod
+    async def load_books(self, book_ids: list[int]) -> dict[int, BookEntity]: ...
 
     @abstractmethod
     async def get_book(self, book_id: int) -> BookEntity: ...
 
     @abstractmethod
-    async def update_book(self, book_id: int, book: BookEntity) -> BookEntity: ...
+    async def get_book_version(self, book_id: int) -> EntityVersion: ...
+
+    @abstractmethod
+    async def update_book(
+        self,
+        book_id: int,
+        book: BookEntity,
+        expected_versions: Collection[int] | None = None,
+    ) -> BookEntity: ...
 
     @abstractmethod
     async def delete_book(self, book_id: int): ...
@@ -73,55 +121,176 @@ class ComposedBookValidatorService:
 @dataclass
 class BookService(BaseBookService):
     session_factory: sessionmaker
+    read_session_factory: sessionmaker
     book_repository: BaseBookRepository
+    total_counter: TotalCounter
+    book_loader: BatchLoader[int, BookEntity] | None = None
+    single_flight: SingleFlight | None = None
 
-    @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        try:
-            session: AsyncSession = self.session_factory()
-            yield session
-            await session.commit()
-
-        except Exception:
-            await session.rollback()
-            raise
+    def get_session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        return session_scope(self.session_factory)
 
-        finally:
-            await session.close()
+    def get_read_session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        return read_session_scope(self.read_session_factory, self.session_factory)
 
     async def create_book(self, book: BookEntity) -> BookEntity:
         async with self.get_session() as session:
             saved_book = await self.book_repository.add(book=book, session=session)
+            self.total_counter.invalidate("books", session=session)
 
         return saved_book
 
-    async def get_book_list(self, pagination: PaginationIn) -> Iterable[BookEntity]:
+    async def create_books(self, books: list[BookEntity]) -> list[int]:
         async with self.get_session() as session:
-            authors = await self.book_repository.get_all(
-                session=session, limit=pagination.limit, offset=pagination.offset
+            book_ids = await self.book_repository.add_many(books=books, session=session)
+            self.total_counter.invalidate("books", session=session)
+
+        return book_ids
+
+    async def get_book_list(
+        self,
+        pagination: PaginationIn,
+        filters: BookFilter = BookFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
+    ) -> Iterable[BookEntity]:
+        after_id = pagination.after_id
+
+        async def fetch() -> list[BookEntity]:
+            async with self.get_read_session() as session:
+                return await self.book_repository.get_all(
+                    session=session,
+                    limit=pagination.limit,
+                    offset=pagination.offset,
+                    after_id=after_id,
+                    filters=filters,
+                    sort=sort,
+                    after_key=after_key,
+                )
+
+        key = (
+            "books.list",
+            pagination.limit,
+            pagination.offset,
+            after_id,
+            filters,
+            sort,
+            after_key,
+        )
+        return await shared_read(self.single_flight, key, fetch)
+
+    async def get_book_total(
+        self, exact: bool = False, filters: BookFilter = BookFilter()
+    ) -> TotalCount:
+        async def count() -> int:
+            async with self.get_read_session() as session:
+                return await self.book_repository.count(
+                    session=session, filters=filters
+                )
+
+        async def shared_count() -> int:
+            return await shared_read(
+                self.single_flight, ("books.total", filters), count
             )
-        return authors
 
-    async def get_book(self, book_id: int) -> BookEntity | None:
-        async with self.get_session() as session:
-            book = await self.book_repository.get_by_id(
-                book_id=book_id, session=session
+        key = "books" if filters == BookFilter() else ("books", filters)
+        return await self.total_counter.get(key=key, count=shared_count, exact=exact)
+
+    async def search_books(
+        self, query: str, limit: int, after: tuple[float, int] | None = None
+    ) -> list[tuple[BookEntity, float]]:
+        terms = search_terms(query)
+        if not terms:
+            raise BookSearchQueryIsEmptyException(query=query)
+
+        async with self.get_read_session() as session:
+            return await self.book_repository.search(
+                session=session, terms=terms, limit=limit, after=after
             )
 
-            if book is None:
-                raise BookNotFoundException()
+    async def stream_books(self, batch_size: int) -> AsyncIterator[list[BookEntity]]:
+        async with self.get_read_session() as session:
+            async for books in self.book_repository.stream_all(
+                session=session, batch_size=batch_size
+            ):
+                yield books
+
+    async def get_book_version(self, book_id: int) -> EntityVersion:
+        async def fetch() -> EntityVersion | None:
+            async with self.get_read_session() as session:
+                return await self.book_repository.get_version(
+                    book_id=book_id, session=session
+                )
+
+        version = await shared_read(
+            self.single_flight, ("books.version", book_id), fetch
+        )
+        if version is None:
+            raise BookNotFoundException()
+
+        return version
+
+    async def get_book(self, book_id: int) -> BookEntity:
+        async def fetch() -> BookEntity | None:
+            if self.book_loader is not None and can_share_reads():
+                return await self.book_loader.load(book_id)
+
+            async with self.get_read_session() as session:
+                return await self.book_repository.get_by_id(
+                    book_id=book_id, session=session
+                )
+
+        book = await shared_read(self.single_flight, ("books.get", book_id), fetch)
+        if book is None:
+            raise BookNotFoundException()
 
         return book
 
-    async def update_book(self, book_id: int, book: BookEntity) -> BookEntity:
+    async def get_books_by_ids(self, book_ids: list[int]) -> list[BookEntity]:
+        """Found books in the requested order; unknown ids are skipped"""
+        if self.book_loader is not None and can_share_reads():
+            books = await self.book_loader.load_many(book_ids)
+        else:
+            books = await self.load_books(book_ids=book_ids)
+
+        return [
+            books[book_id] for book_id in dict.fromkeys(book_ids) if book_id in books
+        ]
+
+    async def load_books(self, book_ids: list[int]) -> dict[int, BookEntity]:
+        async with self.get_read_session() as session:
+            books = await self.book_repository.get_many(
+                book_ids=book_ids, session=session
+            )
+        return {book.id: book for book in books}
+
+    async def update_book(
+        self,
+        book_id: int,
+        book: BookEntity,
+        expected_versions: Collection[int] | None = None,
+    ) -> BookEntity:
         async with self.get_session() as session:
             book = await self.book_repository.update(
-                book_id=book_id, session=session, book=book
+                book_id=book_id,
+                session=session,
+                book=book,
+                expected_versions=expected_versions,
             )
 
             if book is None:
+                # nothing matched: either the book is gone or its version moved on
+                if expected_versions is not None and (
+                    await self.book_repository.get_version(
+                        book_id=book_id, session=session
+                    )
+                ):
+                    raise BookVersionConflictException(book_id=book_id)
                 raise BookNotFoundException()
 
+            # the author and the copies left can change, and both are filters
+            self.total_counter.invalidate("books", session=session)
+
         return book
 
     async def delete_book(self, book_id: int):
@@ -133,6 +302,8 @@ class BookService(BaseBookService):
             if not deleted:
                 raise BookNotFoundException()
 
+            self.total_counter.invalidate("books", session=session)
+
     async def reduce_the_quantity_by_one(self, book_id: int):
         async with self.get_session() as session:
             decreased = await self.book_repository.reduce_by_one(
@@ -141,6 +312,11 @@ class BookService(BaseBookService):
             if not decreased:
                 raise BookIsNotAvailableException()
 
+            # only the availability filtered totals count the books with copies left
+            self.total_counter.invalidate_filtered(
+                "books", lambda filters: filters.available_only, session=session
+            )
+
     async def increase_the_quantity_by_one(self, book_id: int):
         async with self.get_session() as session:
             increased = await self.book_repository.increase_by_one(
@@ -148,3 +324,8 @@ class BookService(BaseBookService):
             )
             if not increased:
                 raise BookNotFoundException()
+
+            # only the availability filtered totals count the books with copies left
+            self.total_counter.invalidate_filtered(
+                "books", lambda filters: filters.available_only, session=session
+            )
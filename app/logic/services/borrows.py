@@ -1,20 +1,30 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
-from typing import Iterable
-from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Iterable
+from contextlib import AbstractAsyncContextManager
 
 from application.api.filters import PaginationIn
 from domain.entities.library import Borrow as BorrowEntity
 
 
-from infra.repositories.borrows.base import BaseBorrowRepository
+from infra.database.unit_of_work import (
+    can_share_reads,
+    read_session_scope,
+    session_scope,
+)
+from infra.repositories.borrows.base import BaseBorrowRepository, BorrowFilter
+from infra.repositories.listing import Sort
 
 
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import AsyncGenerator
 
 
+from logic.services.loader import BatchLoader
+from logic.services.single_flight import SingleFlight, shared_read
+from logic.services.totals import TotalCount, TotalCounter
 from logic.exceptions.borrows import (
     BorrowNotFoundException,
     BorrowReaderNameTooLongException,
@@ -28,12 +38,33 @@ class BaseBorrowService(ABC):
 
     @abstractmethod
     async def get_borrow_list(
-        self, pagination: PaginationIn
+        self,
+        pagination: PaginationIn,
+        filters: BorrowFilter = BorrowFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
     ) -> Iterable[BorrowEntity]: ...
 
+    @abstractmethod
+    async def get_borrow_total(
+        self, exact: bool = False, filters: BorrowFilter = BorrowFilter()
+    ) -> TotalCount: ...
+
+    @abstractmethod
+    def stream_borrows(self, batch_size: int) -> AsyncIterator[list[BorrowEntity]]: ...
+
+    @abstractmethod
+    async def get_borrows_by_ids(self, borrow_ids: list[int]) -> list[BorrowEntity]: ...
+
+    @abstractmethod
+    async def load_borrows(self, borrow_ids: list[int]) -> dict[int, BorrowEntity]: ...
+
     @abstractmethod
     async def get_borrow(self, borrow_id: int) -> BorrowEntity: ...
 
+    @abstractmethod
+    async def get_borrow_version(self, borrow_id: int) -> datetime: ...
+
     @abstractmethod
     async def completion_of_the_issue(self, borrow_id: int) -> BorrowEntity: ...
 
@@ -66,48 +97,138 @@ class ComposedBorrowValidatorService:
 @dataclass
 class BorrowService(BaseBorrowService):
     session_factory: sessionmaker
+    read_session_factory: sessionmaker
     borrow_repository: BaseBorrowRepository
+    total_counter: TotalCounter
+    borrow_loader: BatchLoader[int, BorrowEntity] | None = None
+    single_flight: SingleFlight | None = None
 
-    @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        try:
-            session: AsyncSession = self.session_factory()
-            yield session
-            await session.commit()
+    def get_session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        return session_scope(self.session_factory)
 
-        except Exception:
-            await session.rollback()
-            raise
-
-        finally:
-            await session.close()
+    def get_read_session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        return read_session_scope(self.read_session_factory, self.session_factory)
 
     async def create_borrow(self, borrow: BorrowEntity) -> BorrowEntity:
         async with self.get_session() as session:
             saved_borrow = await self.borrow_repository.add(
                 borrow=borrow, session=session
             )
+            self.total_counter.invalidate("borrows", session=session)
 
         return saved_borrow
 
-    async def get_borrow_list(self, pagination: PaginationIn) -> Iterable[BorrowEntity]:
-        async with self.get_session() as session:
-            authors = await self.borrow_repository.get_all(
-                session=session, limit=pagination.limit, offset=pagination.offset
-            )
-        return authors
-
-    async def get_borrow(self, borrow_id: int) -> BorrowEntity | None:
-        async with self.get_session() as session:
-            borrow = await self.borrow_repository.get_by_id(
-                borrow_id=borrow_id, session=session
+    async def get_borrow_list(
+        self,
+        pagination: PaginationIn,
+        filters: BorrowFilter = BorrowFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
+    ) -> Iterable[BorrowEntity]:
+        after_id = pagination.after_id
+
+        async def fetch() -> list[BorrowEntity]:
+            async with self.get_read_session() as session:
+                return await self.borrow_repository.get_all(
+                    session=session,
+                    limit=pagination.limit,
+                    offset=pagination.offset,
+                    after_id=after_id,
+                    filters=filters,
+                    sort=sort,
+                    after_key=after_key,
+                )
+
+        key = (
+            "borrows.list",
+            pagination.limit,
+            pagination.offset,
+            after_id,
+            filters,
+            sort,
+            after_key,
+        )
+        return await shared_read(self.single_flight, key, fetch)
+
+    async def get_borrow_total(
+        self, exact: bool = False, filters: BorrowFilter = BorrowFilter()
+    ) -> TotalCount:
+        async def count() -> int:
+            async with self.get_read_session() as session:
+                return await self.borrow_repository.count(
+                    session=session, filters=filters
+                )
+
+        async def shared_count() -> int:
+            return await shared_read(
+                self.single_flight, ("borrows.total", filters), count
             )
 
-            if borrow is None:
-                raise BorrowNotFoundException()
+        key = "borrows" if filters == BorrowFilter() else ("borrows", filters)
+        return await self.total_counter.get(key=key, count=shared_count, exact=exact)
+
+    async def stream_borrows(
+        self, batch_size: int
+    ) -> AsyncIterator[list[BorrowEntity]]:
+        async with self.get_read_session() as session:
+            async for borrows in self.borrow_repository.stream_all(
+                session=session, batch_size=batch_size
+            ):
+                yield borrows
+
+    async def get_borrow_version(self, borrow_id: int) -> datetime:
+        async def fetch() -> datetime | None:
+            async with self.get_read_session() as session:
+                return await self.borrow_repository.get_version(
+                    borrow_id=borrow_id, session=session
+                )
+
+        version = await shared_read(
+            self.single_flight, ("borrows.version", borrow_id), fetch
+        )
+        if version is None:
+            raise BorrowNotFoundException()
+
+        return version
+
+    async def get_borrow(self, borrow_id: int) -> BorrowEntity:
+        async def fetch() -> BorrowEntity | None:
+            if self.borrow_loader is not None and can_share_reads():
+                return await self.borrow_loader.load(borrow_id)
+
+            async with self.get_read_session() as session:
+                return await self.borrow_repository.get_by_id(
+                    borrow_id=borrow_id, session=session
+                )
+
+        borrow = await shared_read(
+            self.single_flight, ("borrows.get", borrow_id), fetch
+        )
+        if borrow is None:
+            raise BorrowNotFoundException()
 
         return borrow
 
+    async def get_borrows_by_ids(self, borrow_ids: list[int]) -> list[BorrowEntity]:
+        """Found borrows in the requested order; unknown ids are skipped"""
+        if self.borrow_loader is not None and can_share_reads():
+            borrows = await self.borrow_loader.load_many(borrow_ids)
+        else:
+            borrows = await self.load_borrows(borrow_ids=borrow_ids)
+
+        return [
+            borrows[borrow_id]
+            for borrow_id in dict.fromkeys(borrow_ids)
+            if borrow_id in borrows
+        ]
+
+    async def load_borrows(self, borrow_ids: list[int]) -> dict[int, BorrowEntity]:
+        async with self.get_read_session() as session:
+            borrows = await self.borrow_repository.get_many(
+                borrow_ids=borrow_ids, session=session
+            )
+        return {borrow.id: borrow for borrow in borrows}
+
     async def completion_of_the_issue(self, borrow_id: int) -> BorrowEntity:
         async with self.get_session() as session:
             borrow = await self.borrow_repository.completion_issue(
@@ -117,4 +238,6 @@ class BorrowService(BaseBorrowService):
             if borrow is None:
                 raise BorrowNotFoundException()
 
+            # status filtered totals count the borrows still out
+            self.total_counter.invalidate("borrows", session=session)
         return borrow
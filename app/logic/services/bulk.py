@@ -0,0 +1,13 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class RowError:
+    index: int
+    error: str
+
+
+@dataclass
+class BulkCreateResult:
+    created: list[tuple[int, int]] = field(default_factory=list)
+    errors: list[RowError] = field(default_factory=list)
@@ -0,0 +1,115 @@
+import logging
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import cache
+from typing import TypeVar
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from infra.database.unit_of_work import session_scope
+from infra.repositories.idempotency.base import BaseIdempotencyRepository
+from logic.exceptions.idempotency import (
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+)
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class IdempotencyKey:
+    """Client supplied key of a write, with a fingerprint of the request it was
+    sent with; keys are unique within a scope such as "borrows.create"."""
+
+    scope: str
+    key: str
+    fingerprint: str
+
+
+@cache
+def _adapter(result_type: type) -> TypeAdapter:
+    return TypeAdapter(result_type)
+
+
+@dataclass
+class BaseIdempotencyService(ABC):
+    @abstractmethod
+    async def claim(self, key: IdempotencyKey, result_type: type[T]) -> T | None: ...
+
+    @abstractmethod
+    async def save_result(self, key: IdempotencyKey, result): ...
+
+    @abstractmethod
+    async def purge_expired(self) -> int: ...
+
+
+@dataclass
+class IdempotencyService(BaseIdempotencyService):
+    session_factory: sessionmaker
+    idempotency_repository: BaseIdempotencyRepository
+    ttl: timedelta
+    purge_batch_size: int
+
+    def get_session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        return session_scope(self.session_factory)
+
+    async def claim(self, key: IdempotencyKey, result_type: type[T]) -> T | None:
+        """Reserve the key and return None, or return the result stored by the
+        request that used it first. It has to run first in the unit of work
+        making the write, so the key commits or rolls back together with it."""
+        async with self.get_session() as session:
+            claimed = await self.idempotency_repository.claim(
+                session=session,
+                scope=key.scope,
+                key=key.key,
+                fingerprint=key.fingerprint,
+                expires_at=datetime.now() + self.ttl,
+            )
+            if claimed:
+                return None
+
+            record = await self.idempotency_repository.get(
+                session=session, scope=key.scope, key=key.key
+            )
+
+        if record.fingerprint != key.fingerprint:
+            raise IdempotencyKeyReusedException(key=key.key)
+        if record.result is None:
+            raise IdempotencyKeyInProgressException(key=key.key)
+
+        return _adapter(result_type).validate_json(record.result)
+
+    async def save_result(self, key: IdempotencyKey, result):
+        async with self.get_session() as session:
+            await self.idempotency_repository.save_result(
+                session=session,
+                scope=key.scope,
+                key=key.key,
+                result=_adapter(type(result)).dump_json(result).decode(),
+            )
+
+    async def purge_expired(self) -> int:
+        """Delete expired keys one short transaction per batch, so the purge
+        never holds locks on a large part of the table"""
+        before = datetime.now()
+        purged = 0
+
+        while True:
+            async with self.get_session() as session:
+                deleted = await self.idempotency_repository.delete_expired(
+                    session=session, before=before, limit=self.purge_batch_size
+                )
+            purged += deleted
+            if deleted < self.purge_batch_size:
+                break
+
+        if purged:
+            logger.info("Purged %d expired idempotency keys", purged)
+        return purged
@@ -0,0 +1,112 @@
+import asyncio
+import contextvars
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class LoaderStats:
+    loads: int = 0
+    batches: int = 0
+    keys: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Lookups answered without a query of their own"""
+        return self.loads - self.batches
+
+
+@dataclass
+class BatchLoader(Generic[K, V]):
+    """Merges lookups made within the same event loop tick into batched fetches.
+
+    `fetch` receives the distinct keys of a batch and returns the values it
+    found; missing keys resolve to None. Batches run in an empty context, so a
+    fetch never joins the unit of work or read routing of whichever caller
+    happened to trigger it.
+    """
+
+    fetch: Callable[[list[K]], Awaitable[dict[K, V]]]
+    max_batch_size: int = 100
+    stats: LoaderStats = field(default_factory=LoaderStats)
+
+    _pending: dict[K, list[asyncio.Future]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _scheduled: bool = field(default=False, init=False, repr=False)
+    _tasks: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+
+    async def load(self, key: K) -> V | None:
+        self.stats.loads += 1
+        return await self._enqueue(key)
+
+    async def load_many(self, keys: Iterable[K]) -> dict[K, V]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        self.stats.loads += 1
+        values = await asyncio.gather(*(self._enqueue(key) for key in keys))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def _enqueue(self, key: K) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._dispatch, context=contextvars.Context())
+        return future
+
+    def _dispatch(self):
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            batch = {
+                key: pending[key] for key in keys[start : start + self.max_batch_size]
+            }
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, list[asyncio.Future]]):
+        self.stats.batches += 1
+        self.stats.keys += len(batch)
+        try:
+            values = await self.fetch(list(batch))
+        except Exception as err:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(err)
+            return
+
+        for key, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(values.get(key))
+
+
+@dataclass
+class EntityLoaders:
+    """Shared per-entity loaders; an entity without one is fetched per call"""
+
+    authors: BatchLoader | None = None
+    books: BatchLoader | None = None
+    borrows: BatchLoader | None = None
+
+
+def build_loader(
+    fetch: Callable[[list[K]], Awaitable[dict[K, V]]], max_batch_size: int
+) -> BatchLoader[K, V] | None:
+    if max_batch_size <= 0:
+        return None
+    return BatchLoader(fetch=fetch, max_batch_size=max_batch_size)
@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from domain.entities.library import Borrow as BorrowEntity
+from infra.database.unit_of_work import read_session_scope, session_scope
+from infra.repositories.popularity.base import (
+    BasePopularityRepository,
+    PopularityScope,
+)
+
+
+PopularityPeriod = Literal["week", "all"]
+
+
+@dataclass
+class BasePopularityService(ABC):
+    @abstractmethod
+    async def record_borrow(self, borrow: BorrowEntity): ...
+
+    @abstractmethod
+    async def get_most_borrowed(
+        self, scope: PopularityScope, period: PopularityPeriod, limit: int
+    ) -> list[tuple[int, int]]: ...
+
+    @abstractmethod
+    async def rebuild_counters(self) -> int: ...
+
+
+@dataclass
+class PopularityService(BasePopularityService):
+    session_factory: sessionmaker
+    read_session_factory: sessionmaker
+    popularity_repository: BasePopularityRepository
+
+    def get_session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        return session_scope(self.session_factory)
+
+    def get_read_session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        return read_session_scope(self.read_session_factory, self.session_factory)
+
+    async def record_borrow(self, borrow: BorrowEntity):
+        async with self.get_session() as session:
+            await self.popularity_repository.record_borrow(
+                session=session,
+                book_id=borrow.book_id,
+                borrowed_at=borrow.borrow_date,
+            )
+
+    async def get_most_borrowed(
+        self, scope: PopularityScope, period: PopularityPeriod, limit: int
+    ) -> list[tuple[int, int]]:
+        """(id, borrows) of the most borrowed books or authors; a week is
+        today and the six days before it"""
+        since = date.today() - timedelta(days=6) if period == "week" else None
+
+        async with self.get_read_session() as session:
+            return await self.popularity_repository.get_top(
+                session=session, scope=scope, limit=limit, since=since
+            )
+
+    async def rebuild_counters(self) -> int:
+        async with self.get_session() as session:
+            return await self.popularity_repository.rebuild(session=session)
@@ -0,0 +1,106 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from infra.database.unit_of_work import session_scope
+from infra.repositories.borrows.base import BaseBorrowRepository, BorrowFilter
+
+
+logger = logging.getLogger(__name__)
+
+OVERDUE_REMINDER = "overdue"
+
+
+@dataclass(frozen=True)
+class OverdueScanRun:
+    started_at: datetime
+    duration: float
+    batches: int
+    scanned: int
+    reminded: int
+
+
+@dataclass
+class OverdueScanStats:
+    runs: int = 0
+    scanned: int = 0
+    reminded: int = 0
+    last_run: OverdueScanRun | None = field(default=None)
+
+    def record(self, run: OverdueScanRun):
+        self.runs += 1
+        self.scanned += run.scanned
+        self.reminded += run.reminded
+        self.last_run = run
+
+
+@dataclass
+class BaseBorrowReminderService(ABC):
+    @abstractmethod
+    async def remind_overdue(self) -> OverdueScanRun: ...
+
+
+@dataclass
+class BorrowReminderService(BaseBorrowReminderService):
+    session_factory: sessionmaker
+    borrow_repository: BaseBorrowRepository
+    loan_period: timedelta
+    batch_size: int
+    stats: OverdueScanStats
+
+    async def remind_overdue(self) -> OverdueScanRun:
+        """Record an overdue reminder for every borrow out longer than the loan
+        period, walking outstanding borrows in id order one batch at a time"""
+        started_at = datetime.now()
+        started = time.perf_counter()
+        filters = BorrowFilter(
+            status="active", borrowed_before=started_at - self.loan_period
+        )
+        after_id = None
+        batches = scanned = reminded = 0
+
+        while True:
+            # a short transaction per batch, so a long scan holds no locks
+            # and a failure keeps the batches already recorded
+            async with session_scope(self.session_factory) as session:
+                borrows = await self.borrow_repository.get_all(
+                    session=session,
+                    limit=self.batch_size,
+                    offset=0,
+                    after_id=after_id,
+                    filters=filters,
+                )
+                reminded += await self.borrow_repository.add_reminders(
+                    session=session,
+                    borrow_ids=[borrow.id for borrow in borrows],
+                    kind=OVERDUE_REMINDER,
+                )
+
+            if not borrows:
+                break
+            batches += 1
+            scanned += len(borrows)
+            after_id = borrows[-1].id
+            if len(borrows) < self.batch_size:
+                break
+
+        run = OverdueScanRun(
+            started_at=started_at,
+            duration=time.perf_counter() - started,
+            batches=batches,
+            scanned=scanned,
+            reminded=reminded,
+        )
+        self.stats.record(run)
+        logger.info(
+            "Overdue scan: %d borrows in %d batches, %d new reminders, %.1f ms",
+            run.scanned,
+            run.batches,
+            run.reminded,
+            run.duration * 1000,
+        )
+        return run
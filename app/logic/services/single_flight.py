@@ -0,0 +1,70 @@
+import asyncio
+import contextvars
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from infra.database.unit_of_work import can_share_reads
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    executions: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Callers that shared another caller's in-flight execution"""
+        return self.calls - self.executions
+
+
+@dataclass
+class SingleFlight:
+    """Lets concurrent callers of the same read share one in-flight execution.
+
+    Keys are tuples whose first item names the kind of read; stats are kept
+    per kind. The shared execution runs as its own task in an empty context,
+    so it outlives a cancelled caller and never joins a caller's unit of work.
+    """
+
+    stats: dict[str, SingleFlightStats] = field(default_factory=dict)
+
+    _in_flight: dict[Hashable, asyncio.Task] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    async def do(self, key: tuple, call: Callable[[], Awaitable[T]]) -> T:
+        stats = self.stats.setdefault(key[0], SingleFlightStats())
+        stats.calls += 1
+
+        task = self._in_flight.get(key)
+        if task is None:
+            stats.executions += 1
+            task = asyncio.get_running_loop().create_task(
+                call(), context=contextvars.Context()
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: tuple, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # mark the error as retrieved when every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+
+async def shared_read(
+    single_flight: SingleFlight | None,
+    key: tuple,
+    call: Callable[[], Awaitable[T]],
+) -> T:
+    """Run a read through `single_flight` when it may be shared with other callers"""
+    if single_flight is None or not can_share_reads():
+        return await call()
+    return await single_flight.do(key, call)
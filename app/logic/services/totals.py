@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infra.cache.invalidation import invalidate_matching_on_commit
+from infra.cache.memory import TTLCache
+
+
+@dataclass(frozen=True)
+class TotalCount:
+    value: int
+    exact: bool
+
+    @property
+    def kind(self) -> Literal["exact", "cached"]:
+        return "exact" if self.exact else "cached"
+
+
+@dataclass
+class TotalCounter:
+    """Serves list totals from a short-lived cache unless an exact count is requested"""
+
+    cache: TTLCache
+
+    async def get(
+        self, key: Hashable, count: Callable[[], Awaitable[int]], exact: bool = False
+    ) -> TotalCount:
+        if not exact:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return TotalCount(value=cached, exact=False)
+
+        value = await count()
+        self.cache.set(key, value)
+        return TotalCount(value=value, exact=True)
+
+    def invalidate(self, key: Hashable, session: AsyncSession):
+        """Drop the total under `key` and every filtered total scoped to it,
+        stored under `(key, filters)`, now and when the writing transaction ends"""
+        self.invalidate_filtered(key, lambda filters: True, session=session)
+
+    def invalidate_filtered(
+        self, key: Hashable, affected: Callable[[Any], bool], session: AsyncSession
+    ):
+        """Drop the total under `key` and the filtered totals scoped to it
+        whose filters `affected` accepts, now and when the writing transaction
+        ends; a reader may count the old rows again until then"""
+        invalidate_matching_on_commit(
+            session,
+            self.cache,
+            lambda cached: (
+                cached == key
+                or (
+                    isinstance(cached, tuple)
+                    and len(cached) == 2
+                    and cached[0] == key
+                    and affected(cached[1])
+                )
+            ),
+        )
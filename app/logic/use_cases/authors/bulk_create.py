@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Sequence
+
+from domain.entities.library import Author
+from infra.database.unit_of_work import UnitOfWork
+from logic.exceptions.base import LogicException
+from logic.services.authors import BaseAuthorService, BaseAuthorValidatorService
+from logic.services.bulk import BulkCreateResult, RowError
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class BulkCreateAuthorsUseCase(BaseUseCase):
+    author_service: BaseAuthorService
+    validator_service: BaseAuthorValidatorService
+    unit_of_work: UnitOfWork
+
+    async def execute(self, authors: Sequence[tuple[int, Author]]) -> BulkCreateResult:
+        result = BulkCreateResult()
+        valid: list[tuple[int, Author]] = []
+
+        for index, author in authors:
+            try:
+                self.validator_service.validate(author=author)
+            except LogicException as err:
+                result.errors.append(RowError(index=index, error=err.message))
+            else:
+                valid.append((index, author))
+
+        if valid:
+            async with self.unit_of_work.begin():
+                author_ids = await self.author_service.create_authors(
+                    authors=[author for _, author in valid]
+                )
+            result.created = [
+                (index, author_id) for (index, _), author_id in zip(valid, author_ids)
+            ]
+
+        return result
@@ -0,0 +1,14 @@
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from domain.entities.library import Author
+from logic.services.authors import BaseAuthorService
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class ExportAuthorsUseCase(BaseUseCase):
+    author_service: BaseAuthorService
+
+    def execute(self, batch_size: int) -> AsyncIterator[list[Author]]:
+        return self.author_service.stream_authors(batch_size=batch_size)
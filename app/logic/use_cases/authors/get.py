@@ -2,8 +2,9 @@ from dataclasses import dataclass
 from typing import Iterable
 
 from application.api.filters import PaginationIn
-from domain.entities.library import Author
+from domain.entities.library import Author, EntityVersion
 from logic.services.authors import BaseAuthorService
+from logic.services.totals import TotalCount
 from logic.use_cases.base import BaseUseCase
 
 
@@ -11,17 +12,40 @@ from logic.use_cases.base import BaseUseCase
 class GetAuthorsUseCase(BaseUseCase):
     author_service: BaseAuthorService
 
-    async def execute(self, pagination: PaginationIn) -> Iterable[Author]:
-        authors = await self.author_service.get_author_list(pagination=pagination)
+    async def execute(
+        self, pagination: PaginationIn, include_books: bool = False
+    ) -> tuple[Iterable[Author], TotalCount]:
+        authors = await self.author_service.get_author_list(
+            pagination=pagination, include_books=include_books
+        )
+        total = await self.author_service.get_author_total(exact=pagination.exact_total)
 
-        return authors
+        return authors, total
 
 
 @dataclass
 class GetAuthorUseCase(BaseUseCase):
     author_service: BaseAuthorService
 
-    async def execute(self, author_id: int) -> Author:
-        author = await self.author_service.get_author(author_id=author_id)
+    async def execute(self, author_id: int, include_books: bool = False) -> Author:
+        author = await self.author_service.get_author(
+            author_id=author_id, include_books=include_books
+        )
 
         return author
+
+
+@dataclass
+class GetAuthorVersionUseCase(BaseUseCase):
+    author_service: BaseAuthorService
+
+    async def execute(self, author_id: int) -> EntityVersion:
+        return await self.author_service.get_author_version(author_id=author_id)
+
+
+@dataclass
+class GetAuthorsByIdsUseCase(BaseUseCase):
+    author_service: BaseAuthorService
+
+    async def execute(self, author_ids: list[int]) -> list[Author]:
+        return await self.author_service.get_authors_by_ids(author_ids=author_ids)
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+from domain.entities.library import Author
+from logic.services.authors import BaseAuthorService
+from logic.services.popularity import BasePopularityService, PopularityPeriod
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class GetPopularAuthorsUseCase(BaseUseCase):
+    popularity_service: BasePopularityService
+    author_service: BaseAuthorService
+
+    async def execute(
+        self, period: PopularityPeriod, limit: int
+    ) -> list[tuple[Author, int]]:
+        counts = await self.popularity_service.get_most_borrowed(
+            scope="author", period=period, limit=limit
+        )
+        authors = await self.author_service.get_authors_by_ids(
+            author_ids=[author_id for author_id, _ in counts]
+        )
+
+        authors_by_id = {author.id: author for author in authors}
+        return [
+            (authors_by_id[author_id], borrows)
+            for author_id, borrows in counts
+            if author_id in authors_by_id
+        ]
@@ -1,3 +1,4 @@
+from collections.abc import Collection
 from dataclasses import dataclass
 from domain.entities.library import Author
 from logic.services.authors import BaseAuthorService
@@ -8,9 +9,14 @@ from logic.use_cases.base import BaseUseCase
 class UpdateAuthorUseCase(BaseUseCase):
     author_service: BaseAuthorService
 
-    async def execute(self, author_id: int, author: Author) -> Author:
+    async def execute(
+        self,
+        author_id: int,
+        author: Author,
+        expected_versions: Collection[int] | None = None,
+    ) -> Author:
         author = await self.author_service.update_author(
-            author_id=author_id, author=author
+            author_id=author_id, author=author, expected_versions=expected_versions
         )
 
         return author
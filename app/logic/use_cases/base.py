@@ -1,6 +1,43 @@
+import time
 from abc import ABC, abstractmethod
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from infra.metrics import Histogram
+
+
+use_case_latency = Histogram(
+    name="use_case_duration_seconds",
+    help="Duration of use case executions, by use case and outcome",
+    labels=("use_case", "outcome"),
+)
 
 
 class BaseUseCase(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # streaming use cases return an iterator at once; only coroutines are timed
+        execute = cls.__dict__.get("execute")
+        if iscoroutinefunction(execute):
+            cls.execute = _timed_execute(cls.__name__, execute)
+
     @abstractmethod
     def execute(self): ...
+
+
+def _timed_execute(use_case: str, execute):
+    @wraps(execute)
+    async def wrapper(*args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            result = await execute(*args, **kwargs)
+        except BaseException:
+            use_case_latency.observe(
+                time.perf_counter() - started_at, use_case, "error"
+            )
+            raise
+
+        use_case_latency.observe(time.perf_counter() - started_at, use_case, "ok")
+        return result
+
+    return wrapper
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Sequence
+
+from domain.entities.library import Book
+from infra.database.unit_of_work import UnitOfWork
+from logic.exceptions.authors import AuthorNotFoundException
+from logic.exceptions.base import LogicException
+from logic.services.authors import BaseAuthorService
+from logic.services.books import BaseBookService, BaseBookValidatorService
+from logic.services.bulk import BulkCreateResult, RowError
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class BulkCreateBooksUseCase(BaseUseCase):
+    book_service: BaseBookService
+    author_service: BaseAuthorService
+    validator_service: BaseBookValidatorService
+    unit_of_work: UnitOfWork
+
+    async def execute(self, books: Sequence[tuple[int, Book]]) -> BulkCreateResult:
+        result = BulkCreateResult()
+        valid: list[tuple[int, Book]] = []
+
+        for index, book in books:
+            try:
+                self.validator_service.validate(book=book)
+            except LogicException as err:
+                result.errors.append(RowError(index=index, error=err.message))
+            else:
+                valid.append((index, book))
+
+        if not valid:
+            return result
+
+        async with self.unit_of_work.begin():
+            existing_author_ids = await self.author_service.get_existing_author_ids(
+                author_ids={book.author_id for _, book in valid}
+            )
+
+            insertable: list[tuple[int, Book]] = []
+            for index, book in valid:
+                if book.author_id in existing_author_ids:
+                    insertable.append((index, book))
+                else:
+                    result.errors.append(
+                        RowError(index=index, error=AuthorNotFoundException().message)
+                    )
+
+            book_ids = await self.book_service.create_books(
+                books=[book for _, book in insertable]
+            )
+
+        result.created = [
+            (index, book_id) for (index, _), book_id in zip(insertable, book_ids)
+        ]
+        return result
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 
 from domain.entities.library import Book
+from infra.database.unit_of_work import UnitOfWork
 from logic.services.authors import BaseAuthorService
 from logic.services.books import BaseBookService, BaseBookValidatorService
+from logic.services.idempotency import BaseIdempotencyService, IdempotencyKey
 from logic.use_cases.base import BaseUseCase
 
 
@@ -11,12 +13,30 @@ class CreateBookUseCase(BaseUseCase):
     book_service: BaseBookService
     author_service: BaseAuthorService
     validator_service: BaseBookValidatorService
+    idempotency_service: BaseIdempotencyService
+    unit_of_work: UnitOfWork
 
-    async def execute(self, book: Book) -> Book:
+    async def execute(
+        self, book: Book, idempotency_key: IdempotencyKey | None = None
+    ) -> Book:
         self.validator_service.validate(book=book)
 
-        await self.author_service.get_author(author_id=book.author_id)
+        # the author lookup must see the primary, not a lagging replica
+        async with self.unit_of_work.begin():
+            if idempotency_key is not None:
+                replayed = await self.idempotency_service.claim(
+                    key=idempotency_key, result_type=Book
+                )
+                if replayed is not None:
+                    return replayed
 
-        saved_book = await self.book_service.create_book(book=book)
+            await self.author_service.get_author(author_id=book.author_id)
+
+            saved_book = await self.book_service.create_book(book=book)
+
+            if idempotency_key is not None:
+                await self.idempotency_service.save_result(
+                    key=idempotency_key, result=saved_book
+                )
 
         return saved_book
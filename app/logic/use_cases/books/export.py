@@ -0,0 +1,14 @@
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from domain.entities.library import Book
+from logic.services.books import BaseBookService
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class ExportBooksUseCase(BaseUseCase):
+    book_service: BaseBookService
+
+    def execute(self, batch_size: int) -> AsyncIterator[list[Book]]:
+        return self.book_service.stream_books(batch_size=batch_size)
@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Any, Iterable
 
 from application.api.filters import PaginationIn
-from domain.entities.library import Book
+from domain.entities.library import Book, EntityVersion
+from infra.repositories.books.base import BookFilter
+from infra.repositories.listing import Sort
 from logic.services.books import BaseBookService
+from logic.services.totals import TotalCount
 from logic.use_cases.base import BaseUseCase
 
 
@@ -11,10 +14,21 @@ from logic.use_cases.base import BaseUseCase
 class GetBooksUseCase(BaseUseCase):
     book_service: BaseBookService
 
-    async def execute(self, pagination: PaginationIn) -> Iterable[Book]:
-        books = await self.book_service.get_book_list(pagination=pagination)
+    async def execute(
+        self,
+        pagination: PaginationIn,
+        filters: BookFilter = BookFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
+    ) -> tuple[Iterable[Book], TotalCount]:
+        books = await self.book_service.get_book_list(
+            pagination=pagination, filters=filters, sort=sort, after_key=after_key
+        )
+        total = await self.book_service.get_book_total(
+            exact=pagination.exact_total, filters=filters
+        )
 
-        return books
+        return books, total
 
 
 @dataclass
@@ -25,3 +39,19 @@ class GetBookUseCase(BaseUseCase):
         book = await self.book_service.get_book(book_id=book_id)
 
         return book
+
+
+@dataclass
+class GetBookVersionUseCase(BaseUseCase):
+    book_service: BaseBookService
+
+    async def execute(self, book_id: int) -> EntityVersion:
+        return await self.book_service.get_book_version(book_id=book_id)
+
+
+@dataclass
+class GetBooksByIdsUseCase(BaseUseCase):
+    book_service: BaseBookService
+
+    async def execute(self, book_ids: list[int]) -> list[Book]:
+        return await self.book_service.get_books_by_ids(book_ids=book_ids)
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+from domain.entities.library import Book
+from logic.services.books import BaseBookService
+from logic.services.popularity import BasePopularityService, PopularityPeriod
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class GetPopularBooksUseCase(BaseUseCase):
+    popularity_service: BasePopularityService
+    book_service: BaseBookService
+
+    async def execute(
+        self, period: PopularityPeriod, limit: int
+    ) -> list[tuple[Book, int]]:
+        counts = await self.popularity_service.get_most_borrowed(
+            scope="book", period=period, limit=limit
+        )
+        books = await self.book_service.get_books_by_ids(
+            book_ids=[book_id for book_id, _ in counts]
+        )
+
+        books_by_id = {book.id: book for book in books}
+        return [
+            (books_by_id[book_id], borrows)
+            for book_id, borrows in counts
+            if book_id in books_by_id
+        ]
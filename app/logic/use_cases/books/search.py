@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+from domain.entities.library import Book
+from logic.services.books import BaseBookService
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class SearchBooksUseCase(BaseUseCase):
+    book_service: BaseBookService
+
+    async def execute(
+        self, query: str, limit: int, after: tuple[float, int] | None = None
+    ) -> list[tuple[Book, float]]:
+        return await self.book_service.search_books(
+            query=query, limit=limit, after=after
+        )
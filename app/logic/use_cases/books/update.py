@@ -1,3 +1,4 @@
+from collections.abc import Collection
 from dataclasses import dataclass
 from domain.entities.library import Book
 from logic.services.books import BaseBookService
@@ -8,7 +9,14 @@ from logic.use_cases.base import BaseUseCase
 class UpdateBookUseCase(BaseUseCase):
     book_service: BaseBookService
 
-    async def execute(self, book_id: int, book: Book) -> Book:
-        book = await self.book_service.update_book(book_id=book_id, book=book)
+    async def execute(
+        self,
+        book_id: int,
+        book: Book,
+        expected_versions: Collection[int] | None = None,
+    ) -> Book:
+        book = await self.book_service.update_book(
+            book_id=book_id, book=book, expected_versions=expected_versions
+        )
 
         return book
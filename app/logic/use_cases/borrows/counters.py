@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from logic.services.popularity import BasePopularityService
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class RebuildBorrowCountersUseCase(BaseUseCase):
+    popularity_service: BasePopularityService
+
+    async def execute(self) -> int:
+        return await self.popularity_service.rebuild_counters()
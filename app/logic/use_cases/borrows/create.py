@@ -1,8 +1,11 @@
 from dataclasses import dataclass
 
 from domain.entities.library import Borrow
+from infra.database.unit_of_work import UnitOfWork
 from logic.services.books import BaseBookService
 from logic.services.borrows import BaseBorrowService, BaseBorrowValidatorService
+from logic.services.idempotency import BaseIdempotencyService, IdempotencyKey
+from logic.services.popularity import BasePopularityService
 from logic.use_cases.base import BaseUseCase
 
 
@@ -11,11 +14,32 @@ class CreateBorrowUseCase(BaseUseCase):
     borrow_service: BaseBorrowService
     book_service: BaseBookService
     validator_service: BaseBorrowValidatorService
+    popularity_service: BasePopularityService
+    idempotency_service: BaseIdempotencyService
+    unit_of_work: UnitOfWork
 
-    async def execute(self, borrow: Borrow) -> Borrow:
+    async def execute(
+        self, borrow: Borrow, idempotency_key: IdempotencyKey | None = None
+    ) -> Borrow:
         self.validator_service.validate(borrow=borrow)
 
-        await self.book_service.reduce_the_quantity_by_one(book_id=borrow.book_id)
-        saved_borrow = await self.borrow_service.create_borrow(borrow=borrow)
+        async with self.unit_of_work.begin():
+            # a retry gets the borrow made by the first attempt instead of
+            # taking another copy
+            if idempotency_key is not None:
+                replayed = await self.idempotency_service.claim(
+                    key=idempotency_key, result_type=Borrow
+                )
+                if replayed is not None:
+                    return replayed
+
+            await self.book_service.reduce_the_quantity_by_one(book_id=borrow.book_id)
+            saved_borrow = await self.borrow_service.create_borrow(borrow=borrow)
+            await self.popularity_service.record_borrow(borrow=saved_borrow)
+
+            if idempotency_key is not None:
+                await self.idempotency_service.save_result(
+                    key=idempotency_key, result=saved_borrow
+                )
 
         return saved_borrow
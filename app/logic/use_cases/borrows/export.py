@@ -0,0 +1,14 @@
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from domain.entities.library import Borrow
+from logic.services.borrows import BaseBorrowService
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class ExportBorrowsUseCase(BaseUseCase):
+    borrow_service: BaseBorrowService
+
+    def execute(self, batch_size: int) -> AsyncIterator[list[Borrow]]:
+        return self.borrow_service.stream_borrows(batch_size=batch_size)
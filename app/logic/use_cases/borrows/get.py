@@ -1,9 +1,13 @@
 from dataclasses import dataclass
-from typing import Iterable
+from datetime import datetime
+from typing import Any, Iterable
 
 from application.api.filters import PaginationIn
 from domain.entities.library import Borrow
+from infra.repositories.borrows.base import BorrowFilter
+from infra.repositories.listing import Sort
 from logic.services.borrows import BaseBorrowService
+from logic.services.totals import TotalCount
 from logic.use_cases.base import BaseUseCase
 
 
@@ -11,10 +15,21 @@ from logic.use_cases.base import BaseUseCase
 class GetBorrowsUseCase(BaseUseCase):
     borrow_service: BaseBorrowService
 
-    async def execute(self, pagination: PaginationIn) -> Iterable[Borrow]:
-        borrows = await self.borrow_service.get_borrow_list(pagination=pagination)
+    async def execute(
+        self,
+        pagination: PaginationIn,
+        filters: BorrowFilter = BorrowFilter(),
+        sort: Sort = Sort(),
+        after_key: Any = None,
+    ) -> tuple[Iterable[Borrow], TotalCount]:
+        borrows = await self.borrow_service.get_borrow_list(
+            pagination=pagination, filters=filters, sort=sort, after_key=after_key
+        )
+        total = await self.borrow_service.get_borrow_total(
+            exact=pagination.exact_total, filters=filters
+        )
 
-        return borrows
+        return borrows, total
 
 
 @dataclass
@@ -25,3 +40,19 @@ class GetBorrowUseCase(BaseUseCase):
         borrow = await self.borrow_service.get_borrow(borrow_id=borrow_id)
 
         return borrow
+
+
+@dataclass
+class GetBorrowVersionUseCase(BaseUseCase):
+    borrow_service: BaseBorrowService
+
+    async def execute(self, borrow_id: int) -> datetime:
+        return await self.borrow_service.get_borrow_version(borrow_id=borrow_id)
+
+
+@dataclass
+class GetBorrowsByIdsUseCase(BaseUseCase):
+    borrow_service: BaseBorrowService
+
+    async def execute(self, borrow_ids: list[int]) -> list[Borrow]:
+        return await self.borrow_service.get_borrows_by_ids(borrow_ids=borrow_ids)
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from logic.services.reminders import BaseBorrowReminderService, OverdueScanRun
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class RemindOverdueBorrowsUseCase(BaseUseCase):
+    reminder_service: BaseBorrowReminderService
+
+    async def execute(self) -> OverdueScanRun:
+        return await self.reminder_service.remind_overdue()
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from logic.services.idempotency import BaseIdempotencyService
+from logic.use_cases.base import BaseUseCase
+
+
+@dataclass
+class PurgeIdempotencyKeysUseCase(BaseUseCase):
+    idempotency_service: BaseIdempotencyService
+
+    async def execute(self) -> int:
+        return await self.idempotency_service.purge_expired()
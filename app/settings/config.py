@@ -8,8 +8,70 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str
     POSTGRES_DB: str
 
+    # full SQLAlchemy URLs; DB_URL overrides the POSTGRES_* settings
+    DB_URL: str | None = None
+    DB_REPLICA_URL: str | None = None
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_ECHO: bool = False
+    DB_SLOW_QUERY_THRESHOLD_MS: float = 200
+
+    # per worker limits on requests running at once in each route group, best
+    # kept within DB_POOL_SIZE + DB_MAX_OVERFLOW in total; up to the queue size
+    # more wait ADMISSION_MAX_WAIT_SECONDS for a slot, the rest get a 503.
+    # A zero concurrency leaves the group unlimited
+    ADMISSION_READ_CONCURRENCY: int = 10
+    ADMISSION_READ_QUEUE: int = 50
+    ADMISSION_EXPORT_CONCURRENCY: int = 2
+    ADMISSION_EXPORT_QUEUE: int = 5
+    ADMISSION_WRITE_CONCURRENCY: int = 3
+    ADMISSION_WRITE_QUEUE: int = 20
+    ADMISSION_BORROW_CONCURRENCY: int = 2
+    ADMISSION_BORROW_QUEUE: int = 20
+    ADMISSION_MAX_WAIT_SECONDS: float = 2
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    TOTAL_COUNT_CACHE_TTL: float = 10
+
+    # entity lookup caches; a zero size or ttl disables the cache
+    CACHE_AUTHOR_MAXSIZE: int = 10000
+    CACHE_AUTHOR_TTL: float = 60
+    CACHE_BOOK_MAXSIZE: int = 10000
+    CACHE_BOOK_TTL: float = 60
+    CACHE_BORROW_MAXSIZE: int = 10000
+    CACHE_BORROW_TTL: float = 30
+
+    # borrows not returned within the loan period are listed as overdue
+    BORROW_LOAN_PERIOD_DAYS: int = 14
+
+    # background scan recording overdue reminders; a zero interval disables it
+    OVERDUE_SCAN_INTERVAL_SECONDS: float = 3600
+    OVERDUE_SCAN_BATCH_SIZE: int = 500
+
+    # results of writes made with an Idempotency-Key are replayed to retries
+    # for the ttl; a zero purge interval disables the purge of expired keys
+    IDEMPOTENCY_KEY_TTL_SECONDS: float = 86400
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 3600
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = 1000
+
+    BULK_CREATE_MAX_ROWS: int = 50000
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # ids accepted by ?ids= list lookups, and keys per merged loader query;
+    # a zero loader size disables lookup merging
+    GET_MANY_MAX_IDS: int = 100
+    BATCH_LOADER_MAX_SIZE: int = 100
+    SINGLE_FLIGHT_ENABLED: bool = True
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     @property
     def db_url(self) -> str:
+        if self.DB_URL:
+            return self.DB_URL
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
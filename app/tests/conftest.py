@@ -0,0 +1,77 @@
+import httpx
+import pytest
+
+from application.api.main import create_app
+from infra.database.manager import DatabaseManager
+from infra.database.migrations.runner import upgrade
+from logic.init import init_container
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def settings_env(monkeypatch, tmp_path):
+    """A fresh SQLite database per test and no background jobs; override this
+    fixture to change other settings before the container is built"""
+    for name in (
+        "POSTGRES_USER",
+        "POSTGRES_PASSWORD",
+        "POSTGRES_HOST",
+        "POSTGRES_PORT",
+        "POSTGRES_DB",
+    ):
+        monkeypatch.setenv(name, "test")
+    monkeypatch.setenv("DB_URL", f"sqlite+aiosqlite:///{tmp_path / 'library.db'}")
+    monkeypatch.setenv("DB_REPLICA_URL", "")
+    monkeypatch.setenv("OVERDUE_SCAN_INTERVAL_SECONDS", "0")
+    monkeypatch.setenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "0")
+    return monkeypatch
+
+
+@pytest.fixture
+async def app(settings_env):
+    init_container.cache_clear()
+    await upgrade(init_container().resolve(DatabaseManager).engine)
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        yield app
+    init_container.cache_clear()
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def author_id(client) -> int:
+    response = await client.post(
+        "/authors/",
+        json={"name": "Ursula", "surname": "Le Guin", "date_of_birth": "1929-10-21"},
+    )
+    assert response.status_code == 201
+    return response.json()["data"]["id"]
+
+
+@pytest.fixture
+def create_book(client, author_id):
+    async def create_book(title: str = "Earthsea", available_copies: int = 1) -> dict:
+        response = await client.post(
+            "/books/",
+            json={
+                "title": title,
+                "description": "A wizard's tale",
+                "author_id": author_id,
+                "available_copies": available_copies,
+            },
+        )
+        assert response.status_code == 201
+        return response.json()["data"]
+
+    return create_book
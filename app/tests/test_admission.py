@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from logic.use_cases.borrows.create import CreateBorrowUseCase
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def settings_env(settings_env):
+    settings_env.setenv("ADMISSION_BORROW_CONCURRENCY", "1")
+    settings_env.setenv("ADMISSION_BORROW_QUEUE", "0")
+    settings_env.setenv("ADMISSION_RETRY_AFTER_SECONDS", "3")
+    return settings_env
+
+
+async def test_requests_beyond_the_limit_are_shed(
+    app, client, create_book, monkeypatch
+):
+    book = await create_book(available_copies=2)
+    borrow = {"book_id": book["id"], "reader_name": "Ged"}
+
+    release = asyncio.Event()
+    execute = CreateBorrowUseCase.execute
+
+    async def held_execute(self, *args, **kwargs):
+        await release.wait()
+        return await execute(self, *args, **kwargs)
+
+    monkeypatch.setattr(CreateBorrowUseCase, "execute", held_execute)
+
+    limiter = app.state.admission_controller.limiters["borrow"]
+    running = asyncio.create_task(client.post("/borrows/", json=borrow))
+    while limiter.in_flight == 0:
+        await asyncio.sleep(0.01)
+
+    shed = await client.post("/borrows/", json=borrow)
+    # other route groups keep their own slots
+    read = await client.get(f"/books/{book['id']}/")
+    release.set()
+
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "3"
+    assert read.status_code == 200
+    assert (await running).status_code == 201
+    assert limiter.stats.shed_queue_full == 1
@@ -0,0 +1,23 @@
+import pytest
+
+from application.api.authors.schemas import OutAuthorSchema
+
+
+pytestmark = pytest.mark.anyio
+
+
+def as_model(payload: dict) -> dict:
+    return OutAuthorSchema.model_validate(payload).model_dump(mode="json")
+
+
+async def test_author_payloads_keep_the_schema_shape(client, author_id, create_book):
+    book = await create_book()
+
+    detail = (await client.get(f"/authors/{author_id}/")).json()["data"]
+    (listed,) = (await client.get("/authors/")).json()["data"]["items"]
+    with_books = (await client.get(f"/authors/{author_id}/?include=books")).json()
+
+    assert detail == listed == as_model(detail)
+    assert detail["books"] is None
+    assert with_books["data"] == as_model(with_books["data"])
+    assert [item["id"] for item in with_books["data"]["books"]] == [book["id"]]
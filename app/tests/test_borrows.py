@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from logic.exceptions.books import BookNotFoundException
+from logic.init import init_container
+from logic.use_cases.borrows.create import CreateBorrowUseCase
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def available_copies(client, book_id: int) -> int:
+    response = await client.get(f"/books/{book_id}/")
+    return response.json()["data"]["available_copies"]
+
+
+async def test_borrow_without_copies_left_is_rejected(client, create_book):
+    book = await create_book(available_copies=0)
+
+    response = await client.post(
+        "/borrows/", json={"book_id": book["id"], "reader_name": "Ged"}
+    )
+
+    assert response.status_code == 400
+    assert await available_copies(client, book["id"]) == 0
+
+
+async def test_concurrent_borrows_take_each_copy_once(client, create_book):
+    book = await create_book(available_copies=2)
+
+    responses = await asyncio.gather(
+        *[
+            client.post(
+                "/borrows/", json={"book_id": book["id"], "reader_name": f"R{i}"}
+            )
+            for i in range(6)
+        ]
+    )
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [201, 201, 400, 400, 400, 400]
+    assert await available_copies(client, book["id"]) == 0
+
+
+async def test_failed_borrow_rolls_back_the_copy_it_took(
+    client, create_book, monkeypatch
+):
+    book = await create_book(available_copies=1)
+    popularity_service = (
+        init_container().resolve(CreateBorrowUseCase).popularity_service
+    )
+
+    async def record_borrow(self, borrow):
+        raise BookNotFoundException()
+
+    monkeypatch.setattr(type(popularity_service), "record_borrow", record_borrow)
+
+    response = await client.post(
+        "/borrows/", json={"book_id": book["id"], "reader_name": "Ged"}
+    )
+
+    assert response.status_code == 400
+    assert await available_copies(client, book["id"]) == 1
+    borrows = await client.get("/borrows/", params={"book_id": book["id"]})
+    assert borrows.json()["data"]["items"] == []
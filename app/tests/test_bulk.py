@@ -0,0 +1,48 @@
+import orjson
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+
+def book_row(author_id: int, title: str) -> dict:
+    return {"title": title, "description": "", "author_id": author_id}
+
+
+async def test_bulk_creation_keeps_valid_rows_and_reports_the_others(client, author_id):
+    rows = [
+        book_row(author_id, "Earthsea"),
+        "not an object",
+        {"title": "No author"},
+        book_row(author_id, "x" * 256),
+        book_row(author_id + 1000, "Unknown author"),
+        book_row(author_id, "Tehanu"),
+    ]
+
+    response = await client.post("/books/bulk", json=rows)
+
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert [item["index"] for item in data["created"]] == [0, 5]
+    assert [error["index"] for error in data["errors"]] == [1, 2, 3, 4]
+    assert "author_id" in data["errors"][1]["error"]
+
+    listed = await client.get("/books/", params={"author_id": author_id})
+    assert sorted(item["id"] for item in listed.json()["data"]["items"]) == sorted(
+        item["id"] for item in data["created"]
+    )
+
+
+async def test_bulk_creation_accepts_ndjson(client, author_id):
+    body = b"\n".join(
+        orjson.dumps(book_row(author_id, title)) for title in ("Earthsea", "Tehanu")
+    )
+
+    response = await client.post(
+        "/books/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 201
+    assert [item["index"] for item in response.json()["data"]["created"]] == [0, 1]
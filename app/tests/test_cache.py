@@ -0,0 +1,56 @@
+import asyncio
+import contextvars
+
+import pytest
+
+from infra.cache.entities import EntityCaches
+from infra.database.unit_of_work import UnitOfWork
+from logic.init import init_container
+from logic.services.books import BaseBookService
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_book_cached_before_commit_is_dropped_at_commit(app, create_book):
+    book = await create_book(available_copies=1)
+    container = init_container()
+    book_service: BaseBookService = container.resolve(BaseBookService)
+    cache = container.resolve(EntityCaches).books
+
+    async def concurrent_read():
+        # a request of its own: outside the unit of work, it sees the
+        # committed row and puts it back in the cache
+        return await asyncio.get_running_loop().create_task(
+            book_service.get_book(book_id=book["id"]), context=contextvars.Context()
+        )
+
+    assert (await concurrent_read()).available_copies == 1
+    assert cache.get(book["id"]) is not None
+
+    async with container.resolve(UnitOfWork).begin():
+        await book_service.reduce_the_quantity_by_one(book_id=book["id"])
+        assert (await concurrent_read()).available_copies == 1
+        assert cache.get(book["id"]) is not None
+
+    assert cache.get(book["id"]) is None
+    assert (await book_service.get_book(book_id=book["id"])).available_copies == 0
+
+
+async def test_book_cache_entry_follows_api_writes(client, author_id, create_book):
+    book = await create_book()
+    await client.get(f"/books/{book['id']}/")
+
+    response = await client.put(
+        f"/books/{book['id']}/",
+        json={
+            "title": "Tehanu",
+            "description": book["description"],
+            "author_id": author_id,
+            "available_copies": book["available_copies"],
+        },
+    )
+    assert response.status_code == 200
+
+    detail = await client.get(f"/books/{book['id']}/")
+    assert detail.json()["data"]["title"] == "Tehanu"
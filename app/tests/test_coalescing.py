@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from logic.services.loader import BatchLoader
+from logic.services.single_flight import SingleFlight
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_loads_of_the_same_tick_share_batched_fetches():
+    fetched: list[list[int]] = []
+
+    async def fetch(keys: list[int]) -> dict[int, str]:
+        fetched.append(keys)
+        return {key: f"book {key}" for key in keys if key != 4}
+
+    loader = BatchLoader(fetch=fetch, max_batch_size=2)
+
+    one, three, many, four = await asyncio.gather(
+        loader.load(1), loader.load(3), loader.load_many([1, 2]), loader.load(4)
+    )
+
+    assert (one, three, four) == ("book 1", "book 3", None)
+    assert many == {1: "book 1", 2: "book 2"}
+    assert fetched == [[1, 3], [2, 4]]
+    assert loader.stats.loads == 4
+    assert loader.stats.batches == 2
+    assert loader.stats.keys == 4
+
+
+async def test_failed_batch_fails_each_of_its_loads():
+    async def fetch(keys: list[int]) -> dict[int, str]:
+        raise RuntimeError("database gone")
+
+    loader = BatchLoader(fetch=fetch)
+
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), return_exceptions=True
+    )
+
+    assert [str(result) for result in results] == ["database gone"] * 2
+
+
+async def test_concurrent_callers_share_one_execution():
+    executions = 0
+    release = asyncio.Event()
+
+    async def count_books() -> int:
+        nonlocal executions
+        executions += 1
+        await release.wait()
+        return 42
+
+    single_flight = SingleFlight()
+    callers = [
+        asyncio.ensure_future(single_flight.do(("books.count", None), count_books))
+        for _ in range(3)
+    ]
+    other = asyncio.ensure_future(
+        single_flight.do(("books.count", "available"), count_books)
+    )
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers, other) == [42] * 4
+    assert executions == 2
+    assert single_flight.stats["books.count"].coalesced == 2
+
+    # finished executions are not reused
+    assert await single_flight.do(("books.count", None), count_books) == 42
+    assert executions == 3
+
+
+async def test_cancelled_caller_leaves_the_shared_execution_running():
+    release = asyncio.Event()
+
+    async def count_books() -> int:
+        await release.wait()
+        return 42
+
+    single_flight = SingleFlight()
+    first = asyncio.ensure_future(single_flight.do(("books.count",), count_books))
+    second = asyncio.ensure_future(single_flight.do(("books.count",), count_books))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+
+    assert await second == 42
+    with pytest.raises(asyncio.CancelledError):
+        await first
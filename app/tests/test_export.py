@@ -0,0 +1,51 @@
+import csv
+import io
+
+import orjson
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def settings_env(settings_env):
+    # several batches, and so several chunks, for a handful of rows
+    settings_env.setenv("EXPORT_BATCH_SIZE", "2")
+    return settings_env
+
+
+async def test_ndjson_export_streams_every_book(client, create_book):
+    books = [await create_book(title=f"Book {index}") for index in range(5)]
+
+    response = await client.get("/books/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="books.ndjson"' in response.headers["content-disposition"]
+    exported = [orjson.loads(line) for line in response.content.splitlines()]
+    assert exported == books
+
+
+async def test_csv_export_writes_a_header_and_a_row_per_borrow(client, create_book):
+    book = await create_book(available_copies=3)
+    for reader_name in ("Ged", "Tenar", "Arren"):
+        await client.post(
+            "/borrows/", json={"book_id": book["id"], "reader_name": reader_name}
+        )
+
+    response = await client.get("/borrows/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["reader_name"] for row in rows] == ["Ged", "Tenar", "Arren"]
+    assert {row["book_id"] for row in rows} == {str(book["id"])}
+
+
+async def test_csv_export_of_nothing_is_just_the_header(client):
+    response = await client.get("/authors/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    (header,) = response.text.splitlines()
+    assert header.startswith("id,name,surname,date_of_birth,")
@@ -0,0 +1,78 @@
+import pytest
+from starlette.requests import Request
+
+from application.api.borrows.schemas import InBorrowSchema
+from application.api.idempotency import idempotency_key_of
+from application.api.schemas import ApiResponse
+from logic.init import init_container
+from logic.services.idempotency import BaseIdempotencyService
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_retried_borrow_is_replayed_without_taking_another_copy(
+    client, create_book
+):
+    book = await create_book(available_copies=2)
+    borrow = {"book_id": book["id"], "reader_name": "Ged"}
+    headers = {"Idempotency-Key": "borrow-1"}
+
+    first = await client.post("/borrows/", json=borrow, headers=headers)
+    retry = await client.post("/borrows/", json=borrow, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    copies = (await client.get(f"/books/{book['id']}/")).json()["data"]
+    assert copies["available_copies"] == 1
+
+
+async def test_retried_book_creation_is_replayed(client, author_id):
+    book = {"title": "Tehanu", "description": "", "author_id": author_id}
+    headers = {"Idempotency-Key": "book-1"}
+
+    first = await client.post("/books/", json=book, headers=headers)
+    retry = await client.post("/books/", json=book, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json()["data"]["id"] == first.json()["data"]["id"]
+    listed = await client.get("/books/")
+    assert [item["id"] for item in listed.json()["data"]["items"]] == [
+        first.json()["data"]["id"]
+    ]
+
+
+async def test_key_reused_for_a_different_request_is_rejected(client, create_book):
+    book = await create_book(available_copies=2)
+    headers = {"Idempotency-Key": "borrow-1"}
+
+    await client.post(
+        "/borrows/", json={"book_id": book["id"], "reader_name": "Ged"}, headers=headers
+    )
+    response = await client.post(
+        "/borrows/",
+        json={"book_id": book["id"], "reader_name": "Tenar"},
+        headers=headers,
+    )
+
+    assert response.status_code == 422
+    assert "different request" in response.json()["detail"]["error"]
+    copies = (await client.get(f"/books/{book['id']}/")).json()["data"]
+    assert copies["available_copies"] == 1
+
+
+async def test_retry_of_a_request_still_in_progress_is_a_conflict(client, create_book):
+    book = await create_book(available_copies=2)
+    borrow = {"book_id": book["id"], "reader_name": "Ged"}
+    headers = {"Idempotency-Key": "borrow-1"}
+    # the first request has claimed the key and not stored its result yet
+    request = Request({"type": "http", "headers": [(b"idempotency-key", b"borrow-1")]})
+    key = idempotency_key_of(request, "borrows.create", InBorrowSchema(**borrow))
+    await init_container().resolve(BaseIdempotencyService).claim(key, ApiResponse)
+
+    response = await client.post("/borrows/", json=borrow, headers=headers)
+
+    assert response.status_code == 409
+    assert "in progress" in response.json()["detail"]["error"]
+    copies = (await client.get(f"/books/{book['id']}/")).json()["data"]
+    assert copies["available_copies"] == 2
@@ -0,0 +1,69 @@
+from types import ModuleType
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from infra.database.migrations import runner
+
+
+pytestmark = pytest.mark.anyio
+
+
+def _migration(version: str, transactional: bool, upgrade) -> runner.Migration:
+    module = ModuleType(f"migration_{version}")
+    module.TRANSACTIONAL = transactional
+    module.upgrade = upgrade
+    return runner.Migration(version=version, description=version, module=module)
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    await engine.dispose()
+
+
+async def test_non_transactional_migrations_run_in_autocommit(engine, monkeypatch):
+    isolation_levels = []
+
+    def create_table(connection):
+        connection.execute(text("CREATE TABLE notes (id INTEGER PRIMARY KEY)"))
+
+    def create_index(connection):
+        isolation_levels.append(connection.get_execution_options()["isolation_level"])
+        connection.execute(text("CREATE INDEX ix_notes_id ON notes (id)"))
+
+    def add_column(connection):
+        connection.execute(text("ALTER TABLE notes ADD COLUMN body TEXT"))
+
+    migrations = [
+        _migration("0001", True, create_table),
+        _migration("0002", False, create_index),
+        _migration("0003", True, add_column),
+    ]
+    monkeypatch.setattr(runner, "load_migrations", lambda: migrations)
+
+    applied = await runner.upgrade(engine)
+
+    assert [migration.version for migration in applied] == ["0001", "0002", "0003"]
+    assert isolation_levels == ["AUTOCOMMIT"]
+    assert await runner.current_version(engine) == "0003"
+    async with engine.connect() as connection:
+        indexes = await connection.run_sync(
+            lambda sync: inspect(sync).get_indexes("notes")
+        )
+        columns = await connection.run_sync(
+            lambda sync: inspect(sync).get_columns("notes")
+        )
+    assert [index["name"] for index in indexes] == ["ix_notes_id"]
+    assert [column["name"] for column in columns] == ["id", "body"]
+    assert await runner.upgrade(engine) == []
+
+
+async def test_shipped_migrations_apply_once(engine):
+    applied = await runner.upgrade(engine)
+
+    assert any(not migration.transactional for migration in applied)
+    assert await runner.current_version(engine) == applied[-1].version
+    assert await runner.upgrade(engine) == []
@@ -0,0 +1,24 @@
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cursor_pages_through_equal_sort_keys(client, create_book):
+    ids = [(await create_book(title="Same title"))["id"] for _ in range(5)]
+    ids.append((await create_book(title="Another title"))["id"])
+
+    seen = []
+    params = {"sort": "title", "limit": 2}
+    while True:
+        response = await client.get("/books/", params=params)
+        assert response.status_code == 200
+        data = response.json()["data"]
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+        params["after"] = cursor
+
+    # ties on the title are ordered by id, so no page repeats or skips a row
+    assert seen == [ids[-1], *ids[:-1]]
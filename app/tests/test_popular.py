@@ -0,0 +1,46 @@
+import pytest
+
+from logic.init import init_container
+from logic.use_cases.borrows.counters import RebuildBorrowCountersUseCase
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def borrow(client, book_id: int, times: int):
+    for index in range(times):
+        response = await client.post(
+            "/borrows/", json={"book_id": book_id, "reader_name": f"Reader {index}"}
+        )
+        assert response.status_code == 201
+
+
+async def popular(client, path: str, **params) -> list[tuple[int, int]]:
+    response = await client.get(path, params=params)
+    assert response.status_code == 200
+    return [(item["id"], item["borrows"]) for item in response.json()["data"]["items"]]
+
+
+async def test_popular_books_and_authors_count_borrows(client, author_id, create_book):
+    earthsea = await create_book(title="Earthsea", available_copies=5)
+    tehanu = await create_book(title="Tehanu", available_copies=5)
+    await create_book(title="Tales from Earthsea", available_copies=5)
+    await borrow(client, tehanu["id"], times=1)
+    await borrow(client, earthsea["id"], times=3)
+
+    expected = [(earthsea["id"], 3), (tehanu["id"], 1)]
+    assert await popular(client, "/books/popular") == expected
+    assert await popular(client, "/books/popular", period="all") == expected
+    assert await popular(client, "/books/popular", limit=1) == expected[:1]
+    assert await popular(client, "/authors/popular") == [(author_id, 4)]
+
+
+async def test_rebuilt_counters_match_the_recorded_ones(client, create_book):
+    book = await create_book(available_copies=2)
+    await borrow(client, book["id"], times=2)
+    before = await popular(client, "/books/popular", period="all")
+
+    await init_container().resolve(RebuildBorrowCountersUseCase).execute()
+
+    assert await popular(client, "/books/popular", period="all") == before
+    assert before == [(book["id"], 2)]
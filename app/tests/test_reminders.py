@@ -0,0 +1,34 @@
+import pytest
+
+from logic.init import init_container
+from logic.use_cases.borrows.remind import RemindOverdueBorrowsUseCase
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def settings_env(settings_env):
+    # every outstanding borrow is overdue, scanned two at a time
+    settings_env.setenv("BORROW_LOAN_PERIOD_DAYS", "0")
+    settings_env.setenv("OVERDUE_SCAN_BATCH_SIZE", "2")
+    return settings_env
+
+
+async def test_overdue_scan_reminds_each_outstanding_borrow_once(client, create_book):
+    book = await create_book(available_copies=4)
+    borrow_ids = []
+    for reader_name in ("Ged", "Tenar", "Arren", "Tehanu"):
+        response = await client.post(
+            "/borrows/", json={"book_id": book["id"], "reader_name": reader_name}
+        )
+        borrow_ids.append(response.json()["data"]["id"])
+    returned = await client.patch(f"/borrows/{borrow_ids[0]}/return")
+    assert returned.status_code == 200
+    remind_overdue = init_container().resolve(RemindOverdueBorrowsUseCase)
+
+    first = await remind_overdue.execute()
+    again = await remind_overdue.execute()
+
+    assert (first.scanned, first.batches, first.reminded) == (3, 2, 3)
+    assert (again.scanned, again.reminded) == (3, 0)
@@ -0,0 +1,55 @@
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def search(client, q: str, **params) -> dict:
+    response = await client.get("/books/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+def titles(page: dict) -> list[str]:
+    return [item["title"] for item in page["items"]]
+
+
+async def test_search_follows_updates_and_deletes(client, author_id, create_book):
+    book = await create_book(title="Earthsea")
+    await create_book(title="Tehanu")
+    assert titles(await search(client, "earthsea")) == ["Earthsea"]
+
+    response = await client.put(
+        f"/books/{book['id']}/",
+        json={
+            "title": "The Farthest Shore",
+            "description": book["description"],
+            "author_id": author_id,
+            "available_copies": book["available_copies"],
+        },
+    )
+    assert response.status_code == 200
+    assert titles(await search(client, "earthsea")) == []
+    assert titles(await search(client, "farthest")) == ["The Farthest Shore"]
+
+    response = await client.delete(f"/books/{book['id']}/")
+    assert response.status_code == 204
+    assert titles(await search(client, "farthest")) == []
+    assert titles(await search(client, "tehanu")) == ["Tehanu"]
+
+
+async def test_search_cursor_walks_every_hit_once(client, create_book):
+    for index in range(5):
+        await create_book(title=f"Wizard {index}")
+
+    seen = []
+    page = await search(client, "wizard", limit=2)
+    while True:
+        seen.extend(titles(page))
+        if page["pagination"]["next_cursor"] is None:
+            break
+        page = await search(
+            client, "wizard", limit=2, after=page["pagination"]["next_cursor"]
+        )
+
+    assert sorted(seen) == [f"Wizard {index}" for index in range(5)]
@@ -0,0 +1,34 @@
+import pytest
+
+from application.api.books.schemas import OutBookSchema
+from application.api.borrows.schemas import OutBorrowSchema
+from application.api.schemas import ApiResponse, BulkCreateResponse
+
+
+pytestmark = pytest.mark.anyio
+
+
+def as_model(model: type, body: dict) -> dict:
+    return ApiResponse[model].model_validate(body).model_dump(mode="json")
+
+
+async def test_create_responses_match_their_response_models(client, author_id):
+    book = await client.post(
+        "/books/",
+        json={"title": "Earthsea", "description": "", "author_id": author_id},
+    )
+    borrow = await client.post(
+        "/borrows/", json={"book_id": book.json()["data"]["id"], "reader_name": "Ged"}
+    )
+    bulk = await client.post(
+        "/books/bulk",
+        json=[{"title": "Tehanu", "description": "", "author_id": author_id}, {}],
+    )
+
+    for response, model in (
+        (book, OutBookSchema),
+        (borrow, OutBorrowSchema),
+        (bulk, BulkCreateResponse),
+    ):
+        assert response.status_code == 201
+        assert response.json() == as_model(model, response.json())
@@ -0,0 +1,66 @@
+import asyncio
+import contextvars
+
+import pytest
+
+from infra.database.unit_of_work import UnitOfWork
+from infra.repositories.books.base import BookFilter
+from logic.init import init_container
+from logic.services.books import BaseBookService
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def books_total(client, **params) -> int:
+    response = await client.get("/books/", params=params)
+    return response.json()["data"]["pagination"]["total"]
+
+
+async def test_moving_a_book_to_another_author_refreshes_their_totals(
+    client, author_id, create_book
+):
+    other = await client.post(
+        "/authors/",
+        json={"name": "Terry", "surname": "Pratchett", "date_of_birth": "1948-04-28"},
+    )
+    other_id = other.json()["data"]["id"]
+    book = await create_book()
+    assert await books_total(client, author_id=author_id) == 1
+    assert await books_total(client, author_id=other_id) == 0
+
+    response = await client.put(
+        f"/books/{book['id']}/",
+        json={
+            "title": book["title"],
+            "description": book["description"],
+            "author_id": other_id,
+            "available_copies": book["available_copies"],
+        },
+    )
+
+    assert response.status_code == 200
+    assert await books_total(client, author_id=author_id) == 0
+    assert await books_total(client, author_id=other_id) == 1
+
+
+async def test_total_recounted_before_commit_is_dropped_at_commit(app, create_book):
+    book = await create_book(available_copies=1)
+    container = init_container()
+    book_service: BaseBookService = container.resolve(BaseBookService)
+    available = BookFilter(available_only=True)
+
+    async def concurrent_count():
+        # a request of its own: outside the unit of work, it sees the
+        # committed row and caches the old total
+        return await asyncio.get_running_loop().create_task(
+            book_service.get_book_total(filters=available, exact=True),
+            context=contextvars.Context(),
+        )
+
+    async with container.resolve(UnitOfWork).begin():
+        await book_service.reduce_the_quantity_by_one(book_id=book["id"])
+        assert (await concurrent_count()).value == 1
+
+    total = await book_service.get_book_total(filters=available)
+    assert total.value == 0
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+
+def book_body(book: dict, **changes) -> dict:
+    fields = ("title", "description", "author_id", "available_copies")
+    return {**{field: book[field] for field in fields}, **changes}
+
+
+async def test_update_with_current_version_succeeds(client, create_book):
+    book = await create_book()
+    etag = (await client.get(f"/books/{book['id']}/")).headers["etag"]
+
+    response = await client.put(
+        f"/books/{book['id']}/",
+        json=book_body(book, title="The Farthest Shore"),
+        headers={"If-Match": etag},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"]["version"] == book["version"] + 1
+    assert response.headers["etag"] != etag
+
+
+async def test_update_with_stale_version_is_rejected(client, create_book):
+    book = await create_book()
+    stale = (await client.get(f"/books/{book['id']}/")).headers["etag"]
+    await client.put(
+        f"/books/{book['id']}/",
+        json=book_body(book, title="The Farthest Shore"),
+        headers={"If-Match": stale},
+    )
+
+    response = await client.put(
+        f"/books/{book['id']}/",
+        json=book_body(book, title="Tales from Earthsea"),
+        headers={"If-Match": stale},
+    )
+
+    assert response.status_code == 412
+    current = (await client.get(f"/books/{book['id']}/")).json()["data"]
+    assert current["title"] == "The Farthest Shore"
+
+
+async def test_concurrent_updates_of_one_version_have_one_winner(client, create_book):
+    book = await create_book()
+    etag = (await client.get(f"/books/{book['id']}/")).headers["etag"]
+
+    responses = await asyncio.gather(
+        *[
+            client.put(
+                f"/books/{book['id']}/",
+                json=book_body(book, title=f"Title {i}"),
+                headers={"If-Match": etag},
+            )
+            for i in range(5)
+        ]
+    )
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 412, 412, 412, 412]